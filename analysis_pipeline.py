@@ -0,0 +1,40 @@
+import asyncio
+from config import Config
+from domain_detector import adetect_domain
+from plan_generator import agenerate_initial_plan, build_initial_eda
+from utils import get_data_preview_stats
+from dataset_profile import profile_dataset
+
+async def analyze_dataset(df, chat_model, cache=None, llm_timeout=None):
+    loop = asyncio.get_running_loop()
+
+    # The dataset profile is computed in a worker thread while the domain
+    # request is in flight, and the plan request starts as soon as the domain
+    # and the EDA built from the profile are both available.
+    domain_task = asyncio.ensure_future(adetect_domain(df, chat_model, cache=cache, timeout=llm_timeout))
+    profile_task = loop.run_in_executor(None, profile_dataset, df)
+    tasks = [domain_task, profile_task]
+
+    try:
+        domain_info, profile = await asyncio.gather(domain_task, profile_task)
+        initial_eda = build_initial_eda(df, profile)
+        plan_task = asyncio.ensure_future(agenerate_initial_plan(df, domain_info, chat_model, cache, initial_eda, timeout=llm_timeout))
+        tasks.append(plan_task)
+        preview_stats = get_data_preview_stats(df, profile)
+        cleaning_plan, _ = await plan_task
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    return {
+        "domain_info": domain_info,
+        "preview_stats": preview_stats,
+        "cleaning_plan": cleaning_plan,
+        "initial_eda": initial_eda,
+        "profile": profile
+    }
+
+def run_analysis(df, chat_model, cache=None, timeout=None, llm_timeout=None):
+    timeout = timeout or Config.ANALYSIS_TIMEOUT_SECONDS
+    return asyncio.run(asyncio.wait_for(analyze_dataset(df, chat_model, cache, llm_timeout), timeout))
@@ -1,16 +1,34 @@
+import json
 import streamlit as st
 import pandas as pd
 from config import Config, CLEANING_ACTIONS
-from domain_detector import detect_domain, get_domain_specific_guidelines
-from plan_generator import generate_initial_plan, finalize_plan, validate_plan_execution, get_plan_summary
-from data_cleaner import execute_cleaning_plan
-from utils import validate_csv, generate_download_link, format_actions_display, calculate_metrics, get_data_preview_stats, display_metrics_comparison
+from domain_detector import get_domain_specific_guidelines
+from plan_generator import finalize_plan, validate_plan_execution, get_plan_summary
+from analysis_pipeline import run_analysis
+from data_cleaner import execute_cleaning_plan, fit_cleaning_plan
+from artifacts import artifact_to_json
+from plan_optimizer import optimize_plan
+from llm_cache import LLMCache
+from exporters import EXPORTERS
+from profiling import log_table, export_profile_json, export_chrome_trace
+from utils import inspect_csv, load_csv, generate_download_link, format_actions_display, calculate_metrics, get_data_preview_stats, display_metrics_comparison
 
 Config.setup_page()
 
 st.title("AI Data Cleaning Tool")
 st.sidebar.header("Configuration")
 groq_api_key = st.sidebar.text_input("Enter your Groq API Key:", type="password")
+export_format = st.sidebar.selectbox(
+    "Download format",
+    list(EXPORTERS.keys()),
+    index=list(EXPORTERS.keys()).index(Config.EXPORT_FORMAT),
+    format_func=lambda name: EXPORTERS[name]["label"]
+)
+# The streaming backend cleans CSV files on disk from the CLI; uploads are
+# already in memory, so the app runs its plans on pandas.
+cleaning_backend = "pandas" if Config.CLEANING_BACKEND == "streaming" else Config.CLEANING_BACKEND
+# Only the pandas engine profiles actions.
+profile_actions = cleaning_backend == "pandas" and st.sidebar.checkbox("Profile cleaning actions", value=Config.PROFILE_ACTIONS)
 
 if not groq_api_key:
     st.warning("Please enter your Groq API key to continue")
@@ -22,20 +40,33 @@ except:
     st.error("Invalid Groq API key")
     st.stop()
 
+# One cache per server process, not one per rerun; it opens a new SQLite
+# connection for every call, so sessions can share it.
+@st.cache_resource
+def get_llm_cache():
+    return LLMCache()
+
+llm_cache = get_llm_cache()
+
 uploaded_file = st.file_uploader("Upload your CSV file", type=['csv'])
 
 if uploaded_file is not None:
-    is_valid, validation_msg = validate_csv(uploaded_file)
-    if not is_valid:
-        st.error(validation_msg)
+    csv_report = inspect_csv(uploaded_file)
+    if not csv_report["valid"]:
+        st.error(csv_report["message"])
         st.stop()
     
     try:
-        df = pd.read_csv(uploaded_file)
+        df = load_csv(uploaded_file, delimiter=csv_report["delimiter"], encoding=csv_report["encoding"])
         st.success(f"Dataset loaded: {df.shape[0]} rows, {df.shape[1]} columns")
         
-        with st.spinner("Analyzing dataset domain..."):
-            domain_info = detect_domain(df, chat_model)
+        with st.spinner("Analyzing dataset and generating cleaning plan..."):
+            analysis = run_analysis(df, chat_model, cache=llm_cache)
+        domain_info = analysis["domain_info"]
+        preview_stats = analysis["preview_stats"]
+        cleaning_plan = analysis["cleaning_plan"]
+        initial_eda = analysis["initial_eda"]
+        profile = analysis["profile"]
         
         st.subheader("Data Analysis")
         col1, col2, col3 = st.columns(3)
@@ -46,13 +77,9 @@ if uploaded_file is not None:
         with col3:
             st.metric("Rows x Columns", f"{df.shape[0]} x {df.shape[1]}")
         
-        preview_stats = get_data_preview_stats(df)
         with st.expander("Detailed Dataset Stats"):
             st.json(preview_stats)
         
-        with st.spinner("Generating cleaning plan..."):
-            cleaning_plan, initial_eda = generate_initial_plan(df, domain_info, chat_model)
-        
         st.subheader("AI Cleaning Plan")
         
         if cleaning_plan.get('is_clean', False):
@@ -99,7 +126,7 @@ if uploaded_file is not None:
                 "custom_actions": custom_actions
             }
             
-            final_plan = finalize_plan(cleaning_plan, user_modifications, initial_eda, chat_model)
+            final_plan = finalize_plan(cleaning_plan, user_modifications, initial_eda, chat_model, cache=llm_cache)
             st.session_state.final_plan = final_plan
             st.session_state.original_df = df.copy()
             
@@ -109,41 +136,99 @@ if uploaded_file is not None:
             st.write(f"Total Actions: {plan_summary['total_actions']}")
             st.write(f"Estimated Time: {plan_summary['estimated_time']}")
             st.write(f"Risk Level: {plan_summary['risk_level']}")
+            st.download_button(
+                label="Download Plan for Batch Runs",
+                data=json.dumps({**final_plan, "domain_info": domain_info}, indent=2, default=str),
+                file_name="cleaning_plan.json",
+                mime="application/json"
+            )
         
         if 'final_plan' in st.session_state and st.button("Execute Cleaning Plan"):
             is_valid, validation_msg = validate_plan_execution(st.session_state.final_plan, st.session_state.original_df)
             if not is_valid:
                 st.error(validation_msg)
             else:
+                plan_to_run, plan_report = st.session_state.final_plan, None
+                if Config.OPTIMIZE_PLAN:
+                    plan_to_run, plan_report = optimize_plan(plan_to_run, st.session_state.original_df)
+                
+                # The pandas engine also returns the fitted plan, so later
+                # batches can be cleaned with the same statistics and encodings.
+                artifact = None
                 with st.spinner("Executing cleaning plan..."):
-                    cleaned_df, execution_log = execute_cleaning_plan(
-                    st.session_state.original_df, 
-                    st.session_state.final_plan,
-                    domain_info )
+                    if cleaning_backend == "pandas":
+                        cleaned_df, execution_log, artifact = fit_cleaning_plan(
+                            st.session_state.original_df,
+                            plan_to_run,
+                            domain_info,
+                            profile=profile_actions
+                        )
+                    else:
+                        cleaned_df, execution_log = execute_cleaning_plan(
+                            st.session_state.original_df,
+                            plan_to_run,
+                            domain_info,
+                            backend=cleaning_backend,
+                            profile=profile_actions
+                        )
                 
                 st.session_state.cleaned_df = cleaned_df
                 st.session_state.execution_log = execution_log
                 
-                metrics = calculate_metrics(st.session_state.original_df, cleaned_df)
+                metrics = calculate_metrics(st.session_state.original_df, cleaned_df, before_profile=profile)
                 display_metrics_comparison(metrics)
                 
+                if plan_report is not None and plan_report["changes"]:
+                    with st.expander(f"Plan Optimizer: {plan_report['actions_before']} -> {plan_report['actions_after']} actions, ~{plan_report['estimated_cells_saved']:,} cell operations saved"):
+                        for change in plan_report["changes"]:
+                            st.write(f"- {change}")
+                        st.json(plan_to_run["finalized_actions"])
+                
                 st.subheader("Execution Log")
-                log_df = pd.DataFrame(execution_log)
-                st.dataframe(log_df)
+                st.dataframe(log_table(execution_log))
+                if any(entry.get("profile") for entry in execution_log):
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.download_button(
+                            label="Download Profile (JSON)",
+                            data=export_profile_json(execution_log),
+                            file_name="cleaning_profile.json",
+                            mime="application/json"
+                        )
+                    with col2:
+                        st.download_button(
+                            label="Download Profile (Chrome Trace)",
+                            data=export_chrome_trace(execution_log),
+                            file_name="cleaning_trace.json",
+                            mime="application/json"
+                        )
+                with st.expander("Column Statistics Used"):
+                    st.json({f"{i + 1}. {entry['action']}": entry.get("column_stats", {}) for i, entry in enumerate(execution_log)})
                 
                 st.subheader("Cleaned Data Preview")
                 st.dataframe(cleaned_df.head(100))
                 
-                csv_data = generate_download_link(cleaned_df)
+                exporter = EXPORTERS[export_format]
+                export_data = generate_download_link(cleaned_df, export_format)
                 st.download_button(
-                    label="Download Cleaned CSV",
-                    data=csv_data,
-                    file_name="cleaned_data.csv",
-                    mime="text/csv"
+                    label=f"Download Cleaned {exporter['label']}",
+                    data=export_data,
+                    file_name=f"cleaned_data{exporter['extension']}",
+                    mime=exporter["mime"]
                 )
+                if artifact is not None:
+                    st.download_button(
+                        label="Download Fitted Plan for Incremental Runs",
+                        data=artifact_to_json(artifact),
+                        file_name="fitted_plan.json",
+                        mime="application/json"
+                    )
     
     except Exception as e:
         st.error(f"Error processing file: {str(e)}")
 
+cache_stats = llm_cache.stats()
+st.sidebar.caption(f"LLM cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} entries")
+
 st.sidebar.markdown("---")
 st.sidebar.info("Upload a CSV file to analyze and clean your data using AI-powered domain detection and cleaning recommendations.")
\ No newline at end of file
@@ -0,0 +1,87 @@
+import json
+import time
+import numpy as np
+import pandas as pd
+from config import Config
+
+# Fitted cleaning plans. fit_cleaning_plan records, for every action, the
+# column statistics it read (medians, scaler moments, top and encoded
+# categories, quantiles, bin edges, date patterns) and the columns it dropped;
+# transform_cleaning_plan replays those values on new batches.
+#
+# The artifact is plain JSON; arrays, indexes and timestamps are tagged so
+# they load back as the same types:
+#
+#   {"format": "ai-data-cleaner-artifact", "version": 1, "created": ...,
+#    "domain_info": {...}, "input_columns": [...], "output_columns": [...],
+#    "steps": [{"action": ..., "columns": ..., "success": true,
+#               "stats": {column: {stat: value}}, "dropped_columns": [...]}]}
+
+ARTIFACT_FORMAT = "ai-data-cleaner-artifact"
+
+def build_artifact(steps, domain_info, input_columns, output_columns):
+    return {
+        "format": ARTIFACT_FORMAT,
+        "version": Config.ARTIFACT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "domain_info": domain_info,
+        "input_columns": input_columns,
+        "output_columns": output_columns,
+        "steps": steps
+    }
+
+def check_artifact(artifact):
+    if not isinstance(artifact, dict) or artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError("Not a fitted cleaning artifact")
+    if artifact.get("version") != Config.ARTIFACT_VERSION:
+        raise ValueError(f"Artifact version {artifact.get('version')} is not supported (expected {Config.ARTIFACT_VERSION}); fit the plan again")
+
+def encode_value(value):
+    if isinstance(value, np.ndarray):
+        return {"array": encode_value(value.tolist())}
+    if isinstance(value, pd.Index):
+        return {"index": encode_value(value.tolist())}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, pd.Timestamp):
+        return {"timestamp": value.isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return value
+
+def decode_value(value):
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if isinstance(value, dict):
+        if "array" in value:
+            return np.array(decode_value(value["array"]))
+        if "index" in value:
+            return pd.Index(decode_value(value["index"]), dtype=object)
+        if "timestamp" in value:
+            return pd.Timestamp(value["timestamp"])
+    return value
+
+def map_step_stats(artifact, convert):
+    steps = [{**step, "stats": {col: {name: convert(value) for name, value in values.items()} for col, values in step["stats"].items()}}
+             for step in artifact["steps"]]
+    return {**artifact, "steps": steps}
+
+def artifact_to_json(artifact):
+    check_artifact(artifact)
+    return json.dumps(map_step_stats(artifact, encode_value), separators=(",", ":"), default=str)
+
+def artifact_from_json(text):
+    artifact = json.loads(text)
+    check_artifact(artifact)
+    return map_step_stats(artifact, decode_value)
+
+def save_artifact(artifact, path):
+    with open(path, 'w', encoding='utf-8') as artifact_file:
+        artifact_file.write(artifact_to_json(artifact))
+    return path
+
+def load_artifact(path):
+    with open(path, 'r', encoding='utf-8') as artifact_file:
+        return artifact_from_json(artifact_file.read())
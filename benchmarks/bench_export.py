@@ -0,0 +1,75 @@
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from exporters import EXPORTERS, export_dataframe
+
+DEFAULT_DATASET = os.path.join(ROOT, "datasets", "dirty_cafe_sales.csv")
+
+def export_string(df, destination, chunksize):
+    # The previous download path: the whole frame rendered into one string.
+    csv_buffer = io.StringIO()
+    df.to_csv(csv_buffer, index=False)
+    with open(destination, 'w') as output:
+        output.write(csv_buffer.getvalue())
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+def run_one(dataset, repeat, export_format):
+    df = pd.concat([pd.read_csv(dataset)] * repeat, ignore_index=True)
+    # Loading pyarrow itself is not part of the cost of writing.
+    import pyarrow.parquet
+    baseline_mb = peak_rss_mb()
+    destination = os.path.join(tempfile.mkdtemp(), "export")
+    
+    start = time.perf_counter()
+    if export_format == "csv (string)":
+        export_string(df, destination, None)
+    else:
+        export_dataframe(df, export_format, destination)
+    seconds = time.perf_counter() - start
+    
+    size_mb = os.path.getsize(destination) / 1024 / 1024
+    return {
+        "seconds": seconds,
+        "file_mb": size_mb,
+        "rows_per_second": len(df) / seconds if seconds > 0 else 0,
+        "peak_extra_mb": peak_rss_mb() - baseline_mb
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure write throughput and peak memory of each export format")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--format", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.format:
+        print(json.dumps(run_one(args.dataset, args.repeat, args.format)))
+        return
+    
+    # Every format runs in a fresh interpreter so peak RSS is not shared.
+    for export_format in ["csv (string)"] + list(EXPORTERS.keys()):
+        output = subprocess.run(
+            [sys.executable, __file__, "--dataset", args.dataset, "--repeat", str(args.repeat), "--format", export_format],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{export_format:<14} {result['seconds']:8.3f}s {result['rows_per_second']:12.0f} rows/s "
+              f"{result['file_mb']:8.1f} MB file {result['peak_extra_mb']:8.1f} MB peak extra")
+
+if __name__ == "__main__":
+    main()
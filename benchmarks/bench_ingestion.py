@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import load_csv
+from data_cleaner import apply_action
+
+DEFAULT_DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datasets", "dirty_cafe_sales.csv")
+STRING_ACTIONS = ["standardize_format", "handle_currency_format", "validate_email_format"]
+
+def make_input(dataset, repeat):
+    df = pd.read_csv(dataset)
+    path = os.path.join(tempfile.mkdtemp(), "bench_ingestion.csv")
+    pd.concat([df] * repeat, ignore_index=True).to_csv(path, index=False)
+    return path
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def run(path):
+    loaders = {
+        "object (read_csv)": lambda: pd.read_csv(path),
+        "arrow (load_csv)": lambda: load_csv(path)
+    }
+    
+    results = {}
+    for name, loader in loaders.items():
+        df, load_seconds = time_call(loader)
+        result = {
+            "load_seconds": load_seconds,
+            "memory_mb": df.memory_usage(deep=True).sum() / 1024 / 1024
+        }
+        text_columns = df.select_dtypes(include=["object", "string"]).columns.tolist()
+        for action in STRING_ACTIONS:
+            _, result[action] = time_call(apply_action, df.copy(), action, text_columns)
+        results[name] = result
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare object and Arrow-backed CSV ingestion")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    path = make_input(args.dataset, args.repeat)
+    rows = sum(1 for _ in open(path)) - 1
+    print(f"{rows} rows from {args.dataset}")
+    
+    for name, result in run(path).items():
+        print(f"\n{name}")
+        for metric, value in result.items():
+            print(f"  {metric:<24} {value:10.3f}")
+
+if __name__ == "__main__":
+    main()
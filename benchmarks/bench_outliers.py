@@ -0,0 +1,78 @@
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_cleaner import ColumnStats, OUTLIER_METHODS, column_stat, flag_outliers, remove_outliers
+from benchmarks.dirty_data import parse_rows
+from benchmarks.run_suite import format_result, measure
+
+# Outlier removal on a wide numeric frame:
+#
+#   python benchmarks/bench_outliers.py --rows 1M --columns 60
+#
+# Compares the former column-by-column filter, which recomputed the quartiles
+# on the rows left by the previous column and copied the frame each time, with
+# the single-pass engine for every method, both removing and flagging rows.
+
+def numeric_frame(rows, columns, seed=0):
+    # Heavy-tailed columns with a few missing values, half of them int64.
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        values = rng.standard_t(3, rows) * (i + 1)
+        if i % 2:
+            data[f"int_{i}"] = np.rint(values * 100).astype(np.int64)
+        else:
+            values[rng.random(rows) < 0.01] = np.nan
+            data[f"float_{i}"] = values
+    return pd.DataFrame(data)
+
+def iterative_remove_outliers(df, columns, stats=None):
+    for col in columns:
+        q1 = column_stat(df, col, 'q1', stats)
+        q3 = column_stat(df, col, 'q3', stats)
+        iqr = q3 - q1
+        rows_before = df.shape[0]
+        df = df[(df[col] >= q1 - 1.5 * iqr) & (df[col] <= q3 + 1.5 * iqr)]
+        if stats is not None and df.shape[0] != rows_before:
+            stats.invalidate()
+    return df
+
+def run_outlier_benchmarks(rows, columns, seed=0, repeat=3, memory=True):
+    df = numeric_frame(rows, columns, seed)
+    names = df.columns.tolist()
+    benchmarks = {"iterative/iqr": lambda frame: iterative_remove_outliers(frame, names, ColumnStats())}
+    for method in OUTLIER_METHODS:
+        benchmarks[f"remove/{method}"] = lambda frame, method=method: remove_outliers(frame, names, ColumnStats(), method)
+        benchmarks[f"flag/{method}"] = lambda frame, method=method: flag_outliers(frame, names, ColumnStats(), method)
+
+    results = {}
+    for name, func in benchmarks.items():
+        result = measure(func, lambda: (df.copy(),), repeat, memory)
+        result["status"] = "ok"
+        result["rows_per_second"] = round(rows / result["seconds"]) if result["seconds"] else None
+        result["rows_after"] = func(df.copy()).shape[0]
+        results[f"outliers/{rows}x{columns}/{name}"] = result
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark outlier removal on a wide numeric frame.")
+    parser.add_argument("--rows", default="100k", help="Row count, e.g. 100k, 1M")
+    parser.add_argument("--columns", type=int, default=60, help="Number of numeric columns")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the tracemalloc run")
+    args = parser.parse_args()
+
+    results = run_outlier_benchmarks(parse_rows(args.rows), args.columns, args.seed, args.repeat, args.memory)
+    for name, result in results.items():
+        print(f"{format_result(name, result)} {result['rows_after']:>10} rows kept")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
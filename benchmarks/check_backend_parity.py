@@ -0,0 +1,51 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import load_csv
+from data_cleaner import execute_cleaning_plan
+from polars_backend import compare_backends
+from tests.cleaning_cases import DEFAULT_DATASET, PLANS, plan_for, synthetic_frame
+
+BACKENDS = ["polars", "duckdb"]
+
+def time_backend(df, plan, backend):
+    start = time.perf_counter()
+    execute_cleaning_plan(df.copy(), plan, {"domain": "sales"}, max_workers=1, optimize=False, backend=backend)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the Polars and DuckDB cleaning backends with pandas on the same plans.")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET)
+    parser.add_argument("--rows", type=int, default=50000, help="Rows of the synthetic dataset")
+    parser.add_argument("--backend", action="append", choices=BACKENDS, help="Backend to check (default: all)")
+    parser.add_argument("--timing", action="store_true", help="Also time the backends on every plan")
+    args = parser.parse_args()
+    backends = args.backend or BACKENDS
+
+    datasets = {"csv": load_csv(args.dataset), "synthetic": synthetic_frame(args.rows)}
+    failures = 0
+    for dataset_name, df in datasets.items():
+        for plan_name, actions in PLANS.items():
+            plan = plan_for(actions)
+            for backend in backends:
+                report = compare_backends(df, plan, {"domain": "sales"}, backend=backend)
+                failures += not report["equal"]
+
+                line = f"{dataset_name:10} {plan_name:10} {backend:7} {'OK' if report['equal'] else 'MISMATCH'}"
+                if args.timing:
+                    line += f"  pandas {time_backend(df, plan, 'pandas'):.3f}s  {backend} {time_backend(df, plan, backend):.3f}s"
+                print(line)
+                if not report["equal"]:
+                    print(json.dumps(report, indent=2))
+
+    print(f"{failures} mismatching plans")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Seeded generator with the dirt profile of datasets/dirty_cafe_sales.csv:
+# ERROR/UNKNOWN tokens and blanks in every column except the id, numbers
+# stored next to those tokens, and mostly blank payment and location columns.
+# Rows are generated in fixed-size chunks, each from its own seed, so a file
+# of any size is written in bounded memory and the first N rows are the same
+# whatever the total.
+
+CHUNK_ROWS = 1000000
+
+ITEM_PRICES = {"Coffee": 2.0, "Tea": 1.5, "Sandwich": 4.0, "Salad": 5.0, "Cake": 3.0, "Cookie": 1.0, "Smoothie": 4.0, "Juice": 3.0}
+PAYMENT_METHODS = ["Credit Card", "Cash", "Digital Wallet"]
+LOCATIONS = ["In-store", "Takeaway"]
+DATES = pd.date_range("2023-01-01", "2023-12-31").strftime("%Y-%m-%d").to_numpy(dtype=object)
+
+# Share of ERROR, UNKNOWN and blank cells per column, as in the source file.
+DIRT_RATES = {
+    "Transaction ID": (0.0, 0.0, 0.0),
+    "Item": (0.0292, 0.0344, 0.0333),
+    "Quantity": (0.017, 0.0171, 0.0138),
+    "Price Per Unit": (0.019, 0.0164, 0.0179),
+    "Total Spent": (0.0164, 0.0165, 0.0173),
+    "Payment Method": (0.0306, 0.0293, 0.2579),
+    "Location": (0.0358, 0.0338, 0.3265),
+    "Transaction Date": (0.0142, 0.0159, 0.0159)
+}
+BASE_COLUMNS = list(DIRT_RATES)
+
+def parse_rows(text):
+    # Accepts 100000, 100k, 1M or 1e6.
+    text = str(text).strip().lower()
+    multiplier = {"k": 1000, "m": 1000000, "b": 1000000000}.get(text[-1:], 1)
+    return int(float(text[:-1] if multiplier != 1 else text) * multiplier)
+
+def size_label(rows):
+    for suffix, unit in [("M", 1000000), ("k", 1000)]:
+        if rows >= unit and rows % unit == 0:
+            return f"{rows // unit}{suffix}"
+    return str(rows)
+
+def column_names(width=None):
+    # Columns past the eight of the source file repeat its column kinds, the
+    # id excepted, under numbered names ("Item 2", "Quantity 2", ...).
+    width = width or len(BASE_COLUMNS)
+    names = BASE_COLUMNS[:width]
+    kinds = BASE_COLUMNS[1:]
+    for i in range(width - len(names)):
+        names.append(f"{kinds[i % len(kinds)]} {i // len(kinds) + 2}")
+    return names
+
+def column_kind(name):
+    return next(kind for kind in BASE_COLUMNS if name == kind or name.startswith(kind + " "))
+
+def add_dirt(rng, values, rates):
+    error_rate, unknown_rate, blank_rate = rates
+    draw = rng.random(len(values))
+    values[draw < error_rate] = "ERROR"
+    values[(draw >= error_rate) & (draw < error_rate + unknown_rate)] = "UNKNOWN"
+    values[(draw >= error_rate + unknown_rate) & (draw < error_rate + unknown_rate + blank_rate)] = ""
+    return values
+
+def format_amounts(amounts):
+    # Amounts are multiples of 0.5 below 100, so a lookup replaces formatting.
+    table = np.array([f"{i / 2:.1f}" for i in range(200)], dtype=object)
+    return table[np.rint(amounts * 2).astype(np.int64)]
+
+def sale_columns(seed_key, rows):
+    # Every field draws from its own stream, so a longer chunk only appends.
+    draw = lambda field, low, high: np.random.default_rng([*seed_key, field]).integers(low, high, rows)
+    items = np.array(list(ITEM_PRICES), dtype=object)
+    item_index = draw(0, 0, len(items))
+    prices = np.array(list(ITEM_PRICES.values()))[item_index]
+    quantities = draw(1, 1, 6)
+    return {
+        "Transaction ID": "TXN_" + pd.Series(draw(2, 1000000, 10000000)).astype(str).to_numpy(dtype=object),
+        "Item": items[item_index],
+        "Quantity": quantities.astype(str).astype(object),
+        "Price Per Unit": format_amounts(prices),
+        "Total Spent": format_amounts(prices * quantities),
+        "Payment Method": np.array(PAYMENT_METHODS, dtype=object)[draw(3, 0, len(PAYMENT_METHODS))],
+        "Location": np.array(LOCATIONS, dtype=object)[draw(4, 0, len(LOCATIONS))],
+        "Transaction Date": DATES[draw(5, 0, len(DATES))]
+    }
+
+def generate_chunk(rows, width=None, seed=0, chunk_index=0):
+    # The first eight columns, and then every seven repeated ones, describe
+    # one set of sales, so totals match quantity times price wherever neither
+    # cell is dirty. Streams are keyed by position, not by width.
+    names = column_names(width)
+    groups = {}
+    chunk = {}
+    for position, name in enumerate(names):
+        group = 0 if position < len(BASE_COLUMNS) else (position - len(BASE_COLUMNS)) // (len(BASE_COLUMNS) - 1) + 1
+        if group not in groups:
+            groups[group] = sale_columns([seed, chunk_index, group], rows)
+        kind = column_kind(name)
+        dirt_rng = np.random.default_rng([seed, chunk_index, group, 100 + position])
+        chunk[name] = add_dirt(dirt_rng, groups[group][kind].copy(), DIRT_RATES[kind])
+    return pd.DataFrame(chunk, columns=names)
+
+def generate_chunks(rows, width=None, seed=0):
+    for chunk_index, start in enumerate(range(0, rows, CHUNK_ROWS)):
+        yield generate_chunk(min(CHUNK_ROWS, rows - start), width, seed, chunk_index)
+
+def generate_frame(rows, width=None, seed=0):
+    # Raw text cells, blanks as empty strings, as they are written to CSV.
+    return pd.concat(list(generate_chunks(rows, width, seed)), ignore_index=True)
+
+def write_csv(path, rows, width=None, seed=0):
+    temp_path = path + ".part"
+    with open(temp_path, 'w', encoding='utf-8', newline='') as output:
+        for i, chunk in enumerate(generate_chunks(rows, width, seed)):
+            chunk.to_csv(output, index=False, header=i == 0)
+    os.replace(temp_path, path)
+    return path
+
+def cached_csv(rows, width=None, seed=0, data_dir=None):
+    # Generated files are kept between runs; the name holds every parameter.
+    import tempfile
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), "ai_data_cleaner_bench")
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"dirty_sales_{size_label(rows)}_w{width or len(BASE_COLUMNS)}_s{seed}.csv")
+    if not os.path.exists(path):
+        write_csv(path, rows, width, seed)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic CSV with the dirt profile of dirty_cafe_sales.csv")
+    parser.add_argument("output")
+    parser.add_argument("--rows", default="100k", help="Row count, e.g. 100k, 1M, 10M, 100M")
+    parser.add_argument("--width", type=int, default=len(BASE_COLUMNS), help="Number of columns")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+    write_csv(args.output, rows, args.width, args.seed)
+    print(f"Wrote {rows} rows x {args.width} columns to {args.output} ({os.path.getsize(args.output) / 1024 / 1024:.1f} MB)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import CLEANING_ACTIONS
+from data_cleaner import ACTION_REGISTRY, apply_action, execute_cleaning_plan, fit_cleaning_plan, transform_cleaning_plan
+from analysis_pipeline import run_analysis
+from plan_generator import finalize_plan
+from utils import load_csv, calculate_metrics, get_data_preview_stats
+from dataset_profile import profile_dataset
+from benchmarks.dirty_data import BASE_COLUMNS, cached_csv, parse_rows, size_label
+from benchmarks.stub_chat_model import StubChatModel
+
+# Offline benchmark suite on generated dirty data:
+#
+#   python benchmarks/run_suite.py --sizes 100k,1M --output results.json
+#   python benchmarks/run_suite.py --sizes 100k --baseline results.json
+#
+# Micro-benchmarks run every action in CLEANING_ACTIONS on its own; the
+# end-to-end group times loading, plan execution (also split into fitting and
+# replaying a fitted plan), metrics, preview stats, the exact and sketched
+# profiles and the whole analysis pipeline with a stubbed chat model. With --baseline the
+# run is compared against a saved result file and exits with 1 on regressions.
+
+DOMAIN_INFO = {"domain": "sales", "confidence": "high", "reasoning": "Benchmark"}
+
+def measure(func, setup=None, repeat=3, memory=True):
+    # Times come from untraced runs (best and median of repeat); tracemalloc
+    # slows allocation-heavy code, so memory is taken from one extra run.
+    seconds = []
+    cpu_seconds = []
+    for _ in range(repeat):
+        args = setup() if setup is not None else ()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        func(*args)
+        seconds.append(time.perf_counter() - wall_start)
+        cpu_seconds.append(time.process_time() - cpu_start)
+
+    result = {
+        "seconds": min(seconds),
+        "median_seconds": statistics.median(seconds),
+        "cpu_seconds": min(cpu_seconds)
+    }
+    if memory:
+        args = setup() if setup is not None else ()
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            func(*args)
+            result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+    return result
+
+def micro_columns(df, action_name):
+    # Actions that select their own columns get "all"; the others get every
+    # column, except remove_columns, which drops the last one.
+    if action_name == "remove_columns":
+        return df.columns[-1:].tolist()
+    return "all" if ACTION_REGISTRY[action_name]["select"] is not None else df.columns.tolist()
+
+def run_micro(df, repeat, memory, actions=None):
+    # Actions run on the frame after fix_data_types, which leaves numeric and
+    # date columns next to the text columns still holding ERROR/UNKNOWN.
+    typed = apply_action(df.copy(), "fix_data_types", "all")
+    results = {}
+    for action_name in actions or CLEANING_ACTIONS:
+        if action_name not in ACTION_REGISTRY:
+            results[f"micro/{action_name}"] = {"status": "not_implemented"}
+            continue
+        columns = micro_columns(typed, action_name)
+        try:
+            result = measure(lambda frame: apply_action(frame, action_name, columns, DOMAIN_INFO), lambda: (typed.copy(),), repeat, memory)
+            result["status"] = "ok"
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+        result["rows_per_second"] = round(len(typed) / result["seconds"]) if result.get("seconds") else None
+        results[f"micro/{action_name}"] = result
+    return results
+
+def run_pipeline(df, chat_model):
+    analysis = run_analysis(df, chat_model)
+    user_modifications = {"included_actions": [action["action"] for action in analysis["cleaning_plan"]["recommended_actions"]], "custom_actions": ""}
+    final_plan = finalize_plan(analysis["cleaning_plan"], user_modifications, analysis["initial_eda"], chat_model)
+    cleaned_df, _ = execute_cleaning_plan(df, final_plan, analysis["domain_info"])
+    return calculate_metrics(df, cleaned_df, before_profile=analysis["profile"])
+
+def run_end_to_end(path, df, repeat, memory):
+    chat_model = StubChatModel()
+    final_plan = chat_model.final_plan()
+    cleaned_df, _, artifact = fit_cleaning_plan(df, final_plan, DOMAIN_INFO)
+
+    benchmarks = {
+        "e2e/load_csv": lambda: load_csv(path),
+        "e2e/execute_cleaning_plan": lambda: execute_cleaning_plan(df, final_plan, DOMAIN_INFO),
+        "e2e/fit_cleaning_plan": lambda: fit_cleaning_plan(df, final_plan, DOMAIN_INFO),
+        "e2e/transform_cleaning_plan": lambda: transform_cleaning_plan(df, artifact),
+        "e2e/calculate_metrics": lambda: calculate_metrics(df, cleaned_df),
+        "e2e/get_data_preview_stats": lambda: get_data_preview_stats(df),
+        "e2e/profile_dataset_exact": lambda: profile_dataset(df, approximate=False),
+        "e2e/profile_dataset_approximate": lambda: profile_dataset(df, approximate=True),
+        "e2e/pipeline": lambda: run_pipeline(df, chat_model)
+    }
+    results = {}
+    for name, func in benchmarks.items():
+        result = measure(func, repeat=repeat, memory=memory)
+        result["status"] = "ok"
+        result["rows_per_second"] = round(len(df) / result["seconds"]) if result["seconds"] else None
+        results[name] = result
+    return results
+
+def run_suite(sizes, width=None, seed=0, repeat=3, groups=None, memory=True, actions=None, data_dir=None, log=print):
+    width = width or len(BASE_COLUMNS)
+    groups = groups or ["micro", "e2e"]
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "width": width,
+            "seed": seed,
+            "repeat": repeat
+        },
+        "results": {}
+    }
+    for rows in sizes:
+        label = f"{size_label(rows)}x{width}"
+        path = cached_csv(rows, width, seed, data_dir)
+        df = load_csv(path)
+        log(f"{label}: {len(df)} rows loaded from {path}")
+
+        results = {}
+        if "micro" in groups:
+            results.update(run_micro(df, repeat, memory, actions))
+        if "e2e" in groups:
+            results.update(run_end_to_end(path, df, repeat, memory))
+        for name, result in results.items():
+            report["results"][f"{label}/{name}"] = result
+            log(format_result(f"{label}/{name}", result))
+    return report
+
+def format_result(name, result):
+    if result["status"] != "ok":
+        return f"{name:55} {result['status']} {result.get('error', '')}"
+    line = f"{name:55} {result['seconds']:9.4f}s {result['rows_per_second'] or 0:>12,} rows/s"
+    if "peak_memory_bytes" in result:
+        line += f" {result['peak_memory_bytes'] / 1024 / 1024:9.1f} MB peak"
+    return line
+
+def compare_results(current, baseline, tolerance=0.25, min_seconds=0.005):
+    # A benchmark regresses when its best time grows by more than tolerance and
+    # by more than min_seconds, which keeps timer noise on tiny actions out.
+    comparison = {"regressions": [], "improvements": [], "unchanged": [], "new": [], "missing": []}
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if result["status"] != "ok":
+            continue
+        if previous is None or previous.get("status") != "ok":
+            comparison["new"].append(name)
+            continue
+        ratio = result["seconds"] / previous["seconds"] if previous["seconds"] > 0 else float("inf")
+        entry = {"name": name, "baseline_seconds": previous["seconds"], "seconds": result["seconds"], "ratio": round(ratio, 3)}
+        difference = result["seconds"] - previous["seconds"]
+        if ratio > 1 + tolerance and difference > min_seconds:
+            comparison["regressions"].append(entry)
+        elif ratio < 1 / (1 + tolerance) and -difference > min_seconds:
+            comparison["improvements"].append(entry)
+        else:
+            comparison["unchanged"].append(entry)
+    # Only sizes and groups that were run this time can be missing.
+    prefixes = {name.rsplit("/", 1)[0] for name in current["results"]}
+    comparison["missing"] = [name for name in baseline["results"] if name not in current["results"] and name.rsplit("/", 1)[0] in prefixes]
+    comparison["environment_changes"] = {key: [baseline["meta"].get(key), value] for key, value in current["meta"].items()
+                                         if key not in ["created"] and baseline["meta"].get(key) != value}
+    return comparison
+
+def print_comparison(comparison):
+    for key in ["regressions", "improvements"]:
+        for entry in sorted(comparison[key], key=lambda entry: entry["ratio"], reverse=key == "regressions"):
+            print(f"{key[:-1].upper():12} {entry['name']:55} {entry['baseline_seconds']:.4f}s -> {entry['seconds']:.4f}s (x{entry['ratio']})")
+    print(f"{len(comparison['regressions'])} regressions, {len(comparison['improvements'])} improvements, "
+          f"{len(comparison['unchanged'])} unchanged, {len(comparison['new'])} new, {len(comparison['missing'])} missing")
+    if comparison["environment_changes"]:
+        print(f"Environment differs from the baseline: {comparison['environment_changes']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline cleaning benchmarks on generated dirty data.")
+    parser.add_argument("--sizes", default="100k", help="Comma-separated row counts, e.g. 100k,1M,10M,100M")
+    parser.add_argument("--width", type=int, default=len(BASE_COLUMNS), help="Number of columns")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--group", action="append", choices=["micro", "e2e"], help="Benchmark group to run (default: both)")
+    parser.add_argument("--actions", default=None, help="Comma-separated actions for the micro group")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the tracemalloc run")
+    parser.add_argument("--data-dir", default=None, help="Where generated CSV files are cached")
+    parser.add_argument("--output", default=None, help="Write the results as JSON (usable as a baseline)")
+    parser.add_argument("--baseline", default=None, help="Compare against a saved result file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a regression, as a fraction")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="Ignore differences smaller than this")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    sizes = [parse_rows(size) for size in args.sizes.split(",")]
+    actions = args.actions.split(",") if args.actions else None
+    report = run_suite(sizes, args.width, args.seed, args.repeat, args.group, args.memory, actions, args.data_dir)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+            comparison = compare_results(report, json.load(baseline_file), args.tolerance, args.min_seconds)
+        print_comparison(comparison)
+        return 1 if comparison["regressions"] else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
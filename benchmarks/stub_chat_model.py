@@ -0,0 +1,64 @@
+import json
+from types import SimpleNamespace
+
+# Offline stand-in for the Groq chat model: it answers the domain, plan and
+# finalize prompts with fixed JSON, so the analysis pipeline can be timed
+# without network calls or API keys.
+
+PLAN_ACTIONS = [
+    "remove_whitespace",
+    "handle_missing_values",
+    "fix_data_types",
+    "remove_duplicates",
+    "standardize_date_format",
+    "handle_negative_values",
+    "remove_outliers",
+    "standardize_names",
+    "encode_categorical"
+]
+
+class StubChatModel:
+    model_name = "benchmark-stub"
+
+    def __init__(self, actions=None, domain="sales"):
+        self.actions = actions or PLAN_ACTIONS
+        self.domain = domain
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return SimpleNamespace(content=json.dumps(self.respond(messages[0].content)))
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+    def respond(self, prompt):
+        if "determine its domain" in prompt:
+            return {"domain": self.domain, "confidence": "high", "reasoning": "Benchmark stub"}
+        if prompt.startswith("Finalize the data cleaning plan"):
+            return self.final_plan()
+        return {
+            "is_clean": False,
+            "cleanliness_score": 60,
+            "message": "Benchmark stub plan",
+            "domain_specific_notes": "",
+            "critical_issues": [],
+            "recommended_actions": [
+                {"action": action, "description": action, "columns": "all", "priority": "medium", "reasoning": "", "expected_impact": ""}
+                for action in self.actions
+            ],
+            "warnings": [],
+            "estimated_time": "Unknown"
+        }
+
+    def final_plan(self):
+        return {
+            "finalized_actions": [
+                {"action": action, "description": action, "columns": "all", "priority": "medium", "parameters": {}, "execution_order": i + 1, "validation_required": False}
+                for i, action in enumerate(self.actions)
+            ],
+            "execution_sequence": list(range(1, len(self.actions) + 1)),
+            "total_estimated_time": "Unknown",
+            "risk_assessment": "Low",
+            "success_criteria": []
+        }
@@ -0,0 +1,283 @@
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config import Config
+from artifacts import load_artifact, save_artifact
+from data_cleaner import check_backend_options, execute_cleaning_plan, fit_cleaning_plan, transform_cleaning_plan
+from exporters import EXPORTERS, export_dataframe
+from plan_generator import validate_plan_execution
+from plan_optimizer import optimize_plan
+from profiling import export_chrome_trace
+from utils import inspect_csv, load_csv
+
+# Headless entry point: a finalized plan saved from the app is applied to many
+# files without any LLM call, one file per worker process.
+#
+#   python -m cleaner run --plan plan.json inputs/*.csv --out cleaned/
+#
+# A plan fitted once on reference data is replayed on later batches, which
+# are then only transformed with the stored statistics and encodings:
+#
+#   python -m cleaner fit --plan plan.json reference.csv --artifact fitted.json
+#   python -m cleaner run --artifact fitted.json daily/*.csv --out cleaned/
+
+def load_plan(path):
+    with open(path, 'r', encoding='utf-8') as plan_file:
+        plan = json.load(plan_file)
+    if not isinstance(plan.get("finalized_actions"), list):
+        raise ValueError(f"{path} is not a finalized plan: 'finalized_actions' is missing")
+    return plan
+
+def expand_inputs(patterns):
+    # Patterns are expanded here as well so quoted globs work from cron, and a
+    # directory stands for the CSV files directly inside it.
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, "*.csv"))))
+        elif glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern)))
+        else:
+            paths.append(pattern)
+    return list(dict.fromkeys(paths))
+
+def output_path(input_path, out_dir, export_format):
+    name = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(out_dir, name + EXPORTERS[export_format]["extension"])
+
+def clean_file(input_path, destination, final_plan, domain_info=None, export_format=None, backend=None, profile=None, artifact=None):
+    started = time.time()
+    result = {"input": input_path, "output": None, "success": False, "rows_before": None, "rows_after": None,
+              "columns_before": None, "columns_after": None, "failed_actions": 0, "seconds": None, "error": None}
+    backend = backend or Config.CLEANING_BACKEND
+    export_format = export_format or Config.EXPORT_FORMAT
+
+    try:
+        # DuckDB and the streaming backend read the file themselves without
+        # holding it in memory, so the upload size limit does not apply to them.
+        report = inspect_csv(input_path, max_file_size=math.inf if backend in ["duckdb", "streaming"] else None)
+        if not report["valid"]:
+            raise ValueError(report["message"])
+
+        if artifact is None and backend == "duckdb" and export_format == "parquet" and report["encoding"] == "utf-8":
+            execution_log = clean_file_out_of_core(input_path, destination, final_plan, domain_info, report, result)
+        elif artifact is None and backend == "streaming":
+            execution_log = clean_file_streaming(input_path, destination, final_plan, domain_info, export_format, report, result)
+        else:
+            df = load_csv(input_path, delimiter=report["delimiter"], encoding=report["encoding"])
+            result["rows_before"], result["columns_before"] = df.shape
+
+            # Parallelism comes from running files side by side, so each file is
+            # cleaned on a single worker.
+            if artifact is not None:
+                cleaned_df, execution_log = transform_cleaning_plan(df, artifact, max_workers=1, profile=profile)
+            else:
+                is_valid, validation_msg = validate_plan_execution(final_plan, df)
+                if not is_valid:
+                    raise ValueError(validation_msg)
+                cleaned_df, execution_log = execute_cleaning_plan(df, final_plan, domain_info, max_workers=1, backend=backend, profile=profile)
+            result["rows_after"], result["columns_after"] = cleaned_df.shape
+            export_dataframe(cleaned_df, export_format, destination)
+
+        result["failed_actions"] = sum(1 for entry in execution_log if not entry["success"])
+        result["execution_log"] = execution_log
+        result["output"] = destination
+        result["success"] = True
+    except Exception as e:
+        result["error"] = str(e)
+
+    result["seconds"] = round(time.time() - started, 3)
+    return result
+
+def clean_file_out_of_core(input_path, destination, final_plan, domain_info, report, result):
+    # The CSV goes from DuckDB straight to Parquet without being loaded into
+    # pandas; only the header is read here to validate the plan.
+    import pandas as pd
+    import pyarrow.parquet as pq
+    from duckdb_backend import count_rows, execute_cleaning_plan_duckdb
+
+    header = pd.read_csv(input_path, sep=report["delimiter"], nrows=0)
+    result["rows_before"], result["columns_before"] = count_rows(input_path, report["delimiter"]), len(header.columns)
+    is_valid, validation_msg = validate_plan_execution(final_plan, header)
+    if not is_valid:
+        raise ValueError(validation_msg)
+
+    _, execution_log = execute_cleaning_plan_duckdb(input_path, final_plan, domain_info, output_path=destination, delimiter=report["delimiter"])
+    metadata = pq.read_metadata(destination)
+    result["rows_after"], result["columns_after"] = metadata.num_rows, metadata.num_columns
+    return execution_log
+
+def clean_file_streaming(input_path, destination, final_plan, domain_info, export_format, report, result):
+    # Chunks are appended to the destination as they are cleaned, so only CSV
+    # output is written this way.
+    import pandas as pd
+    from streaming_cleaner import execute_cleaning_plan_streaming
+
+    if export_format != "csv":
+        raise ValueError("The streaming backend only writes CSV (--format csv)")
+    header = pd.read_csv(input_path, sep=report["delimiter"], encoding=report["encoding"], nrows=0)
+    result["columns_before"] = len(header.columns)
+    is_valid, validation_msg = validate_plan_execution(final_plan, header)
+    if not is_valid:
+        raise ValueError(validation_msg)
+
+    execution_log = execute_cleaning_plan_streaming(input_path, destination, final_plan, domain_info,
+                                                    delimiter=report["delimiter"], encoding=report["encoding"])
+    if execution_log:
+        result["rows_before"] = execution_log[0]["rows_before"]
+        result["rows_after"], result["columns_after"] = execution_log[-1]["rows_after"], execution_log[-1]["columns_after"]
+    return execution_log
+
+def write_file_log(result, log_dir):
+    name = os.path.splitext(os.path.basename(result["input"]))[0]
+    with open(os.path.join(log_dir, f"{name}.log.json"), 'w', encoding='utf-8') as log_file:
+        json.dump(result, log_file, indent=2, default=str)
+
+    execution_log = result.get("execution_log") or []
+    if any(entry.get("profile") for entry in execution_log):
+        with open(os.path.join(log_dir, f"{name}.trace.json"), 'w', encoding='utf-8') as trace_file:
+            trace_file.write(export_chrome_trace(execution_log))
+
+def summarize(results, seconds):
+    succeeded = [result for result in results if result["success"]]
+    return {
+        "files": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "files_with_failed_actions": sum(1 for result in succeeded if result["failed_actions"]),
+        "rows_before": sum(result["rows_before"] or 0 for result in succeeded),
+        "rows_after": sum(result["rows_after"] or 0 for result in succeeded),
+        "seconds": round(seconds, 3),
+        "failures": {result["input"]: result["error"] for result in results if not result["success"]}
+    }
+
+def prepare_plan(plan_path, domain=None, optimize=None, log=print):
+    optimize = Config.OPTIMIZE_PLAN if optimize is None else optimize
+    final_plan = load_plan(plan_path)
+    plan_report = None
+    if optimize:
+        final_plan, plan_report = optimize_plan(final_plan)
+        for change in plan_report["changes"]:
+            log(f"PLAN {change}")
+    domain_info = final_plan.get("domain_info")
+    if domain:
+        domain_info = {**(domain_info or {}), "domain": domain}
+    return final_plan, domain_info, plan_report
+
+def fit_plan(input_path, plan_path, artifact_path, domain=None, optimize=None, profile=None, log=print):
+    final_plan, domain_info, _ = prepare_plan(plan_path, domain, optimize, log)
+    report = inspect_csv(input_path)
+    if not report["valid"]:
+        raise ValueError(report["message"])
+    df = load_csv(input_path, delimiter=report["delimiter"], encoding=report["encoding"])
+    is_valid, validation_msg = validate_plan_execution(final_plan, df)
+    if not is_valid:
+        raise ValueError(validation_msg)
+
+    cleaned_df, execution_log, artifact = fit_cleaning_plan(df, final_plan, domain_info, max_workers=1, profile=profile)
+    save_artifact(artifact, artifact_path)
+    log(f"Fitted {len(artifact['steps'])} actions on {df.shape[0]} rows -> {artifact_path}")
+    for entry in execution_log:
+        if not entry["success"]:
+            log(f"FAIL {entry['action']}: {entry['error']} (left out of later runs)")
+    return artifact
+
+def run_batch(inputs, plan_path, out_dir, workers=None, export_format=None, domain=None, optimize=None, backend=None, profile=None, artifact_path=None, log=print):
+    # With an artifact the fitted plan is replayed as it is: no optimizer
+    # pass, and only the pandas engine applies fitted values.
+    check_backend_options(backend or Config.CLEANING_BACKEND, profile=profile)
+    artifact = None
+    plan_report = None
+    if artifact_path:
+        if backend not in [None, "pandas"]:
+            raise ValueError("Fitted artifacts are applied with the pandas backend")
+        artifact = load_artifact(artifact_path)
+        if domain:
+            artifact["domain_info"] = {**(artifact["domain_info"] or {}), "domain": domain}
+        final_plan, domain_info, backend = None, artifact["domain_info"], "pandas"
+    else:
+        final_plan, domain_info, plan_report = prepare_plan(plan_path, domain, optimize, log)
+    export_format = export_format or Config.EXPORT_FORMAT
+
+    paths = expand_inputs(inputs)
+    if not paths:
+        raise ValueError("No input files matched")
+
+    destinations = [output_path(path, out_dir, export_format) for path in paths]
+    if len(set(destinations)) != len(destinations):
+        raise ValueError("Input files with the same name would overwrite each other's output")
+
+    log_dir = os.path.join(out_dir, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    started = time.time()
+    results = []
+    workers = max(1, min(workers or Config.BATCH_MAX_WORKERS, len(paths)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(clean_file, path, destination, final_plan, domain_info, export_format, backend, profile, artifact)
+                   for path, destination in zip(paths, destinations)]
+        for future in futures:
+            result = future.result()
+            write_file_log(result, log_dir)
+            results.append(result)
+
+            if result["success"]:
+                log(f"OK   {result['input']} -> {result['output']} ({result['rows_before']} -> {result['rows_after']} rows, "
+                    f"{result['failed_actions']} failed actions, {result['seconds']}s)")
+            else:
+                log(f"FAIL {result['input']}: {result['error']}")
+
+    summary = summarize(results, time.time() - started)
+    summary["plan_optimizer"] = plan_report
+    with open(os.path.join(out_dir, "summary.json"), 'w', encoding='utf-8') as summary_file:
+        json.dump(summary, summary_file, indent=2)
+    log(f"{summary['succeeded']}/{summary['files']} files cleaned in {summary['seconds']}s, "
+        f"{summary['rows_before']} -> {summary['rows_after']} rows")
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cleaner", description="Apply saved cleaning plans without the web app.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Clean CSV files with a finalized plan")
+    run_parser.add_argument("inputs", nargs="+", help="CSV files, glob patterns or directories")
+    plan_group = run_parser.add_mutually_exclusive_group(required=True)
+    plan_group.add_argument("--plan", help="Finalized plan JSON, as downloaded from the app")
+    plan_group.add_argument("--artifact", help="Fitted plan written by 'fit' or the app; batches are only transformed")
+    run_parser.add_argument("--out", required=True, help="Directory for cleaned files, per-file logs and summary.json")
+    run_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: number of CPUs)")
+    run_parser.add_argument("--format", choices=list(EXPORTERS.keys()), default=None, help="Output format")
+    run_parser.add_argument("--domain", default=None, help="Dataset domain, overriding the one stored in the plan")
+    run_parser.add_argument("--backend", choices=["pandas", "polars", "duckdb", "streaming"], default=None,
+                            help="Cleaning backend (no --profile outside pandas). Files larger than memory: duckdb with "
+                                 "--format parquet, or streaming with --format csv, which reads each file in chunks "
+                                 "k + 2 times for k actions needing whole-column statistics")
+    run_parser.add_argument("--profile", action="store_true", default=None, help="Time every action and write logs/<name>.trace.json")
+    run_parser.add_argument("--no-optimize", dest="optimize", action="store_false", default=None, help="Run the plan exactly as saved")
+
+    fit_parser = subparsers.add_parser("fit", help="Fit a finalized plan on reference data and save the fitted artifact")
+    fit_parser.add_argument("input", help="Reference CSV file")
+    fit_parser.add_argument("--plan", required=True, help="Finalized plan JSON, as downloaded from the app")
+    fit_parser.add_argument("--artifact", required=True, help="Where the fitted artifact JSON is written")
+    fit_parser.add_argument("--domain", default=None, help="Dataset domain, overriding the one stored in the plan")
+    fit_parser.add_argument("--profile", action="store_true", default=None, help="Time every action")
+    fit_parser.add_argument("--no-optimize", dest="optimize", action="store_false", default=None, help="Fit the plan exactly as saved")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "fit":
+            fit_plan(args.input, args.plan, args.artifact, args.domain, args.optimize, args.profile)
+            return 0
+        summary = run_batch(args.inputs, args.plan, args.out, args.workers, args.format, args.domain, args.optimize, args.backend, args.profile, args.artifact)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
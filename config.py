@@ -1,9 +1,63 @@
+import os
+import tempfile
 import streamlit as st
 
 class Config:
     DEFAULT_MODEL = "llama-3.1-8b-instant"
     MAX_FILE_SIZE = 200 * 1024 * 1024
+    VALIDATION_SAMPLE_BYTES = 64 * 1024
+    VALIDATION_INTERIOR_SAMPLES = 4
+    VALIDATION_MAX_RESYNC = 5
     SAMPLE_ROWS = 3
+    CHUNK_SIZE = 100000
+    STREAMING_EXACT_VALUES = 100000
+    APPROXIMATE_PROFILE_MIN_ROWS = 10000000
+    SKETCH_CHUNK_SIZE = 1000000
+    SKETCH_HLL_PRECISION = 14
+    SKETCH_QUANTILE_K = 1024
+    SKETCH_CMS_WIDTH = 2048
+    SKETCH_CMS_DEPTH = 5
+    SKETCH_TOP_K = 10
+    SKETCH_SEED = 0
+    MAX_WORKERS = 1
+    PARALLEL_BACKEND = "thread"
+    BATCH_MAX_WORKERS = os.cpu_count() or 1
+    OPTIMIZE_PLAN = True
+    OUTLIER_METHOD = "iqr"
+    OUTLIER_THRESHOLDS = {"iqr": 1.5, "zscore": 3.0, "mad": 3.5, "percentile": None}
+    OUTLIER_FLAG_COLUMN = "is_outlier"
+    ARTIFACT_VERSION = 1
+    PROFILE_ACTIONS = os.environ.get("PROFILE_ACTIONS", "").lower() in ["1", "true", "yes"]
+    PROFILE_TRACE_MEMORY = True
+    CLEANING_BACKEND = "pandas"
+    POLARS_STREAMING_MIN_ROWS = 1000000
+    DUCKDB_TEMP_DIRECTORY = os.path.join(tempfile.gettempdir(), "ai_data_cleaner_duckdb")
+    DUCKDB_MEMORY_LIMIT = os.environ.get("DUCKDB_MEMORY_LIMIT")
+    DUCKDB_THREADS = None
+    LLM_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ai_data_cleaner", "llm_cache.sqlite")
+    LLM_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+    LLM_CACHE_MAX_ENTRIES = 500
+    LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024
+    DOMAIN_FAST_PATH = True
+    DOMAIN_MIN_SCORE = 6.0
+    DOMAIN_SAMPLE_WEIGHT = 0.3
+    LLM_TIMEOUT_SECONDS = 60
+    ANALYSIS_TIMEOUT_SECONDS = 180
+    CSV_ENGINE = "pyarrow"
+    STRING_DTYPE = "string[pyarrow]"
+    TEXT_DTYPES = ["object", "string"]
+    EXPORT_FORMAT = "csv"
+    OPTIMIZE_MEMORY = True
+    CATEGORY_MAX_UNIQUE_RATIO = 0.5
+    DOWNCAST_FLOATS = True
+    DATE_SAMPLE_SIZE = 200
+    DATE_MAX_FAILURE_RATE = 0.05
+    UNIQUE_TRANSFORM_MIN_ROWS = 1000
+    UNIQUE_TRANSFORM_SAMPLE_SIZE = 1000
+    UNIQUE_TRANSFORM_MAX_RATIO = 0.2
+    REPLACEMENT_TABLES_PATH = os.environ.get("REPLACEMENT_TABLES_PATH")
+    PARQUET_COMPRESSION = "snappy"
+    FEATHER_COMPRESSION = "lz4"
     SUPPORTED_DOMAINS = ["sales", "users", "weather", "healthcare", "finance", "ecommerce", "education", "general"]
     
     @staticmethod
@@ -23,9 +77,11 @@ class Config:
 CLEANING_ACTIONS = {
     "handle_missing_values": "Handle missing data",
     "remove_duplicates": "Remove duplicate rows",
+    "optimize_memory": "Shrink memory with categorical and downcast numeric types",
     "fix_data_types": "Fix data type inconsistencies",
     "standardize_format": "Standardize text formats",
     "remove_outliers": "Remove statistical outliers",
+    "flag_outliers": "Flag statistical outliers instead of removing them",
     "encode_categorical": "Encode categorical variables",
     "normalize_numeric": "Normalize numerical columns",
     "standardize_date_format": "Standardize date formats",
@@ -1,160 +1,625 @@
 import pandas as pd
 import numpy as np
 import re
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+import os
+from sklearn.preprocessing import StandardScaler
 from sklearn.impute import SimpleImputer
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import json
+from config import Config
+from dataset_profile import duplicated_rows
+from replacements import get_replacer
+from artifacts import build_artifact, check_artifact
 
-def execute_cleaning_plan(df, final_plan, domain_info=None):
+def execute_cleaning_plan(df, final_plan, domain_info=None, max_workers=None, parallel_backend=None, optimize=None, backend=None, profile=None, output_path=None):
+    backend = backend or Config.CLEANING_BACKEND
+    check_backend_options(backend, optimize, profile)
+    if backend == "streaming":
+        # Out of core: df is the path of a CSV, cleaned chunk by chunk into
+        # output_path, which is returned in place of a frame.
+        if not isinstance(df, (str, os.PathLike)) or output_path is None:
+            raise ValueError("The streaming backend reads a CSV path and needs an output_path")
+        from streaming_cleaner import execute_cleaning_plan_streaming
+        return output_path, execute_cleaning_plan_streaming(df, output_path, final_plan, domain_info)
+    if backend == "polars":
+        from polars_backend import execute_cleaning_plan_polars
+        return execute_cleaning_plan_polars(df, final_plan, domain_info)
+    if backend == "duckdb":
+        from duckdb_backend import execute_cleaning_plan_duckdb
+        return execute_cleaning_plan_duckdb(df, final_plan, domain_info)
+    
+    optimize = Config.OPTIMIZE_MEMORY if optimize is None else optimize
+    return run_with_executor(df, final_plan, domain_info, max_workers, parallel_backend, optimize, profile)
+
+def check_backend_options(backend, optimize=None, profile=None):
+    # Only the pandas engine runs optimize_memory first and profiles actions;
+    # the other backends reject these options instead of ignoring them.
+    if backend == "pandas":
+        return
+    if optimize:
+        raise ValueError(f"The {backend} backend does not run optimize_memory before the plan")
+    if profile:
+        raise ValueError(f"The {backend} backend does not profile actions")
+
+def fit_cleaning_plan(df, final_plan, domain_info=None, max_workers=None, parallel_backend=None, optimize=None, profile=None):
+    # Cleans df like execute_cleaning_plan and also returns the artifact
+    # holding every statistic the actions fitted, for transform_cleaning_plan.
+    optimize = Config.OPTIMIZE_MEMORY if optimize is None else optimize
+    fitted_steps = []
+    cleaned_df, execution_log = run_with_executor(df, final_plan, domain_info, max_workers, parallel_backend, optimize, profile, fitted_steps)
+    return cleaned_df, execution_log, build_artifact(fitted_steps, domain_info, df.columns.tolist(), cleaned_df.columns.tolist())
+
+def transform_cleaning_plan(df, artifact, max_workers=None, parallel_backend=None, profile=None):
+    # Replays a fitted plan: statistics, categories and dropped columns come
+    # from the artifact, so new batches are encoded like the fitted data.
+    # Steps that failed when the plan was fitted are left out.
+    check_artifact(artifact)
+    missing_columns = [col for col in artifact["input_columns"] if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Columns the plan was fitted on are missing: {', '.join(map(str, missing_columns))}")
+    
+    steps = [step for step in artifact["steps"] if step["success"]]
+    return run_with_executor(df, {"finalized_actions": steps}, artifact["domain_info"], max_workers, parallel_backend, False, profile)
+
+def run_with_executor(df, final_plan, domain_info=None, max_workers=None, parallel_backend=None, optimize=False, profile=None, fitted_steps=None):
+    profile = Config.PROFILE_ACTIONS if profile is None else profile
+    executor = make_executor(max_workers or Config.MAX_WORKERS, parallel_backend or Config.PARALLEL_BACKEND)
+    try:
+        if profile:
+            from profiling import ActionProfiler
+            with ActionProfiler() as profiler:
+                return run_cleaning_plan(df, final_plan, domain_info, executor, optimize, profiler, fitted_steps)
+        return run_cleaning_plan(df, final_plan, domain_info, executor, optimize, fitted_steps=fitted_steps)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+def make_executor(max_workers, parallel_backend="thread"):
+    if max_workers <= 1:
+        return None
+    if parallel_backend == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+def run_cleaning_plan(df, final_plan, domain_info=None, executor=None, optimize=False, profiler=None, fitted_steps=None):
+    # With fitted_steps, every action run is appended to it together with the
+    # statistics it read and the columns it dropped. Actions that carry such
+    # fitted values (as artifact steps do) read them instead of the frame.
     execution_log = []
     cleaned_df = df.copy()
+    stats = ColumnStats(fitting=fitted_steps is not None)
     
-    for action in final_plan.get("finalized_actions", []):
-        action_name = action["action"]
-        columns = action["columns"]
+    # The memory optimizer runs as a first stage so every later action works
+    # on the compact representation.
+    actions = final_plan.get("finalized_actions", [])
+    if optimize and not any(action["action"] == "optimize_memory" for action in actions[:1]):
+        actions = [{"action": "optimize_memory", "columns": "all"}] + actions
+    
+    for segment in plan_segments(actions):
+        fallback_error = None
+        if len(segment) > 1:
+            measurement = profiler.start(cleaned_df) if profiler is not None else None
+            try:
+                written_columns = [col for action in segment for col in string_action_columns(cleaned_df, action["action"], action["columns"])]
+                cleaned_df = apply_fused_string_actions(cleaned_df, segment, executor, domain_info)
+            except FUSED_FALLBACK_ERRORS as e:
+                # The fused columns are only assigned once all of them are
+                # built, so the frame is untouched and each action runs on its
+                # own below, reporting its error if it has one.
+                fallback_error = f"{type(e).__name__}: {e}"
+            
+            if fallback_error is None:
+                stats.invalidate(written_columns)
+                for action in segment:
+                    execution_log.append({
+                        "action": action["action"],
+                        "success": True,
+                        "rows_after": cleaned_df.shape[0],
+                        "columns_after": cleaned_df.shape[1],
+                        "column_stats": {}
+                    })
+                    if fitted_steps is not None:
+                        fitted_steps.append(fitted_step(action, True, {}))
+                # A fused segment is one pass, so its cost is logged once, on
+                # the first of its actions.
+                if profiler is not None:
+                    segment_profile = profiler.finish(measurement, cleaned_df)
+                    segment_profile["fused_actions"] = [action["action"] for action in segment]
+                    execution_log[-len(segment)]["profile"] = segment_profile
+                continue
         
-        try:
-            if action_name == "handle_missing_values":
-                cleaned_df = handle_missing_values(cleaned_df, columns, domain_info)
-            elif action_name == "remove_duplicates":
-                cleaned_df = remove_duplicates(cleaned_df)
-            elif action_name == "fix_data_types":
-                cleaned_df = fix_data_types(cleaned_df, columns)
-            elif action_name == "standardize_format":
-                cleaned_df = standardize_format(cleaned_df, columns)
-            elif action_name == "remove_outliers":
-                cleaned_df = remove_outliers(cleaned_df, columns)
-            elif action_name == "encode_categorical":
-                cleaned_df = encode_categorical(cleaned_df, columns)
-            elif action_name == "normalize_numeric":
-                cleaned_df = normalize_numeric(cleaned_df, columns)
-            elif action_name == "standardize_date_format":
-                cleaned_df = standardize_date_format(cleaned_df, columns)
-            elif action_name == "extract_features":
-                cleaned_df = extract_features(cleaned_df, columns)
-            elif action_name == "remove_columns":
-                cleaned_df = remove_columns(cleaned_df, columns)
-            elif action_name == "rename_columns":
-                cleaned_df = rename_columns(cleaned_df, columns)
-            elif action_name == "handle_inconsistent_casing":
-                cleaned_df = handle_inconsistent_casing(cleaned_df, columns)
-            elif action_name == "remove_special_characters":
-                cleaned_df = remove_special_characters(cleaned_df, columns)
-            elif action_name == "validate_email_format":
-                cleaned_df = validate_email_format(cleaned_df, columns)
-            elif action_name == "validate_phone_format":
-                cleaned_df = validate_phone_format(cleaned_df, columns)
-            elif action_name == "handle_currency_format":
-                cleaned_df = handle_currency_format(cleaned_df, columns)
-            elif action_name == "convert_units":
-                cleaned_df = convert_units(cleaned_df, columns)
-            elif action_name == "handle_skewness":
-                cleaned_df = handle_skewness(cleaned_df, columns)
-            elif action_name == "bin_numeric_variables":
-                cleaned_df = bin_numeric_variables(cleaned_df, columns)
-            elif action_name == "handle_text_encoding":
-                cleaned_df = handle_text_encoding(cleaned_df, columns)
-            elif action_name == "remove_whitespace":
-                cleaned_df = remove_whitespace(cleaned_df, columns)
-            elif action_name == "validate_postal_codes":
-                cleaned_df = validate_postal_codes(cleaned_df, columns)
-            elif action_name == "handle_country_names":
-                cleaned_df = handle_country_names(cleaned_df, columns)
-            elif action_name == "extract_datetime_components":
-                cleaned_df = extract_datetime_components(cleaned_df, columns)
-            elif action_name == "handle_abbreviations":
-                cleaned_df = handle_abbreviations(cleaned_df, columns)
-            elif action_name == "detect_anomalies":
-                cleaned_df = detect_anomalies(cleaned_df, columns)
-            elif action_name == "handle_zero_values":
-                cleaned_df = handle_zero_values(cleaned_df, columns)
-            elif action_name == "standardize_boolean":
-                cleaned_df = standardize_boolean(cleaned_df, columns)
-            elif action_name == "handle_infinite_values":
-                cleaned_df = handle_infinite_values(cleaned_df, columns)
-            elif action_name == "validate_ranges":
-                cleaned_df = validate_ranges(cleaned_df, columns)
-            elif action_name == "handle_negative_values":
-                cleaned_df = handle_negative_values(cleaned_df, columns)
-            elif action_name == "create_derived_features":
-                cleaned_df = create_derived_features(cleaned_df, columns)
-            elif action_name == "handle_multiple_categories":
-                cleaned_df = handle_multiple_categories(cleaned_df, columns)
-            elif action_name == "standardize_address_format":
-                cleaned_df = standardize_address_format(cleaned_df, columns)
-            elif action_name == "validate_urls":
-                cleaned_df = validate_urls(cleaned_df, columns)
-            elif action_name == "handle_percentages":
-                cleaned_df = handle_percentages(cleaned_df, columns)
-            elif action_name == "remove_irrelevant_columns":
-                cleaned_df = remove_irrelevant_columns(cleaned_df, columns)
-            elif action_name == "handle_correlated_features":
-                cleaned_df = handle_correlated_features(cleaned_df, columns)
-            elif action_name == "standardize_names":
-                cleaned_df = standardize_names(cleaned_df, columns)
-            elif action_name == "handle_ordinal_categories":
-                cleaned_df = handle_ordinal_categories(cleaned_df, columns)
+        segment_start = len(execution_log)
+        for action in segment:
+            action_name = action["action"]
+            columns = action["columns"]
+            measurement = profiler.start(cleaned_df) if profiler is not None else None
+            # Fitted values are copied, so statistics of columns the fit never
+            # saw are computed per batch and do not leak into the artifact.
+            action_stats = stats
+            if "stats" in action:
+                action_stats = ColumnStats({col: dict(values) for col, values in action["stats"].items()}, frozen=True)
             
-            execution_log.append({
-                "action": action_name,
-                "success": True,
-                "rows_after": cleaned_df.shape[0],
-                "columns_after": cleaned_df.shape[1]
-            })
+            try:
+                resolved_columns = resolve_action_columns(cleaned_df, action_name, columns) if action_name in ACTION_REGISTRY else []
+                columns_before = cleaned_df.columns.tolist()
+                rows_before = cleaned_df.shape[0]
+                
+                if "dropped_columns" in action:
+                    cleaned_df = cleaned_df.drop(columns=[col for col in action["dropped_columns"] if col in cleaned_df.columns])
+                elif executor is not None and is_column_parallel(cleaned_df, action_name, columns, resolved_columns):
+                    cleaned_df = apply_action_by_column(executor, cleaned_df, action_name, resolved_columns, domain_info, action_stats)
+                else:
+                    cleaned_df = apply_action(cleaned_df, action_name, columns, domain_info, action_stats)
+                update_column_stats(action_stats, action_name, resolved_columns, columns_before, rows_before, cleaned_df)
+                
+                if fitted_steps is not None:
+                    fitted_steps.append(fitted_step(action, True, action_stats.accessed, columns_before, cleaned_df))
+                execution_log.append({
+                    "action": action_name,
+                    "success": True,
+                    "rows_after": cleaned_df.shape[0],
+                    "columns_after": cleaned_df.shape[1],
+                    "column_stats": action_stats.pop_accessed()
+                })
+                
+            except Exception as e:
+                action_stats.invalidate()
+                if fitted_steps is not None:
+                    fitted_steps.append(fitted_step(action, False, {}))
+                execution_log.append({
+                    "action": action_name,
+                    "success": False,
+                    "error": str(e),
+                    "rows_after": cleaned_df.shape[0],
+                    "columns_after": cleaned_df.shape[1],
+                    "column_stats": action_stats.pop_accessed()
+                })
             
-        except Exception as e:
-            execution_log.append({
-                "action": action_name,
-                "success": False,
-                "error": str(e),
-                "rows_after": cleaned_df.shape[0],
-                "columns_after": cleaned_df.shape[1]
-            })
+            if profiler is not None:
+                execution_log[-1]["profile"] = profiler.finish(measurement, cleaned_df)
+        
+        if fallback_error is not None:
+            execution_log[segment_start]["fused_fallback"] = fallback_error
     
     return cleaned_df, execution_log
 
-def handle_missing_values(df, columns, domain_info=None):
+def fitted_step(action, success, accessed, columns_before=None, df=None):
+    step = {
+        "action": action["action"],
+        "columns": action["columns"],
+        "success": success,
+        "stats": {col: dict(values) for col, values in accessed.items()}
+    }
+    entry = ACTION_REGISTRY.get(action["action"])
+    if success and entry is not None and entry["effect"] == "drop_columns":
+        step["dropped_columns"] = [col for col in columns_before if col not in df.columns]
+    return step
+
+def apply_action(df, action_name, columns, domain_info=None, stats=None):
+    entry = ACTION_REGISTRY.get(action_name)
+    if entry is None:
+        return df
+    
+    arguments = {"columns": columns, "domain_info": domain_info, "stats": stats}
+    return entry["function"](df, *[arguments[param] for param in entry["params"]])
+
+def is_column_parallel(df, action_name, columns, resolved_columns):
+    # Only actions that touch each column on its own can be split. Row filters,
+    # column drops and whole-frame actions are barriers and run sequentially.
+    entry = ACTION_REGISTRY.get(action_name)
+    if entry is None or entry["effect"] not in ["in_place", "derive"] or len(resolved_columns) < 2:
+        return False
+    if columns == "all":
+        return entry["select"] is not None
+    return all(col in df.columns for col in columns)
+
+def run_column_task(action_name, df, col, domain_info=None, stats=None):
+    try:
+        return apply_action(df, action_name, [col], domain_info, stats), stats, None
+    except Exception as e:
+        return df, stats, e
+
+def apply_action_by_column(executor, df, action_name, columns, domain_info=None, stats=None):
+    futures = []
+    for col in columns:
+        col_stats = ColumnStats({col: dict(stats.values.get(col, {}))}, stats.frozen, stats.fitting) if stats is not None else None
+        futures.append(executor.submit(run_column_task, action_name, df[[col]].copy(), col, domain_info, col_stats))
+    
+    # Results are merged in column order and stop at the first failure, so the
+    # frame ends up exactly as the sequential loop would leave it.
+    for col, future in zip(columns, futures):
+        result, col_stats, error = future.result()
+        for name in result.columns:
+            df[name] = result[name]
+        if stats is not None:
+            stats.merge_column(col_stats, col)
+        if error is not None:
+            raise error
+    return df
+
+def resolve_action_columns(df, action_name, columns):
+    if columns != "all":
+        return [col for col in columns if col in df.columns]
+    
+    select = ACTION_REGISTRY[action_name]["select"]
+    if select == "any":
+        return df.columns.tolist()
+    elif select == "text":
+        return text_columns(df)
+    elif select is not None:
+        return df.select_dtypes(include=[select]).columns.tolist()
+    return []
+
+def plan_segments(actions):
+    # Consecutive string actions are grouped so they can run as one fused pass.
+    segments = []
+    for action in actions:
+        entry = ACTION_REGISTRY.get(action["action"])
+        is_string_action = entry is not None and entry["string_kernel"] is not None
+        
+        if is_string_action and segments and segments[-1][-1]["action"] in STRING_ACTIONS:
+            segments[-1].append(action)
+        else:
+            segments.append([action])
+    return segments
+
+def is_text_column(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return is_text_column(pd.Series(series.cat.categories))
+    return series.dtype == 'object' or isinstance(series.dtype, pd.StringDtype)
+
+def text_columns(df):
+    return [col for col in df.columns if is_text_column(df[col])]
+
+def is_numeric_column(series):
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in 'iuf'
+
+def promote_numeric(series):
+    # Compact columns from optimize_memory are widened before arithmetic, so
+    # statistics and derived values are computed as on int64/float64 data.
+    if is_numeric_column(series) and series.dtype.kind in 'iu' and series.dtype.itemsize < 8:
+        return series.astype('int64')
+    if is_numeric_column(series) and series.dtype.kind == 'f' and series.dtype.itemsize < 8:
+        return series.astype('float64')
+    return series
+
+def add_category(series, value):
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        return series.cat.add_categories([value])
+    return series
+
+def text_values(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype(series.cat.categories.dtype)
+    return series
+
+def as_text(series):
+    # Arrow-backed strings keep their dtype so the .str methods run in Arrow
+    # compute; missing values become 'nan' as astype(str) does for objects.
+    series = text_values(series)
+    if isinstance(series.dtype, pd.StringDtype):
+        return series.fillna('nan')
+    return series.astype(str)
+
+def to_numpy_dtype(series):
+    # String methods on Arrow-backed columns return nullable Int64/Float64
+    # results, while the numeric actions only accept numpy dtypes.
+    if pd.api.types.is_extension_array_dtype(series) and pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype('float64') if series.isna().any() else series.astype(series.dtype.numpy_dtype)
+    return series
+
+def text_to_numeric(series):
+    return to_numpy_dtype(pd.to_numeric(series, errors='coerce'))
+
+def string_action_columns(df, action_name, columns):
+    return [col for col in resolve_action_columns(df, action_name, columns) if is_text_column(df[col])]
+
+def compose_string_kernels(kernels):
+    def fused_kernel(value):
+        value = value if isinstance(value, str) else str(value)
+        for kernel in kernels:
+            value = kernel(value)
+        return value
+    return fused_kernel
+
+def apply_string_kernel(df, action_name, columns, domain_info=None):
+    kernel_factory = ACTION_REGISTRY[action_name]["string_kernel"]
+    for col in string_action_columns(df, action_name, columns):
+        df[col] = map_text_column(df[col], compose_string_kernels([kernel_factory(col, domain_info)]))
+    return df
+
+def map_text_column(series, kernel):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # The kernel runs once per category and values are rebuilt from the
+        # codes; code -1 (missing) picks the kernel's result for NaN at the end.
+        categories = [kernel(value) for value in series.cat.categories] + [kernel(np.nan)]
+        values = np.asarray(categories, dtype=object)[series.cat.codes.to_numpy()]
+        return pd.Series(values, index=series.index).astype('category')
+    return transform_text_column(series, lambda values: map_text_values(values, kernel))
+
+def map_text_values(series, kernel):
+    if isinstance(series.dtype, pd.StringDtype):
+        values = series.to_numpy(dtype=object, na_value='nan')
+        return pd.Series([kernel(value) for value in values], index=series.index, dtype=series.dtype)
+    return series.map(kernel)
+
+def transform_text_column(series, transform):
+    if not is_low_cardinality(series):
+        return transform(series)
+    
+    # The transform runs once per distinct value and the column is rebuilt
+    # with a take over the factorized codes. Missing values (code -1) take the
+    # transform's result for a missing value appended after the uniques.
+    codes, uniques = pd.factorize(series)
+    values = pd.Series(uniques)
+    values = pd.concat([values, pd.Series([np.nan]).astype(values.dtype)], ignore_index=True)
+    result = transform(values).take(codes)
+    result.index = series.index
+    return result
+
+def is_low_cardinality(series):
+    rows = len(series)
+    if rows < Config.UNIQUE_TRANSFORM_MIN_ROWS:
+        return False
+    sample = series.iloc[::max(rows // Config.UNIQUE_TRANSFORM_SAMPLE_SIZE, 1)]
+    return sample.nunique(dropna=False) <= len(sample) * Config.UNIQUE_TRANSFORM_MAX_RATIO
+
+def fuse_string_column(series, col, action_names, domain_info=None):
+    kernels = [ACTION_REGISTRY[action_name]["string_kernel"](col, domain_info) for action_name in action_names]
+    return map_text_column(series, compose_string_kernels(kernels))
+
+def apply_fused_string_actions(df, actions, executor=None, domain_info=None):
+    actions_by_column = {}
+    for action in actions:
+        for col in string_action_columns(df, action["action"], action["columns"]):
+            actions_by_column.setdefault(col, []).append(action["action"])
+    
+    if executor is None:
+        fused_columns = {col: fuse_string_column(df[col], col, action_names, domain_info) for col, action_names in actions_by_column.items()}
+    else:
+        futures = {col: executor.submit(fuse_string_column, df[col], col, action_names, domain_info) for col, action_names in actions_by_column.items()}
+        fused_columns = {col: future.result() for col, future in futures.items()}
+    
+    for col, values in fused_columns.items():
+        df[col] = values
+    return df
+
+STAT_FUNCTIONS = {
+    'median': lambda s: promote_numeric(s).median(),
+    'mean': lambda s: promote_numeric(s).mean(),
+    'std': lambda s: promote_numeric(s).std(),
+    'std_pop': lambda s: promote_numeric(s).std(ddof=0),
+    'skew': lambda s: promote_numeric(s).skew(),
+    'mad': lambda s: (promote_numeric(s) - promote_numeric(s).median()).abs().median(),
+    'top_categories': lambda s: top_categories(s.value_counts()),
+    'nunique': lambda s: s.nunique(),
+    'all_digits': lambda s: bool(s.str.contains(r'^\d+$').all()),
+    'categories': lambda s: pd.Categorical(s).categories.tolist(),
+    'label_classes': lambda s: sorted(as_text(s).unique()),
+    'bin_edges': lambda s: pd.cut(s, bins=5, retbins=True)[1]
+}
+
+def top_categories(counts, n=10):
+    # Ties are broken by value so object, Arrow and categorical columns holding
+    # the same data keep the same categories.
+    counts = counts[counts > 0]
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+    return pd.Index([value for value, _ in ranked[:n]], dtype=object)
+
+# Quantile statistics are computed together so a column is only sorted once.
+QUANTILE_STATS = {'q01': 0.01, 'q1': 0.25, 'q3': 0.75, 'q99': 0.99}
+
+class ColumnStats:
+    def __init__(self, values=None, frozen=False, fitting=False):
+        # Frozen stats hold values fitted elsewhere (e.g. over a whole file in
+        # streaming mode) and are never recomputed from the frame at hand.
+        # While fitting, actions also read the statistics they would need on
+        # a later batch, such as the fill value of a column with no gaps yet.
+        self.values = values if values is not None else {}
+        self.frozen = frozen
+        self.fitting = fitting
+        self.accessed = {}
+    
+    def get(self, df, col, name):
+        col_values = self.values.setdefault(col, {})
+        
+        if name not in col_values:
+            if name in QUANTILE_STATS:
+                quantiles = df[col].quantile(list(QUANTILE_STATS.values()))
+                for stat_name, q in QUANTILE_STATS.items():
+                    col_values[stat_name] = quantiles[q]
+            else:
+                col_values[name] = STAT_FUNCTIONS[name](df[col])
+        
+        self.accessed.setdefault(col, {})[name] = col_values[name]
+        return col_values[name]
+    
+    def prefetch(self, df, columns, names):
+        # The quantiles of every column not cached yet come from one
+        # DataFrame.quantile call instead of one call per column.
+        names = [name for name in names if name in QUANTILE_STATS]
+        missing = [col for col in columns if not all(name in self.values.get(col, {}) for name in names)]
+        if not names or not missing:
+            return
+        quantiles = df[missing].quantile(list(QUANTILE_STATS.values()))
+        for col in missing:
+            col_values = self.values.setdefault(col, {})
+            for stat_name, q in QUANTILE_STATS.items():
+                col_values.setdefault(stat_name, quantiles[col][q])
+    
+    def record(self, col, name, value):
+        # Values an action reports about a column (rather than reads) are only
+        # added to the execution log, never to the cache.
+        self.accessed.setdefault(col, {})[name] = value
+    
+    def merge_column(self, other, col):
+        if col in other.values:
+            self.values[col] = other.values[col]
+        else:
+            self.values.pop(col, None)
+        for accessed_col, values in other.accessed.items():
+            self.accessed.setdefault(accessed_col, {}).update(values)
+    
+    def invalidate(self, columns=None):
+        if self.frozen:
+            return
+        if columns is None:
+            self.values.clear()
+            return
+        for col in columns:
+            self.values.pop(col, None)
+    
+    def pop_accessed(self):
+        snapshot = {col: {name: stat_to_json(value) for name, value in values.items()} for col, values in self.accessed.items()}
+        self.accessed = {}
+        return snapshot
+
+def stat_to_json(value):
+    if isinstance(value, (pd.Index, list, np.ndarray)):
+        return [str(item) for item in value]
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+def column_stat(df, col, name, stats=None):
+    if stats is None:
+        stats = ColumnStats()
+    return stats.get(df, col, name)
+
+def fitting_column_stats(stats):
+    return stats is not None and stats.fitting
+
+def record_column_stat(stats, col, name, value):
+    if stats is not None:
+        stats.record(col, name, value)
+
+def invalidate_column_stats(stats, col):
+    if stats is not None:
+        stats.invalidate([col])
+
+def update_column_stats(stats, action_name, resolved_columns, columns_before, rows_before, df):
+    entry = ACTION_REGISTRY.get(action_name)
+    if entry is None:
+        return
+    
+    effect = entry["effect"]
+    if effect in ["frame", "rename"]:
+        stats.invalidate()
+    elif effect == "filter_rows":
+        if df.shape[0] != rows_before:
+            stats.invalidate()
+    elif effect == "drop_columns":
+        stats.invalidate([col for col in columns_before if col not in df.columns])
+    elif effect == "derive":
+        new_columns = [col for col in df.columns if col not in columns_before]
+        derived_columns = [col for col in df.columns if any(str(col).startswith(f"{source}_") for source in resolved_columns)]
+        stats.invalidate(new_columns + derived_columns)
+    elif "stats" not in entry["params"]:
+        # Actions that read the cache invalidate the columns they change themselves.
+        stats.invalidate(resolved_columns)
+
+def handle_missing_values(df, columns, domain_info=None, stats=None):
     if columns == "all":
         columns = df.columns
     
     domain = domain_info.get('domain', 'general') if domain_info else 'general'
     
     for col in columns:
-        if col in df.columns:
+        if col in df.columns and df[col].isna().any():
             col_dtype = df[col].dtype
             col_name_lower = col.lower()
             
-            if col_dtype in ['object', 'string']:
+            if is_text_column(df[col]):
                 if any(keyword in col_name_lower for keyword in ['date', 'time']):
-                    df[col].fillna('Unknown Date', inplace=True)
+                    fill_value = 'Unknown Date'
                 elif any(keyword in col_name_lower for keyword in ['name', 'title', 'description']):
-                    df[col].fillna('Unknown', inplace=True)
+                    fill_value = 'Unknown'
                 elif any(keyword in col_name_lower for keyword in ['email', 'phone', 'id']):
-                    df[col].fillna('Not Provided', inplace=True)
+                    fill_value = 'Not Provided'
                 elif domain in ['finance', 'sales', 'ecommerce'] and any(keyword in col_name_lower for keyword in ['category', 'type', 'status']):
-                    df[col].fillna('Other', inplace=True)
+                    fill_value = 'Other'
                 else:
-                    df[col].fillna('Missing', inplace=True)
+                    fill_value = 'Missing'
+                df[col] = add_category(df[col], fill_value).fillna(fill_value)
                     
             elif col_dtype in ['datetime64[ns]']:
-                df[col].fillna(pd.NaT, inplace=True)
+                df[col] = df[col].fillna(pd.NaT)
                 
-            elif col_dtype in ['int64', 'float64']:
-                if any(keyword in col_name_lower for keyword in ['price', 'amount', 'cost', 'revenue', 'salary', 'income']):
-                    df[col].fillna(0, inplace=True)
-                elif any(keyword in col_name_lower for keyword in ['age', 'year', 'count', 'quantity']):
-                    df[col].fillna(df[col].median(), inplace=True)
-                elif any(keyword in col_name_lower for keyword in ['rating', 'score', 'percentage']):
-                    df[col].fillna(df[col].mean(), inplace=True)
-                else:
-                    df[col].fillna(df[col].median(), inplace=True)
+            elif is_numeric_column(df[col]):
+                df[col] = promote_numeric(df[col])
+                fill_stat = numeric_fill_stat(col_name_lower)
+                df[col] = df[col].fillna(0 if fill_stat is None else column_stat(df, col, fill_stat, stats))
+            
+            invalidate_column_stats(stats, col)
+        
+        elif col in df.columns and fitting_column_stats(stats) and is_numeric_column(df[col]):
+            fill_stat = numeric_fill_stat(col.lower())
+            if fill_stat is not None:
+                column_stat(df, col, fill_stat, stats)
+    
+    return df
+
+def numeric_fill_stat(col_name_lower):
+    # None means money columns, which are filled with 0.
+    if any(keyword in col_name_lower for keyword in ['price', 'amount', 'cost', 'revenue', 'salary', 'income']):
+        return None
+    if any(keyword in col_name_lower for keyword in ['age', 'year', 'count', 'quantity']):
+        return 'median'
+    if any(keyword in col_name_lower for keyword in ['rating', 'score', 'percentage']):
+        return 'mean'
+    return 'median'
+
+def optimize_memory(df, columns):
+    if columns == "all":
+        columns = df.columns
     
+    for col in columns:
+        if col in df.columns:
+            df[col] = optimize_column(df[col])
     return df
 
-def remove_duplicates(df):
-    return df.drop_duplicates()
+def optimize_column(series):
+    if is_text_column(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+        numeric = numeric_text_values(series)
+        if numeric is None:
+            if series.nunique() <= len(series) * Config.CATEGORY_MAX_UNIQUE_RATIO:
+                return series.astype('category')
+            return series
+        series = numeric
+    
+    if is_numeric_column(series):
+        return downcast_numeric(series)
+    return series
+
+def numeric_text_values(series):
+    # Text is only converted when every value parses as a number, and never
+    # when a value has a leading zero (codes and identifiers keep their text).
+    values = series.dropna()
+    if values.empty or pd.to_numeric(values.head(100), errors='coerce').isna().any():
+        return None
+    if pd.to_numeric(values, errors='coerce').isna().any() or as_text(values).str.match(r'^\s*[+-]?0\d').any():
+        return None
+    return text_to_numeric(series)
+
+def downcast_numeric(series):
+    if series.dtype.kind in 'iu':
+        return pd.to_numeric(series, downcast='integer' if series.dtype.kind == 'i' else 'unsigned')
+    
+    if Config.DOWNCAST_FLOATS and series.dtype != 'float32':
+        # Floats are only narrowed when every value survives the round trip.
+        narrowed = series.astype('float32')
+        if ((narrowed.astype(series.dtype) == series) | series.isna()).all():
+            return narrowed
+    return series
+
+def remove_duplicates(df, columns="all"):
+    subset = None
+    if columns != "all":
+        subset = [col for col in columns if col in df.columns] or None
+    return df[~duplicated_rows(df, subset).to_numpy()]
 
-def fix_data_types(df, columns):
+def fix_data_types(df, columns, stats=None):
     if columns == "all":
         columns = df.columns
     
@@ -162,102 +627,246 @@ def fix_data_types(df, columns):
         if col in df.columns:
             col_name_lower = col.lower()
             
-            if df[col].dtype == 'object':
+            if is_text_column(df[col]):
                 if any(keyword in col_name_lower for keyword in ['date', 'time', 'year']):
                     try:
                         df[col] = pd.to_datetime(df[col], errors='coerce')
                     except:
                         pass
                 elif any(keyword in col_name_lower for keyword in ['price', 'amount', 'cost', 'revenue', 'salary']):
-                    df[col] = df[col].replace('[\$,]', '', regex=True)
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
+                    df[col] = text_values(df[col]).replace('[\$,]', '', regex=True)
+                    df[col] = text_to_numeric(df[col])
                 elif any(keyword in col_name_lower for keyword in ['percentage', 'rate']):
-                    df[col] = df[col].replace('%', '', regex=True)
-                    df[col] = pd.to_numeric(df[col], errors='coerce') / 100
-                elif df[col].str.contains('^\d+$').all():
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
+                    df[col] = text_values(df[col]).replace('%', '', regex=True)
+                    df[col] = text_to_numeric(df[col]) / 100
+                elif column_stat(df, col, 'all_digits', stats):
+                    df[col] = text_to_numeric(df[col])
     
     return df
 
-def standardize_format(df, columns):
-    if columns == "all":
-        columns = df.select_dtypes(include=['object']).columns
-    
-    for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            col_name_lower = col.lower()
-            
-            if any(keyword in col_name_lower for keyword in ['email']):
-                df[col] = df[col].astype(str).str.lower().strip()
-            elif any(keyword in col_name_lower for keyword in ['name', 'title']):
-                df[col] = df[col].astype(str).str.title().strip()
-            elif any(keyword in col_name_lower for keyword in ['address', 'location']):
-                df[col] = df[col].astype(str).str.upper().strip()
-            else:
-                df[col] = df[col].astype(str).str.strip()
+def standardize_format_kernel(col, domain_info=None):
+    col_name_lower = col.lower()
     
-    return df
+    if any(keyword in col_name_lower for keyword in ['email']):
+        return lambda value: value.lower().strip()
+    elif any(keyword in col_name_lower for keyword in ['name', 'title']):
+        return lambda value: value.title().strip()
+    elif any(keyword in col_name_lower for keyword in ['address', 'location']):
+        return lambda value: value.upper().strip()
+    return lambda value: value.strip()
 
-def remove_outliers(df, columns):
+def standardize_format(df, columns):
+    return apply_string_kernel(df, "standardize_format", columns)
+
+def iqr_outliers(values, col_stats, threshold):
+    iqr = col_stats['q3'] - col_stats['q1']
+    return (values < col_stats['q1'] - threshold * iqr) | (values > col_stats['q3'] + threshold * iqr)
+
+def zscore_outliers(values, col_stats, threshold):
+    return np.abs((values - col_stats['mean']) / col_stats['std']) > threshold
+
+def mad_outliers(values, col_stats, threshold):
+    # Modified z-score of Iglewicz and Hoaglin; 0.6745 scales the MAD to the
+    # standard deviation of normal data.
+    return 0.6745 * np.abs(values - col_stats['median']) / col_stats['mad'] > threshold
+
+def percentile_outliers(values, col_stats, threshold):
+    return (values < col_stats['q01']) | (values > col_stats['q99'])
+
+OUTLIER_METHODS = {
+    "iqr": {"stats": ['q1', 'q3'], "function": iqr_outliers},
+    "zscore": {"stats": ['mean', 'std'], "function": zscore_outliers},
+    "mad": {"stats": ['median', 'mad'], "function": mad_outliers},
+    "percentile": {"stats": ['q01', 'q99'], "function": percentile_outliers}
+}
+
+def outlier_columns(df, columns):
     if columns == "all":
         columns = df.select_dtypes(include=['number']).columns
-    
+    return [col for col in columns if col in df.columns and is_numeric_column(df[col])]
+
+def column_outliers(df, col, method=None, stats=None, threshold=None):
+    # Missing values are never outliers; the comparisons are False for them.
+    method = method or Config.OUTLIER_METHOD
+    threshold = Config.OUTLIER_THRESHOLDS.get(method) if threshold is None else threshold
+    stats = stats if stats is not None else ColumnStats()
+    col_stats = {name: stats.get(df, col, name) for name in OUTLIER_METHODS[method]["stats"]}
+    return OUTLIER_METHODS[method]["function"](promote_numeric(df[col]), col_stats, threshold)
+
+def outlier_mask(df, columns, method=None, stats=None, threshold=None):
+    # Every column's statistics are read from the frame as given and the
+    # per-column results are OR-ed into one row mask, so the outcome does not
+    # depend on column order and the frame is never copied along the way.
+    method = method or Config.OUTLIER_METHOD
+    stats = stats if stats is not None else ColumnStats()
+    columns = outlier_columns(df, columns)
+    stats.prefetch(df, columns, OUTLIER_METHODS[method]["stats"])
+
+    mask = np.zeros(df.shape[0], dtype=bool)
     for col in columns:
-        if col in df.columns and df[col].dtype in ['int64', 'float64']:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            df = df[(df[col] >= lower_bound) & (df[col] <= upper_bound)]
+        mask |= column_outliers(df, col, method, stats, threshold).to_numpy()
+    return mask
+
+def remove_outliers(df, columns, stats=None, method=None):
+    # Rows with a missing value in a checked column go as well, since they
+    # cannot be shown to lie within the bounds.
+    columns = outlier_columns(df, columns)
+    if not columns:
+        return df
+    drop = outlier_mask(df, columns, method, stats) | df[columns].isna().any(axis=1).to_numpy()
+    if drop.any():
+        df = df[~drop]
+        if stats is not None:
+            stats.invalidate()
     return df
 
-def encode_categorical(df, columns):
+def flag_outliers(df, columns, stats=None, method=None):
+    columns = outlier_columns(df, columns)
+    if not columns:
+        return df
+    df[Config.OUTLIER_FLAG_COLUMN] = outlier_mask(df, columns, method, stats)
+    return df
+
+def encode_categorical(df, columns, stats=None):
+    # Dummy columns and label codes follow the fitted categories (as
+    # get_dummies and LabelEncoder would order them), so values a batch has
+    # not seen before get no dummy and the code -1.
     if columns == "all":
-        columns = df.select_dtypes(include=['object']).columns
+        columns = text_columns(df)
     
     for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            if df[col].nunique() <= 10:
-                df = pd.get_dummies(df, columns=[col], prefix=[col])
+        if col in df.columns and is_text_column(df[col]):
+            if column_stat(df, col, 'nunique', stats) <= 10:
+                # Categories keep the column's dtype, which decides the dummy dtype.
+                fitted_categories = pd.Index(column_stat(df, col, 'categories', stats), dtype=text_values(df[col]).dtype)
+                categories = pd.Categorical(df[col], categories=fitted_categories)
+                dummies = pd.get_dummies(pd.Series(categories, index=df.index), prefix=col)
+                df = pd.concat([df.drop(columns=[col]), dummies], axis=1)
             else:
-                le = LabelEncoder()
-                df[col] = le.fit_transform(df[col].astype(str))
+                classes = column_stat(df, col, 'label_classes', stats)
+                df[col] = pd.Categorical(as_text(df[col]), categories=classes).codes.astype(np.int64)
     return df
 
-def normalize_numeric(df, columns):
+def normalize_numeric(df, columns, stats=None):
     if columns == "all":
         columns = df.select_dtypes(include=['number']).columns
     
     scaler = StandardScaler()
     for col in columns:
-        if col in df.columns and df[col].dtype in ['int64', 'float64']:
-            df[col] = scaler.fit_transform(df[[col]])
+        if col in df.columns and is_numeric_column(df[col]):
+            if stats is not None:
+                scale = column_stat(df, col, 'std_pop', stats) or 1.0
+                df[col] = (promote_numeric(df[col]) - column_stat(df, col, 'mean', stats)) / scale
+                invalidate_column_stats(stats, col)
+            else:
+                df[col] = scaler.fit_transform(df[[col]].astype('float64'))
     return df
 
-def standardize_date_format(df, columns):
+DATE_PATTERNS = [
+    '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y.%m.%d',
+    '%d-%m-%Y', '%m-%d-%Y', '%Y/%m/%d'
+]
+
+def standardize_date_format(df, columns, stats=None):
     if columns == "all":
-        columns = df.select_dtypes(include=['object']).columns
-    
-    date_patterns = [
-        '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y.%m.%d',
-        '%d-%m-%Y', '%m-%d-%Y', '%Y/%m/%d'
-    ]
+        columns = text_columns(df)
     
     for col in columns:
-        if col in df.columns:
-            for pattern in date_patterns:
-                try:
-                    df[col] = pd.to_datetime(df[col], format=pattern, errors='ignore')
-                except:
-                    continue
+        if col in df.columns and is_text_column(df[col]):
+            parsed, date_formats, failure_rate = parse_date_column(df[col], fitted_date_formats(stats, col))
+            if date_formats:
+                record_column_stat(stats, col, 'date_formats', date_formats)
+                record_column_stat(stats, col, 'date_failure_rate', failure_rate)
+            if parsed is not None:
+                df[col] = parsed
+                invalidate_column_stats(stats, col)
     return df
 
+def fitted_date_formats(stats, col):
+    # Patterns and the failure rate fitted elsewhere (over a whole file, or
+    # when a plan was fitted) decide the column as they are, so an ambiguous
+    # batch (03/04 vs 04/03) is read the way the fitted data was.
+    if stats is None or not stats.frozen:
+        return None
+    col_values = stats.values.get(col, {})
+    if 'date_formats' not in col_values:
+        return None
+    return col_values['date_formats'], col_values.get('date_failure_rate')
+
+def date_strings(uniques):
+    return pd.Series(np.asarray(uniques, dtype=object)).astype(str).str.strip()
+
+def rank_date_patterns(values):
+    # Patterns are ranked on a sample of the distinct values; columns where
+    # even the best mix of patterns fails too often are rejected there.
+    sample = values.sample(min(len(values), Config.DATE_SAMPLE_SIZE), random_state=0)
+    sample_rates = [(pattern, pd.to_datetime(sample, format=pattern, errors='coerce').notna().mean()) for pattern in DATE_PATTERNS]
+    ranked_patterns = [pattern for pattern, rate in sorted(sample_rates, key=lambda item: -item[1]) if rate > 0]
+    _, _, sample_unparsed = parse_with_patterns(sample, ranked_patterns)
+    if not ranked_patterns or sample_unparsed.mean() > Config.DATE_MAX_FAILURE_RATE:
+        return []
+    return ranked_patterns
+
+def fit_date_patterns(uniques, counts):
+    # The decision parse_date_column makes, from distinct values in order of
+    # first appearance and their counts (e.g. gathered chunk by chunk).
+    values = date_strings(uniques)
+    ranked_patterns = rank_date_patterns(values) if len(values) else []
+    if not ranked_patterns:
+        return [], None
+    _, used_patterns, unparsed = parse_with_patterns(values, ranked_patterns)
+    counts = np.asarray(counts)
+    return used_patterns, float(counts[unparsed.to_numpy()].sum() / counts.sum())
+
+def parse_date_column(series, fitted=None):
+    # Every distinct string is parsed once and the result is mapped back to
+    # the rows through the factorized codes.
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return None, [], None
+    values = date_strings(uniques)
+    
+    if fitted is not None:
+        ranked_patterns, failure_rate = fitted
+        if not ranked_patterns or failure_rate is None or failure_rate > Config.DATE_MAX_FAILURE_RATE:
+            return None, list(ranked_patterns), failure_rate
+        parsed, _, _ = parse_with_patterns(values, ranked_patterns)
+        used_patterns = list(ranked_patterns)
+    else:
+        ranked_patterns = rank_date_patterns(values)
+        if not ranked_patterns:
+            return None, [], None
+        parsed, used_patterns, unparsed = parse_with_patterns(values, ranked_patterns)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        failure_rate = float(counts[unparsed.to_numpy()].sum() / counts.sum())
+        if failure_rate > Config.DATE_MAX_FAILURE_RATE:
+            return None, used_patterns, failure_rate
+    
+    # Code -1 (missing) picks the NaT appended after the parsed values.
+    lookup = np.append(parsed.to_numpy(), np.datetime64('NaT'))
+    return pd.Series(lookup[codes], index=series.index), used_patterns, failure_rate
+
+def parse_with_patterns(values, patterns):
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    unparsed = pd.Series(True, index=values.index)
+    used_patterns = []
+    
+    for pattern in patterns:
+        if not unparsed.any():
+            break
+        attempt = pd.to_datetime(values[unparsed], format=pattern, errors='coerce')
+        matched = attempt.notna()
+        if matched.any():
+            parsed[matched[matched].index] = attempt[matched]
+            unparsed[matched[matched].index] = False
+            used_patterns.append(pattern)
+    return parsed, used_patterns, unparsed
+
 def extract_features(df, columns):
     for col in columns:
         if col in df.columns:
-            if df[col].dtype == 'object':
-                df[f'{col}_length'] = df[col].str.len()
+            if is_text_column(df[col]):
+                df[f'{col}_length'] = to_numpy_dtype(df[col].str.len())
             elif pd.api.types.is_datetime64_any_dtype(df[col]):
                 df[f'{col}_year'] = df[col].dt.year
                 df[f'{col}_month'] = df[col].dt.month
@@ -276,45 +885,34 @@ def rename_columns(df, columns):
     return df.rename(columns=rename_dict)
 
 def handle_inconsistent_casing(df, columns):
-    if columns == "all":
-        columns = df.select_dtypes(include=['object']).columns
-    
-    for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.title()
-    return df
+    return apply_string_kernel(df, "handle_inconsistent_casing", columns)
+
+SPECIAL_CHARACTERS_PATTERN = re.compile(r'[^\w\s]')
 
 def remove_special_characters(df, columns):
-    if columns == "all":
-        columns = df.select_dtypes(include=['object']).columns
-    
-    for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.replace(r'[^\w\s]', '', regex=True)
-    return df
+    return apply_string_kernel(df, "remove_special_characters", columns)
 
 def validate_email_format(df, columns):
     email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     
     for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[f'{col}_valid'] = df[col].astype(str).str.match(email_pattern)
+        if col in df.columns and is_text_column(df[col]):
+            df[f'{col}_valid'] = transform_text_column(df[col], lambda values: as_text(values).str.match(email_pattern))
     return df
 
 def validate_phone_format(df, columns):
     phone_pattern = r'^[\+]?[1-9][\d]{0,15}$'
     
     for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            clean_phone = df[col].astype(str).str.replace(r'[\s\(\)\-]', '', regex=True)
-            df[f'{col}_valid'] = clean_phone.str.match(phone_pattern)
+        if col in df.columns and is_text_column(df[col]):
+            df[f'{col}_valid'] = transform_text_column(df[col], lambda values: as_text(values).str.replace(r'[\s\(\)\-]', '', regex=True).str.match(phone_pattern))
     return df
 
 def handle_currency_format(df, columns):
     for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.replace(r'[^\d.]', '', regex=True)
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+        if col in df.columns and is_text_column(df[col]):
+            df[col] = as_text(df[col]).str.replace(r'[^\d.]', '', regex=True)
+            df[col] = text_to_numeric(df[col])
     return df
 
 def convert_units(df, columns):
@@ -326,60 +924,51 @@ def convert_units(df, columns):
     }
     
     for col in columns:
-        if col in df.columns and df[col].dtype in ['int64', 'float64']:
-            df[f'{col}_converted'] = df[col] * conversion_factors.get('kg_to_lb', 1)
+        if col in df.columns and is_numeric_column(df[col]):
+            df[f'{col}_converted'] = promote_numeric(df[col]) * conversion_factors.get('kg_to_lb', 1)
     return df
 
-def handle_skewness(df, columns):
+def handle_skewness(df, columns, stats=None):
     if columns == "all":
         columns = df.select_dtypes(include=['number']).columns
     
     for col in columns:
-        if col in df.columns and df[col].dtype in ['int64', 'float64']:
-            skewness = df[col].skew()
+        if col in df.columns and is_numeric_column(df[col]):
+            skewness = column_stat(df, col, 'skew', stats)
             if abs(skewness) > 1:
-                df[col] = np.log1p(df[col])
+                df[col] = np.log1p(promote_numeric(df[col]))
+                invalidate_column_stats(stats, col)
     return df
 
-def bin_numeric_variables(df, columns):
+def bin_numeric_variables(df, columns, stats=None):
     for col in columns:
-        if col in df.columns and df[col].dtype in ['int64', 'float64']:
-            df[f'{col}_binned'] = pd.cut(df[col], bins=5, labels=['Very Low', 'Low', 'Medium', 'High', 'Very High'])
+        if col in df.columns and is_numeric_column(df[col]):
+            bin_edges = column_stat(df, col, 'bin_edges', stats)
+            df[f'{col}_binned'] = pd.cut(df[col], bins=bin_edges, labels=['Very Low', 'Low', 'Medium', 'High', 'Very High'])
     return df
 
 def handle_text_encoding(df, columns):
-    for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.encode('utf-8', errors='ignore').str.decode('utf-8')
-    return df
+    return apply_string_kernel(df, "handle_text_encoding", columns)
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
 
 def remove_whitespace(df, columns):
-    if columns == "all":
-        columns = df.select_dtypes(include=['object']).columns
-    
-    for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.strip().str.replace(r'\s+', ' ', regex=True)
-    return df
+    return apply_string_kernel(df, "remove_whitespace", columns)
 
 def validate_postal_codes(df, columns):
     postal_pattern = r'^[A-Z0-9\-\s]{3,10}$'
     
     for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[f'{col}_valid'] = df[col].astype(str).str.upper().str.match(postal_pattern)
+        if col in df.columns and is_text_column(df[col]):
+            df[f'{col}_valid'] = transform_text_column(df[col], lambda values: as_text(values).str.upper().str.match(postal_pattern))
     return df
 
-def handle_country_names(df, columns):
-    country_mapping = {
-        'usa': 'United States', 'us': 'United States', 'u.s.a': 'United States',
-        'uk': 'United Kingdom', 'u.k': 'United Kingdom', 'england': 'United Kingdom',
-        'uae': 'United Arab Emirates'
-    }
+def handle_country_names(df, columns, domain_info=None):
+    country_mapping = get_replacer("countries", replacement_domain(domain_info)).mapping
     
     for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.lower().map(country_mapping).fillna(df[col])
+        if col in df.columns and is_text_column(df[col]):
+            df[col] = transform_text_column(df[col], lambda values: as_text(values).str.strip().str.lower().map(country_mapping).fillna(values))
     return df
 
 def extract_datetime_components(df, columns):
@@ -391,34 +980,36 @@ def extract_datetime_components(df, columns):
             df[f'{col}_dayofweek'] = df[col].dt.dayofweek
     return df
 
-def handle_abbreviations(df, columns):
-    abbreviation_mapping = {
-        'st': 'street', 'rd': 'road', 'ave': 'avenue', 'blvd': 'boulevard',
-        'dr': 'drive', 'ln': 'lane', 'ct': 'court', 'pl': 'place'
-    }
-    
-    for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            for abbr, full in abbreviation_mapping.items():
-                df[col] = df[col].astype(str).str.replace(rf'\b{abbr}\b', full, regex=True)
-    return df
+def replacement_domain(domain_info):
+    return domain_info.get('domain') if domain_info else None
+
+def handle_abbreviations_kernel(col, domain_info=None):
+    # Every abbreviation of the domain's table is matched by one compiled
+    # pattern, so each value is scanned once.
+    return get_replacer("abbreviations", replacement_domain(domain_info)).sub
 
-def detect_anomalies(df, columns):
+def handle_abbreviations(df, columns, domain_info=None):
+    return apply_string_kernel(df, "handle_abbreviations", columns, domain_info)
+
+def detect_anomalies(df, columns, stats=None):
     if columns == "all":
         columns = df.select_dtypes(include=['number']).columns
     
     for col in columns:
-        if col in df.columns and df[col].dtype in ['int64', 'float64']:
-            z_scores = np.abs((df[col] - df[col].mean()) / df[col].std())
-            df[f'{col}_anomaly'] = z_scores > 3
+        if col in df.columns and is_numeric_column(df[col]):
+            df[f'{col}_anomaly'] = column_outliers(df, col, "zscore", stats, 3)
     return df
 
-def handle_zero_values(df, columns):
+def handle_zero_values(df, columns, stats=None):
     for col in columns:
-        if col in df.columns and df[col].dtype in ['int64', 'float64']:
+        if col in df.columns and is_numeric_column(df[col]):
             zero_mask = df[col] == 0
             if zero_mask.any():
-                df.loc[zero_mask, col] = df[col].median()
+                df[col] = promote_numeric(df[col])
+                df.loc[zero_mask, col] = column_stat(df, col, 'median', stats)
+                invalidate_column_stats(stats, col)
+            elif fitting_column_stats(stats):
+                column_stat(df, col, 'median', stats)
     return df
 
 def standardize_boolean(df, columns):
@@ -428,29 +1019,35 @@ def standardize_boolean(df, columns):
     }
     
     for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.lower().map(bool_mapping).fillna(df[col])
+        if col in df.columns and is_text_column(df[col]):
+            df[col] = transform_text_column(df[col], lambda values: as_text(values).str.lower().map(bool_mapping).fillna(values))
     return df
 
-def handle_infinite_values(df, columns):
+def handle_infinite_values(df, columns, stats=None):
     if columns == "all":
         columns = df.select_dtypes(include=['number']).columns
     
     for col in columns:
-        if col in df.columns and df[col].dtype in ['int64', 'float64']:
-            df[col] = df[col].replace([np.inf, -np.inf], np.nan)
-            df[col].fillna(df[col].median(), inplace=True)
+        if col in df.columns and is_numeric_column(df[col]):
+            if not (np.isinf(df[col]).any() or df[col].isna().any()):
+                if fitting_column_stats(stats):
+                    column_stat(df, col, 'median', stats)
+                continue
+            df[col] = promote_numeric(df[col]).replace([np.inf, -np.inf], np.nan)
+            invalidate_column_stats(stats, col)
+            df[col] = df[col].fillna(column_stat(df, col, 'median', stats))
+            invalidate_column_stats(stats, col)
     return df
 
-def validate_ranges(df, columns):
+def validate_ranges(df, columns, stats=None):
     for col in columns:
-        if col in df.columns and df[col].dtype in ['int64', 'float64']:
-            df[f'{col}_in_range'] = (df[col] >= df[col].quantile(0.01)) & (df[col] <= df[col].quantile(0.99))
+        if col in df.columns and is_numeric_column(df[col]):
+            df[f'{col}_in_range'] = ~column_outliers(df, col, "percentile", stats) & df[col].notna()
     return df
 
 def handle_negative_values(df, columns):
     for col in columns:
-        if col in df.columns and df[col].dtype in ['int64', 'float64']:
+        if col in df.columns and is_numeric_column(df[col]):
             negative_mask = df[col] < 0
             if negative_mask.any() and col.lower() not in ['profit', 'growth', 'change']:
                 df.loc[negative_mask, col] = abs(df.loc[negative_mask, col])
@@ -459,37 +1056,37 @@ def handle_negative_values(df, columns):
 def create_derived_features(df, columns):
     numeric_cols = df.select_dtypes(include=['number']).columns
     if len(numeric_cols) >= 2:
-        df['feature_ratio'] = df[numeric_cols[0]] / (df[numeric_cols[1]] + 1e-8)
-        df['feature_sum'] = df[numeric_cols[0]] + df[numeric_cols[1]]
+        first, second = promote_numeric(df[numeric_cols[0]]), promote_numeric(df[numeric_cols[1]])
+        df['feature_ratio'] = first / (second + 1e-8)
+        df['feature_sum'] = first + second
     return df
 
-def handle_multiple_categories(df, columns):
+def handle_multiple_categories(df, columns, stats=None):
     for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            value_counts = df[col].value_counts()
-            top_categories = value_counts.head(10).index
-            df[col] = df[col].where(df[col].isin(top_categories), 'Other')
+        if col in df.columns and is_text_column(df[col]):
+            top_categories = column_stat(df, col, 'top_categories', stats)
+            in_top_categories = df[col].isin(top_categories)
+            if not in_top_categories.all():
+                df[col] = add_category(df[col], 'Other').where(in_top_categories, 'Other')
+                invalidate_column_stats(stats, col)
     return df
 
 def standardize_address_format(df, columns):
-    for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.upper().str.strip()
-    return df
+    return apply_string_kernel(df, "standardize_address_format", columns)
 
 def validate_urls(df, columns):
     url_pattern = r'^https?://[^\s/$.?#].[^\s]*$'
     
     for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[f'{col}_valid'] = df[col].astype(str).str.match(url_pattern, case=False)
+        if col in df.columns and is_text_column(df[col]):
+            df[f'{col}_valid'] = transform_text_column(df[col], lambda values: as_text(values).str.match(url_pattern, case=False))
     return df
 
 def handle_percentages(df, columns):
     for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.replace('%', '').str.strip()
-            df[col] = pd.to_numeric(df[col], errors='coerce') / 100
+        if col in df.columns and is_text_column(df[col]):
+            df[col] = as_text(df[col]).str.replace('%', '').str.strip()
+            df[col] = text_to_numeric(df[col]) / 100
     return df
 
 def remove_irrelevant_columns(df, columns):
@@ -509,10 +1106,7 @@ def handle_correlated_features(df, columns):
     return df.drop(columns=to_drop)
 
 def standardize_names(df, columns):
-    for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
-            df[col] = df[col].astype(str).str.title().str.strip()
-    return df
+    return apply_string_kernel(df, "standardize_names", columns)
 
 def handle_ordinal_categories(df, columns):
     ordinal_mappings = {
@@ -522,9 +1116,61 @@ def handle_ordinal_categories(df, columns):
     }
     
     for col in columns:
-        if col in df.columns and df[col].dtype == 'object':
+        if col in df.columns and is_text_column(df[col]):
             for category, levels in ordinal_mappings.items():
                 if category in col.lower():
                     df[col] = pd.Categorical(df[col], categories=levels, ordered=True)
                     break
-    return df
\ No newline at end of file
+    return df
+
+ACTION_REGISTRY = {
+    "handle_missing_values": {"function": handle_missing_values, "params": ["columns", "domain_info", "stats"], "select": "any", "effect": "in_place", "string_kernel": None},
+    "optimize_memory": {"function": optimize_memory, "params": ["columns"], "select": "any", "effect": "in_place", "string_kernel": None},
+    "remove_duplicates": {"function": remove_duplicates, "params": ["columns"], "select": "any", "effect": "filter_rows", "string_kernel": None},
+    "fix_data_types": {"function": fix_data_types, "params": ["columns", "stats"], "select": "any", "effect": "in_place", "string_kernel": None},
+    "standardize_format": {"function": standardize_format, "params": ["columns"], "select": "text", "effect": "in_place", "string_kernel": standardize_format_kernel},
+    "remove_outliers": {"function": remove_outliers, "params": ["columns", "stats"], "select": "number", "effect": "filter_rows", "string_kernel": None},
+    "flag_outliers": {"function": flag_outliers, "params": ["columns", "stats"], "select": "number", "effect": "frame", "string_kernel": None},
+    "encode_categorical": {"function": encode_categorical, "params": ["columns", "stats"], "select": "text", "effect": "frame", "string_kernel": None},
+    "normalize_numeric": {"function": normalize_numeric, "params": ["columns", "stats"], "select": "number", "effect": "in_place", "string_kernel": None},
+    "standardize_date_format": {"function": standardize_date_format, "params": ["columns", "stats"], "select": "text", "effect": "in_place", "string_kernel": None},
+    "extract_features": {"function": extract_features, "params": ["columns"], "select": None, "effect": "derive", "string_kernel": None},
+    "remove_columns": {"function": remove_columns, "params": ["columns"], "select": None, "effect": "drop_columns", "string_kernel": None},
+    "rename_columns": {"function": rename_columns, "params": ["columns"], "select": None, "effect": "rename", "string_kernel": None},
+    "handle_inconsistent_casing": {"function": handle_inconsistent_casing, "params": ["columns"], "select": "text", "effect": "in_place", "string_kernel": lambda col, domain_info=None: str.title},
+    "remove_special_characters": {"function": remove_special_characters, "params": ["columns"], "select": "text", "effect": "in_place", "string_kernel": lambda col, domain_info=None: lambda value: SPECIAL_CHARACTERS_PATTERN.sub('', value)},
+    "validate_email_format": {"function": validate_email_format, "params": ["columns"], "select": None, "effect": "derive", "string_kernel": None},
+    "validate_phone_format": {"function": validate_phone_format, "params": ["columns"], "select": None, "effect": "derive", "string_kernel": None},
+    "handle_currency_format": {"function": handle_currency_format, "params": ["columns"], "select": None, "effect": "in_place", "string_kernel": None},
+    "convert_units": {"function": convert_units, "params": ["columns"], "select": None, "effect": "derive", "string_kernel": None},
+    "handle_skewness": {"function": handle_skewness, "params": ["columns", "stats"], "select": "number", "effect": "in_place", "string_kernel": None},
+    "bin_numeric_variables": {"function": bin_numeric_variables, "params": ["columns", "stats"], "select": None, "effect": "derive", "string_kernel": None},
+    "handle_text_encoding": {"function": handle_text_encoding, "params": ["columns"], "select": None, "effect": "in_place", "string_kernel": lambda col, domain_info=None: lambda value: value.encode('utf-8', errors='ignore').decode('utf-8')},
+    "remove_whitespace": {"function": remove_whitespace, "params": ["columns"], "select": "text", "effect": "in_place", "string_kernel": lambda col, domain_info=None: lambda value: WHITESPACE_PATTERN.sub(' ', value.strip())},
+    "validate_postal_codes": {"function": validate_postal_codes, "params": ["columns"], "select": None, "effect": "derive", "string_kernel": None},
+    "handle_country_names": {"function": handle_country_names, "params": ["columns", "domain_info"], "select": None, "effect": "in_place", "string_kernel": None},
+    "extract_datetime_components": {"function": extract_datetime_components, "params": ["columns"], "select": None, "effect": "derive", "string_kernel": None},
+    "handle_abbreviations": {"function": handle_abbreviations, "params": ["columns", "domain_info"], "select": None, "effect": "in_place", "string_kernel": handle_abbreviations_kernel},
+    "detect_anomalies": {"function": detect_anomalies, "params": ["columns", "stats"], "select": "number", "effect": "derive", "string_kernel": None},
+    "handle_zero_values": {"function": handle_zero_values, "params": ["columns", "stats"], "select": None, "effect": "in_place", "string_kernel": None},
+    "standardize_boolean": {"function": standardize_boolean, "params": ["columns"], "select": None, "effect": "in_place", "string_kernel": None},
+    "handle_infinite_values": {"function": handle_infinite_values, "params": ["columns", "stats"], "select": "number", "effect": "in_place", "string_kernel": None},
+    "validate_ranges": {"function": validate_ranges, "params": ["columns", "stats"], "select": None, "effect": "derive", "string_kernel": None},
+    "handle_negative_values": {"function": handle_negative_values, "params": ["columns"], "select": None, "effect": "in_place", "string_kernel": None},
+    "create_derived_features": {"function": create_derived_features, "params": ["columns"], "select": None, "effect": "frame", "string_kernel": None},
+    "handle_multiple_categories": {"function": handle_multiple_categories, "params": ["columns", "stats"], "select": None, "effect": "in_place", "string_kernel": None},
+    "standardize_address_format": {"function": standardize_address_format, "params": ["columns"], "select": None, "effect": "in_place", "string_kernel": lambda col, domain_info=None: lambda value: value.upper().strip()},
+    "validate_urls": {"function": validate_urls, "params": ["columns"], "select": None, "effect": "derive", "string_kernel": None},
+    "handle_percentages": {"function": handle_percentages, "params": ["columns"], "select": None, "effect": "in_place", "string_kernel": None},
+    "remove_irrelevant_columns": {"function": remove_irrelevant_columns, "params": ["columns"], "select": "any", "effect": "drop_columns", "string_kernel": None},
+    "handle_correlated_features": {"function": handle_correlated_features, "params": ["columns"], "select": "number", "effect": "drop_columns", "string_kernel": None},
+    "standardize_names": {"function": standardize_names, "params": ["columns"], "select": None, "effect": "in_place", "string_kernel": lambda col, domain_info=None: lambda value: value.title().strip()},
+    "handle_ordinal_categories": {"function": handle_ordinal_categories, "params": ["columns"], "select": None, "effect": "in_place", "string_kernel": None}
+}
+
+STRING_ACTIONS = [name for name, entry in ACTION_REGISTRY.items() if entry["string_kernel"] is not None]
+
+# Errors a string kernel can raise on unexpected values; a fused segment that
+# hits one falls back to running its actions one by one. Anything else is a
+# bug and propagates.
+FUSED_FALLBACK_ERRORS = (KeyError, TypeError, ValueError, AttributeError)
@@ -0,0 +1,79 @@
+import pandas as pd
+import numpy as np
+from config import Config
+
+class DatasetProfile:
+    approximate = False
+
+    def __init__(self, df):
+        self.shape = df.shape
+        self.columns = df.columns.tolist()
+        self.dtypes = df.dtypes
+        self.null_counts = df.isnull().sum()
+        self.total_nulls = int(self.null_counts.sum())
+
+        self.row_hashes = hash_rows(df)
+        self.duplicate_count = int(duplicated_rows(df, row_hashes=self.row_hashes).sum())
+
+        self.memory_by_column = df.memory_usage(deep=True)
+        self.memory_usage = int(self.memory_by_column.sum())
+
+        self.numeric_columns = df.select_dtypes(include=['number']).columns.tolist()
+        self.categorical_columns = df.select_dtypes(include=Config.TEXT_DTYPES).columns.tolist()
+        self.date_columns = df.select_dtypes(include=['datetime']).columns.tolist()
+
+        self.nunique = df.nunique()
+        self.numeric_stats = df[self.numeric_columns].describe().to_dict() if self.numeric_columns else {}
+        self.error_bounds = {}
+
+def profile_dataset(df, approximate=None):
+    # Large frames are profiled from mergeable sketches (see sketches.py)
+    # instead of exact distinct counts, quartiles and duplicate checks.
+    if approximate is None:
+        approximate = len(df) >= Config.APPROXIMATE_PROFILE_MIN_ROWS
+    if approximate:
+        from sketches import sketch_dataset
+        return sketch_dataset(df).profile()
+    return DatasetProfile(df)
+
+def hash_rows(df, columns=None):
+    subset = df if columns is None else df[columns]
+    if subset.shape[1] == 0:
+        return pd.Series(0, index=df.index, dtype='uint64')
+    return pd.util.hash_pandas_object(subset, index=False)
+
+def duplicated_rows(df, columns=None, row_hashes=None):
+    try:
+        row_hashes = row_hashes if row_hashes is not None else hash_rows(df, columns)
+    except TypeError:
+        # Unhashable cell values (lists, dicts) fall back to the full comparison.
+        return df.duplicated(subset=columns)
+
+    # Equal rows always share a hash, so a row is a duplicate when its hash was
+    # seen before. Each such row is compared against the first row with the same
+    # hash to rule out 64-bit collisions; groups where that comparison fails
+    # fall back to a full comparison of their rows.
+    codes, uniques = pd.factorize(row_hashes.to_numpy())
+    positions = np.arange(len(codes))
+    first_positions = np.empty(len(uniques), dtype=np.int64)
+    first_positions[codes[::-1]] = positions[::-1]
+    first_seen = first_positions[codes]
+    duplicated = first_seen != positions
+
+    candidates = positions[duplicated]
+    if len(candidates) == 0:
+        return pd.Series(duplicated, index=df.index)
+
+    subset = df if columns is None else df[columns]
+    mismatched = np.zeros(len(candidates), dtype=bool)
+    for i in range(subset.shape[1]):
+        values = subset.iloc[:, i]
+        current = values.iloc[candidates].reset_index(drop=True)
+        first = values.iloc[first_seen[candidates]].reset_index(drop=True)
+        both_null = (current.isna() & first.isna()).to_numpy()
+        mismatched |= ~((current == first).fillna(False).to_numpy(dtype=bool) | both_null)
+
+    if mismatched.any():
+        collided = np.isin(codes, codes[candidates[mismatched]])
+        duplicated[collided] = subset[collided].duplicated().to_numpy()
+    return pd.Series(duplicated, index=df.index)
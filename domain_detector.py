@@ -1,15 +1,60 @@
 import pandas as pd
 import json
+import asyncio
+import math
+import re
+from config import Config
 from langchain_core.messages import HumanMessage, SystemMessage
+from llm_cache import schema_fingerprint, dataset_schema, model_name
 def extract_dataset_info(df, sample_rows=3):
+    # Large files are often sorted or grouped, so their sample rows come from
+    # a reservoir over the whole frame rather than from its head.
+    if len(df) >= Config.APPROXIMATE_PROFILE_MIN_ROWS:
+        from sketches import reservoir_sample
+        sample = reservoir_sample(df, sample_rows)
+    else:
+        sample = df.head(sample_rows)
     column_info = {
         "columns": df.columns.tolist(),
         "dtypes": df.dtypes.astype(str).to_dict(),
-        "sample_data": df.head(sample_rows).to_dict('records')
+        "sample_data": sample.to_dict('records')
     }
     return column_info
 
-def detect_domain(df, chat_model, sample_rows=3):
+def detect_domain(df, chat_model, sample_rows=3, cache=None):
+    domain_info, messages, cache_key = prepare_domain_request(df, chat_model, sample_rows, cache)
+    if domain_info is not None:
+        return domain_info
+    
+    try:
+        response = chat_model.invoke(messages)
+        return parse_domain_response(response.content, cache, cache_key)
+    except Exception as e:
+        return domain_detection_error(e)
+
+async def adetect_domain(df, chat_model, sample_rows=3, cache=None, timeout=None):
+    domain_info, messages, cache_key = prepare_domain_request(df, chat_model, sample_rows, cache)
+    if domain_info is not None:
+        return domain_info
+    
+    try:
+        response = await asyncio.wait_for(chat_model.ainvoke(messages), timeout or Config.LLM_TIMEOUT_SECONDS)
+        return parse_domain_response(response.content, cache, cache_key)
+    except Exception as e:
+        return domain_detection_error(e)
+
+def prepare_domain_request(df, chat_model, sample_rows=3, cache=None):
+    if Config.DOMAIN_FAST_PATH:
+        local_domain = classify_domain_locally(df)
+        if local_domain['confidence'] != 'low':
+            return local_domain, None, None
+    
+    cache_key = schema_fingerprint(model_name(chat_model), dataset_schema(df))
+    if cache is not None:
+        cached_domain = cache.get("detect_domain", cache_key)
+        if cached_domain is not None:
+            return cached_domain, None, cache_key
+    
     column_info = extract_dataset_info(df, sample_rows)
     
     system_prompt = """Analyze the dataset structure and determine its domain based on:
@@ -24,104 +69,240 @@ def detect_domain(df, chat_model, sample_rows=3):
         SystemMessage(content=system_prompt),
         HumanMessage(content=json.dumps(column_info, indent=2))
     ]
-    
-    try:
-        response = chat_model.invoke(messages)
-        return json.loads(response.content)
-    except Exception as e:
-        return {"domain": "general", "confidence": "low", "reasoning": f"Error in detection: {str(e)}"}
+    return None, messages, cache_key
+
+def parse_domain_response(content, cache=None, cache_key=None):
+    domain_info = json.loads(content)
+    if cache is not None:
+        cache.set("detect_domain", cache_key, domain_info)
+    return domain_info
+
+def domain_detection_error(e):
+    return {"domain": "general", "confidence": "low", "reasoning": f"Error in detection: {str(e) or type(e).__name__}"}
+
+DOMAIN_GUIDELINES = {
+    "sales": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "handle_currency_format", "validate_ranges", "standardize_names", "handle_skewness", "encode_categorical", "remove_outliers", "create_derived_features"],
+    "ecommerce": ["handle_missing_values", "remove_duplicates", "standardize_product_codes", "handle_currency_format", "validate_urls", "standardize_format", "encode_categorical", "remove_outliers", "extract_features", "handle_multiple_categories"],
+    "retail": ["handle_missing_values", "remove_duplicates", "standardize_product_codes", "handle_currency_format", "validate_ranges", "standardize_measurements", "encode_categorical", "remove_outliers", "bin_numeric_variables", "handle_imbalanced_data"],
+    "finance": ["handle_missing_values", "remove_duplicates", "handle_currency_format", "validate_credit_cards", "validate_ranges", "remove_outliers", "handle_skewness", "normalize_numeric", "detect_anomalies", "validate_account_numbers"],
+    "banking": ["handle_missing_values", "remove_duplicates", "handle_currency_format", "validate_credit_cards", "validate_ranges", "standardize_names", "encode_categorical", "remove_outliers", "detect_anomalies", "validate_social_security"],
+    "insurance": ["handle_missing_values", "remove_duplicates", "handle_currency_format", "validate_ranges", "standardize_names", "encode_categorical", "remove_outliers", "handle_skewness", "validate_ages", "handle_imbalanced_data"],
+    "healthcare": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ages", "validate_ranges", "standardize_medical_codes", "encode_categorical", "remove_outliers", "handle_sensitive_data", "validate_medical_values"],
+    "medical": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ages", "validate_ranges", "standardize_medical_codes", "encode_categorical", "remove_outliers", "handle_lab_results", "validate_measurements"],
+    "pharmaceuticals": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ranges", "standardize_drug_codes", "encode_categorical", "remove_outliers", "handle_chemical_data", "validate_concentrations", "standardize_units"],
+    "users": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_phone_format", "standardize_names", "validate_ages", "standardize_location", "encode_categorical", "remove_special_characters", "handle_inconsistent_casing"],
+    "customers": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_phone_format", "standardize_names", "validate_ages", "standardize_location", "encode_categorical", "segment_customers", "create_derived_features"],
+    "marketing": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_urls", "standardize_campaign_codes", "encode_categorical", "remove_outliers", "handle_skewness", "create_derived_features", "bin_numeric_variables"],
+    "advertising": ["handle_missing_values", "remove_duplicates", "validate_urls", "standardize_campaign_codes", "handle_currency_format", "encode_categorical", "remove_outliers", "handle_skewness", "create_derived_features", "validate_impression_data"],
+    "weather": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "create_derived_features", "handle_time_series"],
+    "climate": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "create_derived_features", "handle_time_series"],
+    "environment": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "encode_categorical", "validate_environmental_data"],
+    "education": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ages", "validate_grades", "standardize_course_codes", "encode_categorical", "remove_outliers", "handle_academic_data", "create_derived_features"],
+    "academic": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_citation_data", "standardize_research_codes", "encode_categorical", "remove_outliers", "handle_research_metrics", "validate_publication_data", "create_derived_features"],
+    "research": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_measurements", "standardize_experiment_codes", "encode_categorical", "remove_outliers", "handle_scientific_data", "validate_statistical_data", "create_derived_features"],
+    "real_estate": ["handle_missing_values", "remove_duplicates", "handle_currency_format", "validate_ranges", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "standardize_property_codes", "create_derived_features"],
+    "property": ["handle_missing_values", "remove_duplicates", "handle_currency_format", "validate_ranges", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "standardize_property_codes", "validate_property_data"],
+    "manufacturing": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ranges", "standardize_product_codes", "encode_categorical", "remove_outliers", "handle_quality_metrics", "standardize_measurements", "validate_production_data"],
+    "production": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ranges", "standardize_product_codes", "encode_categorical", "remove_outliers", "handle_quality_metrics", "standardize_measurements", "validate_manufacturing_data"],
+    "logistics": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_tracking_numbers", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "validate_shipment_data", "create_derived_features"],
+    "supply_chain": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_inventory_codes", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "validate_supply_data", "create_derived_features"],
+    "transportation": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_vehicle_data", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "validate_transport_data", "create_derived_features"],
+    "shipping": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_tracking_numbers", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "validate_shipment_data", "create_derived_features"],
+    "human_resources": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_phone_format", "standardize_names", "validate_ages", "standardize_job_titles", "encode_categorical", "validate_salaries", "create_derived_features"],
+    "hr": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_phone_format", "standardize_names", "validate_ages", "standardize_job_titles", "encode_categorical", "validate_salaries", "handle_employee_data"],
+    "recruitment": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_phone_format", "standardize_names", "validate_ages", "standardize_job_titles", "encode_categorical", "validate_skills_data", "handle_applicant_data"],
+    "telecommunications": ["handle_missing_values", "remove_duplicates", "validate_phone_format", "validate_ip_addresses", "standardize_plan_codes", "encode_categorical", "remove_outliers", "handle_usage_data", "validate_network_data", "create_derived_features"],
+    "telecom": ["handle_missing_values", "remove_duplicates", "validate_phone_format", "validate_ip_addresses", "standardize_plan_codes", "encode_categorical", "remove_outliers", "handle_usage_data", "validate_network_data", "create_derived_features"],
+    "energy": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "validate_energy_data", "create_derived_features"],
+    "utilities": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "validate_utility_data", "create_derived_features"],
+    "agriculture": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "validate_agricultural_data", "create_derived_features"],
+    "farming": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "validate_crop_data", "create_derived_features"],
+    "entertainment": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_media_formats", "standardize_genre_codes", "encode_categorical", "remove_outliers", "handle_ratings_data", "validate_entertainment_data", "create_derived_features"],
+    "media": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_media_formats", "standardize_genre_codes", "encode_categorical", "remove_outliers", "handle_ratings_data", "validate_media_data", "create_derived_features"],
+    "sports": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_sports_codes", "standardize_team_names", "encode_categorical", "remove_outliers", "handle_performance_data", "validate_sports_metrics", "create_derived_features"],
+    "fitness": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_health_metrics", "standardize_exercise_codes", "encode_categorical", "remove_outliers", "handle_fitness_data", "validate_workout_data", "create_derived_features"],
+    "government": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_government_codes", "standardize_department_names", "encode_categorical", "remove_outliers", "handle_public_data", "validate_government_data", "create_derived_features"],
+    "public_sector": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_public_codes", "standardize_department_names", "encode_categorical", "remove_outliers", "handle_public_data", "validate_public_records", "create_derived_features"],
+    "tourism": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_location_data", "standardize_tourism_codes", "encode_categorical", "remove_outliers", "handle_travel_data", "validate_tourism_metrics", "create_derived_features"],
+    "hospitality": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_location_data", "standardize_hotel_codes", "encode_categorical", "remove_outliers", "handle_booking_data", "validate_hospitality_metrics", "create_derived_features"],
+    "automotive": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_vehicle_codes", "standardize_manufacturer_names", "encode_categorical", "remove_outliers", "handle_automotive_data", "validate_vehicle_metrics", "create_derived_features"],
+    "technology": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_ip_addresses", "standardize_tech_codes", "encode_categorical", "remove_outliers", "handle_technical_data", "validate_technology_metrics", "create_derived_features"],
+    "IT": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_ip_addresses", "standardize_IT_codes", "encode_categorical", "remove_outliers", "handle_system_data", "validate_IT_metrics", "create_derived_features"],
+    "software": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_ip_addresses", "standardize_software_codes", "encode_categorical", "remove_outliers", "handle_software_metrics", "validate_development_data", "create_derived_features"],
+    "biotechnology": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_biological_codes", "standardize_lab_protocols", "encode_categorical", "remove_outliers", "handle_biological_data", "validate_biotech_metrics", "create_derived_features"],
+    "bioinformatics": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_genomic_codes", "standardize_sequence_data", "encode_categorical", "remove_outliers", "handle_genomic_data", "validate_bioinformatics_data", "create_derived_features"],
+    "social_media": ["handle_missing_values", "remove_duplicates", "validate_urls", "validate_email_format", "standardize_social_platforms", "encode_categorical", "remove_outliers", "handle_engagement_data", "validate_social_metrics", "create_derived_features"],
+    "networking": ["handle_missing_values", "remove_duplicates", "validate_ip_addresses", "validate_urls", "standardize_network_codes", "encode_categorical", "remove_outliers", "handle_network_data", "validate_networking_metrics", "create_derived_features"],
+    "legal": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_legal_codes", "standardize_case_numbers", "encode_categorical", "remove_outliers", "handle_legal_data", "validate_legal_documents", "create_derived_features"],
+    "law": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_legal_codes", "standardize_case_numbers", "encode_categorical", "remove_outliers", "handle_legal_data", "validate_legal_documents", "create_derived_features"],
+    "construction": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_construction_codes", "standardize_project_numbers", "encode_categorical", "remove_outliers", "handle_construction_data", "validate_building_metrics", "create_derived_features"],
+    "engineering": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_engineering_codes", "standardize_project_numbers", "encode_categorical", "remove_outliers", "handle_engineering_data", "validate_engineering_metrics", "create_derived_features"],
+    "aerospace": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_aerospace_codes", "standardize_aircraft_data", "encode_categorical", "remove_outliers", "handle_aerospace_data", "validate_flight_metrics", "create_derived_features"],
+    "aviation": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_aviation_codes", "standardize_aircraft_data", "encode_categorical", "remove_outliers", "handle_aviation_data", "validate_flight_metrics", "create_derived_features"],
+    "maritime": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_maritime_codes", "standardize_vessel_data", "encode_categorical", "remove_outliers", "handle_maritime_data", "validate_shipping_metrics", "create_derived_features"],
+    "naval": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_naval_codes", "standardize_vessel_data", "encode_categorical", "remove_outliers", "handle_naval_data", "validate_naval_metrics", "create_derived_features"],
+    "mining": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_mining_codes", "standardize_mineral_data", "encode_categorical", "remove_outliers", "handle_mining_data", "validate_mining_metrics", "create_derived_features"],
+    "resources": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_resource_codes", "standardize_resource_data", "encode_categorical", "remove_outliers", "handle_resource_data", "validate_resource_metrics", "create_derived_features"],
+    "textiles": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_textile_codes", "standardize_material_data", "encode_categorical", "remove_outliers", "handle_textile_data", "validate_textile_metrics", "create_derived_features"],
+    "fashion": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_fashion_codes", "standardize_size_data", "encode_categorical", "remove_outliers", "handle_fashion_data", "validate_fashion_metrics", "create_derived_features"],
+    "food_beverage": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_food_codes", "standardize_ingredient_data", "encode_categorical", "remove_outliers", "handle_food_data", "validate_nutrition_metrics", "create_derived_features"],
+    "restaurant": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_menu_codes", "standardize_ingredient_data", "encode_categorical", "remove_outliers", "handle_restaurant_data", "validate_restaurant_metrics", "create_derived_features"]
+}
+
+DEFAULT_GUIDELINES = ["handle_missing_values", "remove_duplicates", "fix_data_types", "standardize_format", "validate_ranges", "encode_categorical", "remove_outliers", "create_derived_features"]
 
 def get_domain_specific_guidelines(domain):
-    guidelines = {
-        "sales": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "handle_currency_format", "validate_ranges", "standardize_names", "handle_skewness", "encode_categorical", "remove_outliers", "create_derived_features"],
-        "ecommerce": ["handle_missing_values", "remove_duplicates", "standardize_product_codes", "handle_currency_format", "validate_urls", "standardize_format", "encode_categorical", "remove_outliers", "extract_features", "handle_multiple_categories"],
-        "retail": ["handle_missing_values", "remove_duplicates", "standardize_product_codes", "handle_currency_format", "validate_ranges", "standardize_measurements", "encode_categorical", "remove_outliers", "bin_numeric_variables", "handle_imbalanced_data"],
-        "finance": ["handle_missing_values", "remove_duplicates", "handle_currency_format", "validate_credit_cards", "validate_ranges", "remove_outliers", "handle_skewness", "normalize_numeric", "detect_anomalies", "validate_account_numbers"],
-        "banking": ["handle_missing_values", "remove_duplicates", "handle_currency_format", "validate_credit_cards", "validate_ranges", "standardize_names", "encode_categorical", "remove_outliers", "detect_anomalies", "validate_social_security"],
-        "insurance": ["handle_missing_values", "remove_duplicates", "handle_currency_format", "validate_ranges", "standardize_names", "encode_categorical", "remove_outliers", "handle_skewness", "validate_ages", "handle_imbalanced_data"],
-        "healthcare": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ages", "validate_ranges", "standardize_medical_codes", "encode_categorical", "remove_outliers", "handle_sensitive_data", "validate_medical_values"],
-        "medical": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ages", "validate_ranges", "standardize_medical_codes", "encode_categorical", "remove_outliers", "handle_lab_results", "validate_measurements"],
-        "pharmaceuticals": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ranges", "standardize_drug_codes", "encode_categorical", "remove_outliers", "handle_chemical_data", "validate_concentrations", "standardize_units"],
-        "users": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_phone_format", "standardize_names", "validate_ages", "standardize_location", "encode_categorical", "remove_special_characters", "handle_inconsistent_casing"],
-        "customers": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_phone_format", "standardize_names", "validate_ages", "standardize_location", "encode_categorical", "segment_customers", "create_derived_features"],
-        "marketing": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_urls", "standardize_campaign_codes", "encode_categorical", "remove_outliers", "handle_skewness", "create_derived_features", "bin_numeric_variables"],
-        "advertising": ["handle_missing_values", "remove_duplicates", "validate_urls", "standardize_campaign_codes", "handle_currency_format", "encode_categorical", "remove_outliers", "handle_skewness", "create_derived_features", "validate_impression_data"],
-        "weather": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "create_derived_features", "handle_time_series"],
-        "climate": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "create_derived_features", "handle_time_series"],
-        "environment": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "encode_categorical", "validate_environmental_data"],
-        "education": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ages", "validate_grades", "standardize_course_codes", "encode_categorical", "remove_outliers", "handle_academic_data", "create_derived_features"],
-        "academic": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_citation_data", "standardize_research_codes", "encode_categorical", "remove_outliers", "handle_research_metrics", "validate_publication_data", "create_derived_features"],
-        "research": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_measurements", "standardize_experiment_codes", "encode_categorical", "remove_outliers", "handle_scientific_data", "validate_statistical_data", "create_derived_features"],
-        "real_estate": ["handle_missing_values", "remove_duplicates", "handle_currency_format", "validate_ranges", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "standardize_property_codes", "create_derived_features"],
-        "property": ["handle_missing_values", "remove_duplicates", "handle_currency_format", "validate_ranges", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "standardize_property_codes", "validate_property_data"],
-        "manufacturing": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ranges", "standardize_product_codes", "encode_categorical", "remove_outliers", "handle_quality_metrics", "standardize_measurements", "validate_production_data"],
-        "production": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_ranges", "standardize_product_codes", "encode_categorical", "remove_outliers", "handle_quality_metrics", "standardize_measurements", "validate_manufacturing_data"],
-        "logistics": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_tracking_numbers", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "validate_shipment_data", "create_derived_features"],
-        "supply_chain": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_inventory_codes", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "validate_supply_data", "create_derived_features"],
-        "transportation": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_vehicle_data", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "validate_transport_data", "create_derived_features"],
-        "shipping": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_tracking_numbers", "standardize_location", "encode_categorical", "remove_outliers", "handle_geospatial_data", "validate_shipment_data", "create_derived_features"],
-        "human_resources": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_phone_format", "standardize_names", "validate_ages", "standardize_job_titles", "encode_categorical", "validate_salaries", "create_derived_features"],
-        "hr": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_phone_format", "standardize_names", "validate_ages", "standardize_job_titles", "encode_categorical", "validate_salaries", "handle_employee_data"],
-        "recruitment": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_phone_format", "standardize_names", "validate_ages", "standardize_job_titles", "encode_categorical", "validate_skills_data", "handle_applicant_data"],
-        "telecommunications": ["handle_missing_values", "remove_duplicates", "validate_phone_format", "validate_ip_addresses", "standardize_plan_codes", "encode_categorical", "remove_outliers", "handle_usage_data", "validate_network_data", "create_derived_features"],
-        "telecom": ["handle_missing_values", "remove_duplicates", "validate_phone_format", "validate_ip_addresses", "standardize_plan_codes", "encode_categorical", "remove_outliers", "handle_usage_data", "validate_network_data", "create_derived_features"],
-        "energy": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "validate_energy_data", "create_derived_features"],
-        "utilities": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "validate_utility_data", "create_derived_features"],
-        "agriculture": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "validate_agricultural_data", "create_derived_features"],
-        "farming": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "convert_units", "validate_ranges", "remove_outliers", "handle_geospatial_data", "standardize_measurements", "validate_crop_data", "create_derived_features"],
-        "entertainment": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_media_formats", "standardize_genre_codes", "encode_categorical", "remove_outliers", "handle_ratings_data", "validate_entertainment_data", "create_derived_features"],
-        "media": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_media_formats", "standardize_genre_codes", "encode_categorical", "remove_outliers", "handle_ratings_data", "validate_media_data", "create_derived_features"],
-        "sports": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_sports_codes", "standardize_team_names", "encode_categorical", "remove_outliers", "handle_performance_data", "validate_sports_metrics", "create_derived_features"],
-        "fitness": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_health_metrics", "standardize_exercise_codes", "encode_categorical", "remove_outliers", "handle_fitness_data", "validate_workout_data", "create_derived_features"],
-        "government": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_government_codes", "standardize_department_names", "encode_categorical", "remove_outliers", "handle_public_data", "validate_government_data", "create_derived_features"],
-        "public_sector": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_public_codes", "standardize_department_names", "encode_categorical", "remove_outliers", "handle_public_data", "validate_public_records", "create_derived_features"],
-        "tourism": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_location_data", "standardize_tourism_codes", "encode_categorical", "remove_outliers", "handle_travel_data", "validate_tourism_metrics", "create_derived_features"],
-        "hospitality": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_location_data", "standardize_hotel_codes", "encode_categorical", "remove_outliers", "handle_booking_data", "validate_hospitality_metrics", "create_derived_features"],
-        "automotive": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_vehicle_codes", "standardize_manufacturer_names", "encode_categorical", "remove_outliers", "handle_automotive_data", "validate_vehicle_metrics", "create_derived_features"],
-        "technology": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_ip_addresses", "standardize_tech_codes", "encode_categorical", "remove_outliers", "handle_technical_data", "validate_technology_metrics", "create_derived_features"],
-        "IT": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_ip_addresses", "standardize_IT_codes", "encode_categorical", "remove_outliers", "handle_system_data", "validate_IT_metrics", "create_derived_features"],
-        "software": ["handle_missing_values", "remove_duplicates", "validate_email_format", "validate_ip_addresses", "standardize_software_codes", "encode_categorical", "remove_outliers", "handle_software_metrics", "validate_development_data", "create_derived_features"],
-        "biotechnology": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_biological_codes", "standardize_lab_protocols", "encode_categorical", "remove_outliers", "handle_biological_data", "validate_biotech_metrics", "create_derived_features"],
-        "bioinformatics": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_genomic_codes", "standardize_sequence_data", "encode_categorical", "remove_outliers", "handle_genomic_data", "validate_bioinformatics_data", "create_derived_features"],
-        "social_media": ["handle_missing_values", "remove_duplicates", "validate_urls", "validate_email_format", "standardize_social_platforms", "encode_categorical", "remove_outliers", "handle_engagement_data", "validate_social_metrics", "create_derived_features"],
-        "networking": ["handle_missing_values", "remove_duplicates", "validate_ip_addresses", "validate_urls", "standardize_network_codes", "encode_categorical", "remove_outliers", "handle_network_data", "validate_networking_metrics", "create_derived_features"],
-        "legal": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_legal_codes", "standardize_case_numbers", "encode_categorical", "remove_outliers", "handle_legal_data", "validate_legal_documents", "create_derived_features"],
-        "law": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_legal_codes", "standardize_case_numbers", "encode_categorical", "remove_outliers", "handle_legal_data", "validate_legal_documents", "create_derived_features"],
-        "construction": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_construction_codes", "standardize_project_numbers", "encode_categorical", "remove_outliers", "handle_construction_data", "validate_building_metrics", "create_derived_features"],
-        "engineering": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_engineering_codes", "standardize_project_numbers", "encode_categorical", "remove_outliers", "handle_engineering_data", "validate_engineering_metrics", "create_derived_features"],
-        "aerospace": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_aerospace_codes", "standardize_aircraft_data", "encode_categorical", "remove_outliers", "handle_aerospace_data", "validate_flight_metrics", "create_derived_features"],
-        "aviation": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_aviation_codes", "standardize_aircraft_data", "encode_categorical", "remove_outliers", "handle_aviation_data", "validate_flight_metrics", "create_derived_features"],
-        "maritime": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_maritime_codes", "standardize_vessel_data", "encode_categorical", "remove_outliers", "handle_maritime_data", "validate_shipping_metrics", "create_derived_features"],
-        "naval": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_naval_codes", "standardize_vessel_data", "encode_categorical", "remove_outliers", "handle_naval_data", "validate_naval_metrics", "create_derived_features"],
-        "mining": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_mining_codes", "standardize_mineral_data", "encode_categorical", "remove_outliers", "handle_mining_data", "validate_mining_metrics", "create_derived_features"],
-        "resources": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_resource_codes", "standardize_resource_data", "encode_categorical", "remove_outliers", "handle_resource_data", "validate_resource_metrics", "create_derived_features"],
-        "textiles": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_textile_codes", "standardize_material_data", "encode_categorical", "remove_outliers", "handle_textile_data", "validate_textile_metrics", "create_derived_features"],
-        "fashion": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_fashion_codes", "standardize_size_data", "encode_categorical", "remove_outliers", "handle_fashion_data", "validate_fashion_metrics", "create_derived_features"],
-        "food_beverage": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_food_codes", "standardize_ingredient_data", "encode_categorical", "remove_outliers", "handle_food_data", "validate_nutrition_metrics", "create_derived_features"],
-        "restaurant": ["handle_missing_values", "remove_duplicates", "standardize_date_format", "validate_menu_codes", "standardize_ingredient_data", "encode_categorical", "remove_outliers", "handle_restaurant_data", "validate_restaurant_metrics", "create_derived_features"]
-    }
-    return guidelines.get(domain, ["handle_missing_values", "remove_duplicates", "fix_data_types", "standardize_format", "validate_ranges", "encode_categorical", "remove_outliers", "create_derived_features"])
+    return DOMAIN_GUIDELINES.get(domain, DEFAULT_GUIDELINES)
+
+DOMAIN_KEYWORDS = {
+    'sales': ['sale', 'customer', 'revenue', 'product', 'order', 'price'],
+    'ecommerce': ['product', 'order', 'customer', 'price', 'cart', 'sku'],
+    'finance': ['account', 'transaction', 'balance', 'amount', 'currency', 'financial'],
+    'healthcare': ['patient', 'medical', 'diagnosis', 'treatment', 'hospital', 'health'],
+    'education': ['student', 'course', 'grade', 'school', 'teacher', 'academic'],
+    'real_estate': ['property', 'house', 'price', 'location', 'square', 'estate'],
+    'manufacturing': ['product', 'production', 'quality', 'machine', 'assembly', 'manufacture'],
+    'logistics': ['shipment', 'delivery', 'tracking', 'warehouse', 'supply', 'logistics']
+}
 
 def validate_domain_detection(domain_info, df):
     if domain_info['confidence'] == 'low':
         return False
-        
-    domain_keywords = {
-        'sales': ['sale', 'customer', 'revenue', 'product', 'order', 'price'],
-        'ecommerce': ['product', 'order', 'customer', 'price', 'cart', 'sku'],
-        'finance': ['account', 'transaction', 'balance', 'amount', 'currency', 'financial'],
-        'healthcare': ['patient', 'medical', 'diagnosis', 'treatment', 'hospital', 'health'],
-        'education': ['student', 'course', 'grade', 'school', 'teacher', 'academic'],
-        'real_estate': ['property', 'house', 'price', 'location', 'square', 'estate'],
-        'manufacturing': ['product', 'production', 'quality', 'machine', 'assembly', 'manufacture'],
-        'logistics': ['shipment', 'delivery', 'tracking', 'warehouse', 'supply', 'logistics']
-    }
     
     domain = domain_info['domain']
-    if domain not in domain_keywords:
+    if domain not in DOMAIN_KEYWORDS:
         return True
         
-    keywords = domain_keywords[domain]
+    keywords = DOMAIN_KEYWORDS[domain]
     column_names = [col.lower() for col in df.columns]
     matches = sum(1 for keyword in keywords if any(keyword in col for col in column_names))
-    return matches >= 2
\ No newline at end of file
+    return matches >= 2
+
+# Extra column-name vocabulary for the local classifier, on top of the domain
+# name itself, DOMAIN_KEYWORDS and the domain-specific guideline actions.
+DOMAIN_VOCABULARY = {
+    'sales': ['item', 'quantity', 'qty', 'unit', 'total', 'spent', 'payment', 'invoice', 'discount', 'store', 'sold', 'receipt', 'cashier'],
+    'ecommerce': ['checkout', 'shipping', 'seller', 'review', 'rating', 'basket', 'coupon', 'session', 'click', 'listing'],
+    'retail': ['store', 'shelf', 'stock', 'barcode', 'upc', 'aisle', 'inventory', 'promotion'],
+    'finance': ['credit', 'debit', 'interest', 'loan', 'ledger', 'asset', 'liability', 'equity', 'stock', 'ticker', 'dividend', 'portfolio'],
+    'banking': ['iban', 'swift', 'branch', 'deposit', 'withdrawal', 'overdraft', 'loan', 'card'],
+    'insurance': ['policy', 'premium', 'claim', 'coverage', 'deductible', 'insured', 'underwriting', 'beneficiary', 'charge', 'smoker'],
+    'healthcare': ['doctor', 'physician', 'admission', 'discharge', 'ward', 'symptom', 'blood', 'pressure', 'bmi', 'icd'],
+    'medical': ['lab', 'dosage', 'prescription', 'clinical', 'diagnosis', 'icd', 'cholesterol', 'glucose'],
+    'pharmaceuticals': ['drug', 'dose', 'compound', 'trial', 'batch', 'ndc', 'formulation', 'concentration'],
+    'users': ['user', 'username', 'email', 'phone', 'signup', 'login', 'gender', 'age', 'birth', 'first', 'last'],
+    'customers': ['customer', 'client', 'loyalty', 'segment', 'churn', 'tenure', 'email', 'phone'],
+    'marketing': ['campaign', 'channel', 'lead', 'conversion', 'impression', 'click', 'ctr', 'utm', 'audience'],
+    'advertising': ['ad', 'impression', 'click', 'cpc', 'cpm', 'bid', 'creative', 'placement', 'spend'],
+    'weather': ['temperature', 'temp', 'humidity', 'precipitation', 'rain', 'wind', 'pressure', 'cloud', 'visibility', 'forecast', 'celsius', 'fahrenheit'],
+    'climate': ['emission', 'co2', 'anomaly', 'temperature', 'sea', 'ice', 'carbon'],
+    'environment': ['pollution', 'pm25', 'pm10', 'aqi', 'ozone', 'emission', 'waste', 'water'],
+    'education': ['enrollment', 'gpa', 'exam', 'score', 'class', 'semester', 'subject', 'lecture', 'parental'],
+    'academic': ['publication', 'citation', 'journal', 'author', 'faculty', 'thesis'],
+    'research': ['experiment', 'sample', 'trial', 'observation', 'hypothesis', 'measurement'],
+    'real_estate': ['bedroom', 'bathroom', 'sqft', 'lot', 'listing', 'zoning', 'rent', 'mortgage', 'floor'],
+    'property': ['bedroom', 'bathroom', 'sqft', 'tenant', 'lease', 'rent', 'floor'],
+    'manufacturing': ['defect', 'batch', 'line', 'shift', 'throughput', 'yield', 'downtime', 'plant'],
+    'logistics': ['carrier', 'freight', 'route', 'dispatch', 'pallet', 'origin', 'destination', 'eta'],
+    'supply_chain': ['supplier', 'vendor', 'procurement', 'lead', 'inventory', 'reorder', 'purchase'],
+    'transportation': ['vehicle', 'trip', 'driver', 'fare', 'passenger', 'pickup', 'dropoff', 'distance', 'route'],
+    'human_resources': ['employee', 'salary', 'department', 'hire', 'manager', 'job', 'title', 'attrition', 'performance'],
+    'recruitment': ['candidate', 'applicant', 'interview', 'offer', 'resume', 'experience', 'job'],
+    'telecommunications': ['call', 'minute', 'sms', 'data', 'plan', 'subscriber', 'churn', 'roaming', 'msisdn'],
+    'energy': ['kwh', 'mwh', 'consumption', 'meter', 'grid', 'solar', 'wind', 'load', 'generation'],
+    'agriculture': ['crop', 'yield', 'harvest', 'soil', 'fertilizer', 'hectare', 'irrigation', 'livestock'],
+    'entertainment': ['movie', 'film', 'genre', 'rating', 'director', 'cast', 'runtime', 'release', 'box'],
+    'sports': ['team', 'player', 'match', 'game', 'season', 'goal', 'score', 'league', 'coach'],
+    'fitness': ['workout', 'calorie', 'step', 'heart', 'exercise', 'duration', 'bpm'],
+    'tourism': ['destination', 'tour', 'traveler', 'visitor', 'booking', 'itinerary'],
+    'hospitality': ['hotel', 'room', 'booking', 'checkin', 'checkout', 'guest', 'stay', 'night', 'reservation'],
+    'automotive': ['make', 'model', 'mileage', 'odometer', 'engine', 'fuel', 'transmission', 'vin', 'car'],
+    'technology': ['device', 'server', 'cpu', 'memory', 'latency', 'request', 'error', 'version', 'ip'],
+    'social_media': ['post', 'like', 'share', 'comment', 'follower', 'hashtag', 'tweet', 'mention'],
+    'aviation': ['flight', 'airline', 'airport', 'departure', 'arrival', 'delay', 'aircraft', 'carrier'],
+    'food_beverage': ['ingredient', 'calorie', 'nutrition', 'recipe', 'beverage', 'serving'],
+    'restaurant': ['menu', 'dish', 'table', 'waiter', 'tip', 'cuisine', 'coffee', 'cafe', 'order']
+}
+
+# Words from guideline action names that say nothing about the domain.
+GUIDELINE_STOP_TOKENS = {'handle', 'validate', 'standardize', 'remove', 'detect', 'create', 'encode', 'extract', 'data', 'code', 'format', 'metric', 'value', 'number', 'name'}
+
+def tokenize(text):
+    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', str(text))
+    tokens = []
+    for token in re.split(r'[^a-z0-9]+', text.lower()):
+        if len(token) < 2:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def build_domain_index():
+    vocabularies = {}
+    for domain in DOMAIN_GUIDELINES:
+        core_tokens = set(tokenize(domain))
+        for keyword in DOMAIN_KEYWORDS.get(domain, []) + DOMAIN_VOCABULARY.get(domain, []):
+            core_tokens.update(tokenize(keyword))
+        
+        guideline_tokens = set()
+        for action in DOMAIN_GUIDELINES[domain]:
+            guideline_tokens.update(token for token in tokenize(action) if token not in GUIDELINE_STOP_TOKENS)
+        vocabularies[domain] = (core_tokens, guideline_tokens - core_tokens)
+    
+    # Inverse document frequency over domains, so tokens shared by many
+    # domains (e.g. "price", "date") count for less than distinctive ones.
+    document_frequency = {}
+    for core_tokens, guideline_tokens in vocabularies.values():
+        for token in core_tokens | guideline_tokens:
+            document_frequency[token] = document_frequency.get(token, 0) + 1
+    
+    domain_count = len(vocabularies)
+    index = {}
+    for domain, (core_tokens, guideline_tokens) in vocabularies.items():
+        for token in core_tokens:
+            index.setdefault(token, {})[domain] = math.log(domain_count / document_frequency[token]) + 1
+        for token in guideline_tokens:
+            index.setdefault(token, {})[domain] = 0.5 * math.log(domain_count / document_frequency[token])
+    return index
+
+DOMAIN_INDEX = build_domain_index()
+
+def classify_domain_locally(df, sample_rows=20):
+    scores = {}
+    matched_tokens = {}
+    
+    def add_tokens(tokens, weight):
+        for token in set(tokens):
+            for domain, token_weight in DOMAIN_INDEX.get(token, {}).items():
+                scores[domain] = scores.get(domain, 0) + token_weight * weight
+                matched_tokens.setdefault(domain, set()).add(token)
+    
+    for col in df.columns:
+        add_tokens(tokenize(col), 1.0)
+    
+    for col in df.select_dtypes(include=Config.TEXT_DTYPES).columns:
+        values = df[col].head(sample_rows).dropna().astype(str)
+        sample_tokens = [token for value in values.unique() if len(value) <= 40 for token in tokenize(value)]
+        add_tokens(sample_tokens, Config.DOMAIN_SAMPLE_WEIGHT)
+    
+    if not scores:
+        return {"domain": "general", "confidence": "low", "reasoning": "No domain vocabulary matched the columns", "source": "local"}
+    
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    best_domain, best_score = ranked[0]
+    runner_up_score = ranked[1][1] if len(ranked) > 1 else 0.0
+    
+    if best_score >= 2 * Config.DOMAIN_MIN_SCORE and runner_up_score <= 0.5 * best_score:
+        confidence = "high"
+    elif best_score >= Config.DOMAIN_MIN_SCORE and runner_up_score <= 0.75 * best_score:
+        confidence = "medium"
+    else:
+        confidence = "low"
+    
+    return {
+        "domain": best_domain,
+        "confidence": confidence,
+        "reasoning": f"Local classifier matched {sorted(matched_tokens[best_domain])} (score {best_score:.1f} vs {runner_up_score:.1f})",
+        "source": "local"
+    }
@@ -0,0 +1,484 @@
+import os
+import pandas as pd
+from config import Config
+from data_cleaner import ACTION_REGISTRY, ColumnStats, apply_action
+
+# Out-of-core executor: the input CSV, Parquet file or DataFrame is registered
+# in an in-process DuckDB database and every translated action becomes one SQL
+# view over the previous step. DuckDB plans the whole chain, runs it on all
+# cores and spills to Config.DUCKDB_TEMP_DIRECTORY when memory runs short.
+# Actions without a translation fetch the current step into pandas, run the
+# pandas action and register its result as the next step.
+
+ROW_ID = "__row_id"
+
+# Python's str.strip() and \s match more characters than RE2's \s.
+WHITESPACE_CLASS = r'\s\x{0b}\x{1c}-\x{1f}\x{85}\p{Z}'
+NUMERIC_TYPES = ['TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT', 'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT', 'UHUGEINT', 'FLOAT', 'DOUBLE']
+CSV_TYPE_CANDIDATES = ['BOOLEAN', 'BIGINT', 'DOUBLE', 'VARCHAR']
+
+def execute_cleaning_plan_duckdb(source, final_plan, domain_info=None, output_path=None, delimiter=None):
+    # Returns the cleaned DataFrame, or writes it straight to Parquet and
+    # returns output_path when one is given.
+    con = connect()
+    try:
+        runner = SQLPlanRunner(con, source, domain_info, delimiter)
+        for action in final_plan.get("finalized_actions", []):
+            runner.run(action)
+        result = runner.write_parquet(output_path) if output_path else runner.result()
+        return result, runner.execution_log
+    finally:
+        con.close()
+
+def count_rows(source, delimiter=None):
+    con = connect()
+    try:
+        return con.execute(f"SELECT count(*) FROM {read_source(source, delimiter)}").fetchone()[0]
+    finally:
+        con.close()
+
+def connect():
+    import duckdb
+
+    config = {"temp_directory": Config.DUCKDB_TEMP_DIRECTORY}
+    if Config.DUCKDB_MEMORY_LIMIT:
+        config["memory_limit"] = Config.DUCKDB_MEMORY_LIMIT
+    if Config.DUCKDB_THREADS:
+        config["threads"] = Config.DUCKDB_THREADS
+    os.makedirs(Config.DUCKDB_TEMP_DIRECTORY, exist_ok=True)
+
+    con = duckdb.connect(config=config)
+    con.create_function("py_title", title_values, ["VARCHAR"], "VARCHAR", type="arrow")
+    return con
+
+def title_values(values):
+    import pyarrow as pa
+    # DuckDB has no title-case function; batches of values use str.title so
+    # the result matches the pandas action exactly.
+    return pa.array([value.title() if value is not None else None for value in values.to_pylist()], type=pa.string())
+
+def is_resource_error(error):
+    # Running out of memory or disk is not fixed by replaying in pandas.
+    import duckdb
+    return isinstance(error, (duckdb.OutOfMemoryException, duckdb.IOException, duckdb.InterruptException))
+
+def quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+def literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+class SQLPlanRunner:
+    # Holds either a chain of DuckDB views on top of the last materialized
+    # table or, after an action whose result Arrow cannot represent, a pandas
+    # frame. Every step carries a row id so the output keeps the input order.
+    def __init__(self, con, source, domain_info=None, delimiter=None):
+        self.con = con
+        self.domain_info = domain_info
+        self.execution_log = []
+        self.pending = []
+        self.steps = 0
+        self.pandas_df = None
+        self.base = None
+
+        if isinstance(source, pd.DataFrame):
+            if not self.register_frame(source):
+                self.pandas_df = source.copy()
+        else:
+            self.new_step(f"SELECT row_number() OVER () - 1 AS {ROW_ID}, * FROM {read_source(source, delimiter)}")
+            self.base = self.current
+
+    def new_step(self, sql, materialize=False):
+        name = f"step_{self.steps}"
+        self.con.execute(f"CREATE TEMP {'TABLE' if materialize else 'VIEW'} {name} AS {sql}")
+        self.steps += 1
+        self.current = name
+        self.is_table = materialize
+        if materialize:
+            self.base = name
+        self.schema = self.describe(name)
+
+        # Dictionary-encoded text (pandas categoricals) is treated as plain text.
+        enums = [col for col, dtype in self.schema.items() if dtype.startswith('ENUM')]
+        if enums:
+            self.new_step(f"SELECT * REPLACE ({', '.join(f'CAST({quote(col)} AS VARCHAR) AS {quote(col)}' for col in enums)}) FROM {name}", materialize)
+
+    def describe(self, name):
+        return {col: dtype for col, dtype, *_ in self.con.execute(f"DESCRIBE SELECT * FROM {name}").fetchall()}
+
+    def register_frame(self, df):
+        import pyarrow as pa
+
+        # Object columns holding a mix of strings, numbers and booleans have no
+        # Arrow type; those frames stay in pandas.
+        try:
+            table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+        except Exception:
+            return False
+        view = f"frame_{self.steps}"
+        self.con.register(view, table)
+        self.new_step(f"SELECT row_number() OVER () - 1 AS {ROW_ID}, * FROM {view}", materialize=True)
+        self.con.unregister(view)
+        return True
+
+    @property
+    def columns(self):
+        return [col for col in self.schema if col != ROW_ID]
+
+    def run(self, action):
+        action = {"action": action["action"], "columns": action["columns"]}
+        if self.pandas_df is None and self.add_step(action):
+            return
+
+        df = self.fetch()
+        df, log_entry = run_pandas_action(df, action, self.domain_info)
+        self.execution_log.append(log_entry)
+        self.set_frame(df)
+
+    def add_step(self, action):
+        translation = SQL_TRANSLATIONS.get(action["action"])
+        if translation is None and action["action"] in ACTION_REGISTRY:
+            return False
+
+        if translation is not None and translation["aggregates"]:
+            # Aggregate subqueries scan their input, so the chain of views
+            # built so far is computed once instead of once per scan.
+            self.materialize()
+            if self.pandas_df is not None:
+                return False
+
+        state = self.current, self.schema, self.is_table, self.base
+        try:
+            queries = translation["function"](self, action["columns"], self.domain_info) if translation is not None else []
+            for i, sql in enumerate(queries):
+                # Patterns and column names may hold braces, so no str.format.
+                # Steps scanned by the next aggregate step are stored, or each
+                # step would recompute the ones before it once per scan.
+                self.new_step(sql.replace("{source}", self.current), translation["aggregates"] and i < len(queries) - 1)
+        except Exception:
+            self.current, self.schema, self.is_table, self.base = state
+            return False
+
+        self.pending.append((len(self.execution_log), action))
+        self.execution_log.append({"action": action["action"], "success": True, "rows_after": None, "columns_after": len(self.columns), "backend": "duckdb", "column_stats": {}})
+        if self.base != state[3]:
+            # A replay starts from the last stored step, which must not fall
+            # in the middle of an action.
+            self.materialize()
+        return True
+
+    def materialize(self):
+        if self.pandas_df is not None:
+            return
+        if not self.is_table:
+            try:
+                self.new_step(f"SELECT * FROM {self.current}", materialize=True)
+            except Exception as e:
+                if is_resource_error(e):
+                    raise
+                self.replay()
+                return
+        if self.pending:
+            self.finish_pending(self.con.execute(f"SELECT count(*) FROM {self.current}").fetchone()[0])
+
+    def finish_pending(self, rows):
+        for index, _ in self.pending:
+            self.execution_log[index]["rows_after"] = rows
+        self.pending = []
+
+    def replay(self):
+        # DuckDB rejected the chain at run time: the pending actions are rerun
+        # with pandas from the last stored step.
+        df = self.read_table(self.base)
+        for index, action in self.pending:
+            df, self.execution_log[index] = run_pandas_action(df, action, self.domain_info)
+        self.pending = []
+        self.set_frame(df)
+
+    def set_frame(self, df):
+        self.pandas_df = None if self.register_frame(df) else df
+
+    def output_query(self, name):
+        return f"SELECT * EXCLUDE ({ROW_ID}) FROM {name} ORDER BY {ROW_ID}"
+
+    def read_table(self, name):
+        return from_duckdb(self.con.execute(self.output_query(name)).to_arrow_table())
+
+    def fetch(self):
+        self.materialize()
+        return self.pandas_df if self.pandas_df is not None else self.read_table(self.current)
+
+    def result(self):
+        return self.fetch()
+
+    def write_parquet(self, output_path):
+        if self.pandas_df is None:
+            try:
+                copy = f"COPY ({self.output_query(self.current)}) TO {literal(output_path)} (FORMAT PARQUET, COMPRESSION {Config.PARQUET_COMPRESSION})"
+                self.finish_pending(self.con.execute(copy).fetchone()[0])
+                return output_path
+            except Exception as e:
+                if self.is_table or is_resource_error(e):
+                    raise
+                self.replay()
+                if self.pandas_df is None:
+                    return self.write_parquet(output_path)
+
+        from exporters import export_dataframe
+        return export_dataframe(self.pandas_df, "parquet", output_path)
+
+    def text_columns(self):
+        return [col for col in self.columns if self.schema[col] == 'VARCHAR']
+
+    def numeric_columns(self):
+        return [col for col in self.columns if self.is_numeric(col)]
+
+    def is_numeric(self, col):
+        dtype = self.schema.get(col, '')
+        return dtype in NUMERIC_TYPES or dtype.startswith('DECIMAL')
+
+    def select_columns(self, action_name, columns):
+        # Same resolution as resolve_action_columns on the pandas side.
+        if columns != "all":
+            return [col for col in columns if col in self.schema and col != ROW_ID]
+
+        select = ACTION_REGISTRY[action_name]["select"]
+        if select == "any":
+            return self.columns
+        elif select == "text":
+            return self.text_columns()
+        elif select == "number":
+            return self.numeric_columns()
+        return []
+
+def read_source(source, delimiter=None):
+    path = str(source)
+    if path.lower().endswith('.parquet'):
+        return f"read_parquet({literal(path)})"
+
+    # Temporal columns stay text, as with load_csv.
+    from utils import CSV_NA_VALUES
+    na_values = ', '.join(literal(value) for value in CSV_NA_VALUES)
+    candidates = ', '.join(literal(dtype) for dtype in CSV_TYPE_CANDIDATES)
+    options = f", delim = {literal(delimiter)}" if delimiter else ""
+    return f"read_csv({literal(path)}, header = true{options}, nullstr = [{na_values}], auto_type_candidates = [{candidates}])"
+
+def run_pandas_action(df, action, domain_info=None):
+    stats = ColumnStats()
+    try:
+        df = apply_action(df, action["action"], action["columns"], domain_info, stats)
+        log_entry = {"action": action["action"], "success": True}
+    except Exception as e:
+        log_entry = {"action": action["action"], "success": False, "error": str(e)}
+    log_entry.update({"rows_after": df.shape[0], "columns_after": df.shape[1], "backend": "pandas", "column_stats": stats.pop_accessed()})
+    return df, log_entry
+
+def from_duckdb(table):
+    # Arrow strings map straight onto pyarrow-backed pandas strings.
+    import pyarrow as pa
+    string_dtype = pd.api.types.pandas_dtype(Config.STRING_DTYPE)
+    if not isinstance(string_dtype, pd.api.extensions.ExtensionDtype):
+        return table.to_pandas()
+    return table.to_pandas(types_mapper={pa.string(): string_dtype, pa.large_string(): string_dtype}.get)
+
+def replace_columns(expressions):
+    if not expressions:
+        return []
+    return ["SELECT * REPLACE (" + ", ".join(f"{expression} AS {quote(col)}" for col, expression in expressions) + ") FROM {source}"]
+
+def median(col):
+    return f"(SELECT quantile_cont({quote(col)}, 0.5) FROM {{source}})"
+
+def strip(expression):
+    return f"regexp_replace({expression}, '^[{WHITESPACE_CLASS}]+|[{WHITESPACE_CLASS}]+$', '', 'g')"
+
+def translate_missing_values(runner, columns, domain_info=None):
+    domain = domain_info.get('domain', 'general') if domain_info else 'general'
+    columns = runner.columns if columns == "all" else columns
+
+    expressions = []
+    for col in columns:
+        if col not in runner.schema or col == ROW_ID:
+            continue
+        col_name_lower = col.lower()
+        if runner.schema[col] == 'VARCHAR':
+            if any(keyword in col_name_lower for keyword in ['date', 'time']):
+                fill_value = 'Unknown Date'
+            elif any(keyword in col_name_lower for keyword in ['name', 'title', 'description']):
+                fill_value = 'Unknown'
+            elif any(keyword in col_name_lower for keyword in ['email', 'phone', 'id']):
+                fill_value = 'Not Provided'
+            elif domain in ['finance', 'sales', 'ecommerce'] and any(keyword in col_name_lower for keyword in ['category', 'type', 'status']):
+                fill_value = 'Other'
+            else:
+                fill_value = 'Missing'
+            expressions.append((col, f"COALESCE({quote(col)}, {literal(fill_value)})"))
+        elif runner.is_numeric(col):
+            if any(keyword in col_name_lower for keyword in ['price', 'amount', 'cost', 'revenue', 'salary', 'income']):
+                fill = "0"
+            elif any(keyword in col_name_lower for keyword in ['age', 'year', 'count', 'quantity']):
+                fill = median(col)
+            elif any(keyword in col_name_lower for keyword in ['rating', 'score', 'percentage']):
+                fill = f"(SELECT avg({quote(col)}) FROM {{source}})"
+            else:
+                fill = median(col)
+            expressions.append((col, f"COALESCE({quote(col)}, {fill})"))
+    return replace_columns(expressions)
+
+def translate_remove_duplicates(runner, columns, domain_info=None):
+    subset = None
+    if columns != "all":
+        subset = [col for col in columns if col in runner.schema and col != ROW_ID] or None
+    subset = subset or runner.columns
+    # DISTINCT ON keeps the first row of each group in ORDER BY order, which is
+    # the earliest row as with pandas' keep='first'.
+    return [f"SELECT DISTINCT ON ({', '.join(quote(col) for col in subset)}) * FROM {{source}} ORDER BY {', '.join(quote(col) for col in subset)}, {ROW_ID}"]
+
+def translate_remove_outliers(runner, columns, domain_info=None):
+    # Only the IQR method is translated. Every column's bounds come from one
+    # scan of the input, joined to each row, and the rows are filtered once.
+    if Config.OUTLIER_METHOD != "iqr":
+        raise ValueError("remove_outliers with this method is left to pandas")
+    threshold = Config.OUTLIER_THRESHOLDS["iqr"]
+    bounds = []
+    conditions = []
+    for col in runner.select_columns("remove_outliers", columns):
+        if runner.is_numeric(col):
+            q1 = f"quantile_cont({quote(col)}, 0.25)"
+            q3 = f"quantile_cont({quote(col)}, 0.75)"
+            i = len(bounds)
+            bounds.append(f"{q1} - {threshold} * ({q3} - {q1}) AS lower_{i}, {q3} + {threshold} * ({q3} - {q1}) AS upper_{i}")
+            conditions.append(f"{{source}}.{quote(col)} >= bounds.lower_{i} AND {{source}}.{quote(col)} <= bounds.upper_{i}")
+    if not bounds:
+        return []
+    return [f"SELECT {{source}}.* FROM {{source}} CROSS JOIN (SELECT {', '.join(bounds)} FROM {{source}}) AS bounds WHERE {' AND '.join(conditions)}"]
+
+def translate_normalize_numeric(runner, columns, domain_info=None):
+    expressions = []
+    for col in runner.select_columns("normalize_numeric", columns):
+        if runner.is_numeric(col):
+            mean = f"(SELECT avg({quote(col)}) FROM {{source}})"
+            scale = f"(SELECT CASE WHEN stddev_pop({quote(col)}) = 0 THEN 1.0 ELSE stddev_pop({quote(col)}) END FROM {{source}})"
+            expressions.append((col, f"(CAST({quote(col)} AS DOUBLE) - {mean}) / {scale}"))
+    return replace_columns(expressions)
+
+def translate_remove_columns(runner, columns, domain_info=None):
+    if columns == "all":
+        raise ValueError("remove_columns with 'all' is left to pandas")
+    dropped = [col for col in columns if col in runner.schema and col != ROW_ID]
+    if not dropped:
+        return []
+    return [f"SELECT * EXCLUDE ({', '.join(quote(col) for col in dropped)}) FROM {{source}}"]
+
+def translate_rename_columns(runner, columns, domain_info=None):
+    rename_dict = {col: col.lower().replace(' ', '_').replace('-', '_') for col in columns if col in runner.schema and col != ROW_ID}
+    names = [rename_dict.get(col, col).lower() for col in runner.schema]
+    if len(set(names)) != len(names):
+        # pandas allows the duplicate names a rename can produce; DuckDB
+        # column names are also case-insensitive.
+        raise ValueError("rename_columns would produce duplicate names")
+    renames = [(col, new_name) for col, new_name in rename_dict.items() if col != new_name]
+    if not renames:
+        return []
+    return [f"SELECT * RENAME ({', '.join(f'{quote(col)} AS {quote(new_name)}' for col, new_name in renames)}) FROM {{source}}"]
+
+def translate_negative_values(runner, columns, domain_info=None):
+    expressions = []
+    for col in columns:
+        if runner.is_numeric(col) and col.lower() not in ['profit', 'growth', 'change']:
+            expressions.append((col, f"CASE WHEN {quote(col)} < 0 THEN -{quote(col)} ELSE {quote(col)} END"))
+    return replace_columns(expressions)
+
+def translate_zero_values(runner, columns, domain_info=None):
+    expressions = []
+    for col in columns:
+        if runner.is_numeric(col):
+            expressions.append((col, f"CASE WHEN {quote(col)} = 0 THEN {median(col)} ELSE {quote(col)} END"))
+    return replace_columns(expressions)
+
+def translate_infinite_values(runner, columns, domain_info=None):
+    expressions = []
+    for col in runner.select_columns("handle_infinite_values", columns) if columns == "all" else columns:
+        if runner.is_numeric(col):
+            values = quote(col)
+            if runner.schema[col] in ['FLOAT', 'DOUBLE']:
+                values = f"CASE WHEN isinf({values}) THEN NULL ELSE {values} END"
+            expressions.append((col, f"COALESCE({values}, (SELECT quantile_cont({values}, 0.5) FROM {{source}}))"))
+    return replace_columns(expressions)
+
+def translate_encode_categorical(runner, columns, domain_info=None):
+    # Up to ten values become appended boolean columns; more are label encoded
+    # in sorted order with missing values as 'nan', as LabelEncoder does.
+    queries = []
+    columns = runner.text_columns() if columns == "all" else columns
+    source = runner.current
+    dropped = []
+    appended = []
+    replaced = []
+    for col in columns:
+        if col not in runner.schema or runner.schema[col] != 'VARCHAR':
+            continue
+        values = [row[0] for row in runner.con.execute(f"SELECT DISTINCT {quote(col)} FROM {source} WHERE {quote(col)} IS NOT NULL ORDER BY 1").fetchall()]
+        if len(values) <= 10:
+            dropped.append(col)
+            appended.extend(f"COALESCE({quote(col)} = {literal(value)}, false) AS {quote(f'{col}_{value}')}" for value in values)
+        else:
+            replaced.append((col, f"dense_rank() OVER (ORDER BY COALESCE({quote(col)}, 'nan')) - 1"))
+
+    if replaced:
+        queries.extend(replace_columns(replaced))
+    if dropped:
+        kept = "* EXCLUDE (" + ", ".join(quote(col) for col in dropped) + ")"
+        queries.append(f"SELECT {kept}, {', '.join(appended)} FROM {{source}}")
+    return queries
+
+def string_expression(action_name, col):
+    values = f"COALESCE(CAST({quote(col)} AS VARCHAR), 'nan')"
+    if action_name == "remove_whitespace":
+        return f"regexp_replace({strip(values)}, '[{WHITESPACE_CLASS}]+', ' ', 'g')"
+    elif action_name == "handle_inconsistent_casing":
+        return f"py_title({values})"
+    elif action_name == "standardize_names":
+        return strip(f"py_title({values})")
+    elif action_name == "standardize_address_format":
+        return strip(f"upper({values})")
+    elif action_name == "remove_special_characters":
+        return f"regexp_replace({values}, '[^\\p{{L}}\\p{{N}}_{WHITESPACE_CLASS}]', '', 'g')"
+    elif action_name == "handle_text_encoding":
+        return values
+    elif action_name == "standardize_format":
+        col_name_lower = col.lower()
+        if any(keyword in col_name_lower for keyword in ['email']):
+            return strip(f"lower({values})")
+        elif any(keyword in col_name_lower for keyword in ['name', 'title']):
+            return strip(f"py_title({values})")
+        elif any(keyword in col_name_lower for keyword in ['address', 'location']):
+            return strip(f"upper({values})")
+        return strip(values)
+    raise ValueError(f"No SQL translation for {action_name}")
+
+def translate_string_action(action_name):
+    def translate(runner, columns, domain_info=None):
+        columns = [col for col in runner.select_columns(action_name, columns) if runner.schema[col] == 'VARCHAR']
+        return replace_columns([(col, string_expression(action_name, col)) for col in columns])
+    return translate
+
+SQL_TRANSLATIONS = {
+    "handle_missing_values": {"function": translate_missing_values, "aggregates": True},
+    "remove_duplicates": {"function": translate_remove_duplicates, "aggregates": False},
+    "remove_outliers": {"function": translate_remove_outliers, "aggregates": True},
+    "normalize_numeric": {"function": translate_normalize_numeric, "aggregates": True},
+    "remove_columns": {"function": translate_remove_columns, "aggregates": False},
+    "rename_columns": {"function": translate_rename_columns, "aggregates": False},
+    "handle_negative_values": {"function": translate_negative_values, "aggregates": False},
+    "handle_zero_values": {"function": translate_zero_values, "aggregates": True},
+    "handle_infinite_values": {"function": translate_infinite_values, "aggregates": True},
+    "encode_categorical": {"function": translate_encode_categorical, "aggregates": True},
+    "standardize_format": {"function": translate_string_action("standardize_format"), "aggregates": False},
+    "handle_inconsistent_casing": {"function": translate_string_action("handle_inconsistent_casing"), "aggregates": False},
+    "remove_special_characters": {"function": translate_string_action("remove_special_characters"), "aggregates": False},
+    "handle_text_encoding": {"function": translate_string_action("handle_text_encoding"), "aggregates": False},
+    "remove_whitespace": {"function": translate_string_action("remove_whitespace"), "aggregates": False},
+    "standardize_address_format": {"function": translate_string_action("standardize_address_format"), "aggregates": False},
+    "standardize_names": {"function": translate_string_action("standardize_names"), "aggregates": False}
+}
@@ -0,0 +1,118 @@
+import gzip
+import io
+import os
+import tempfile
+import pandas as pd
+from config import Config
+
+def export_dataframe(df, export_format=None, destination=None, chunksize=None):
+    export_format = export_format or Config.EXPORT_FORMAT
+    if export_format not in EXPORTERS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    exporter = EXPORTERS[export_format]
+    if destination is None:
+        handle, destination = tempfile.mkstemp(suffix=exporter["extension"])
+        os.close(handle)
+
+    exporter["function"](df, destination, chunksize or Config.CHUNK_SIZE)
+    return destination
+
+def is_path(destination):
+    return isinstance(destination, (str, os.PathLike))
+
+def iter_chunks(df, chunksize):
+    for start in range(0, max(len(df), 1), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+def export_csv(df, destination, chunksize, compression=None):
+    # Destinations are either a path or an open binary file, which is left
+    # open so the caller can rewind and stream it.
+    binary = open(destination, 'wb') if is_path(destination) else destination
+    try:
+        raw = gzip.GzipFile(fileobj=binary, mode='wb') if compression == "gzip" else binary
+        output = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        for i, chunk in enumerate(iter_chunks(df, chunksize)):
+            chunk.to_csv(output, index=False, header=i == 0)
+        output.flush()
+        output.detach()
+        if raw is not binary:
+            raw.close()
+    finally:
+        if binary is not destination:
+            binary.close()
+
+def export_csv_gzip(df, destination, chunksize):
+    export_csv(df, destination, chunksize, compression="gzip")
+
+def arrow_text_columns(df):
+    # Cleaning can leave object columns holding a mix of strings, numbers and
+    # booleans, which Arrow cannot store in one column; those are written as text.
+    columns = []
+    for col in df.select_dtypes(include=['object']).columns:
+        if pd.api.types.infer_dtype(df[col], skipna=True) not in ['string', 'empty', 'boolean', 'integer', 'floating', 'decimal', 'bytes', 'date', 'datetime']:
+            columns.append(col)
+    return columns
+
+def arrow_chunks(df, chunksize):
+    import pyarrow as pa
+
+    text_columns = arrow_text_columns(df)
+    schema = None
+    for chunk in iter_chunks(df, chunksize):
+        if text_columns:
+            chunk = chunk.copy()
+            for col in text_columns:
+                chunk[col] = chunk[col].where(chunk[col].isna(), chunk[col].astype(str))
+
+        if schema is None:
+            schema = arrow_schema(df, text_columns)
+        yield pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+def arrow_schema(df, text_columns):
+    import pyarrow as pa
+
+    # Types are inferred from the first non-null values of each column rather
+    # than the first chunk, which may hold nothing but nulls for a column.
+    fields = []
+    for col in df.columns:
+        if col in text_columns:
+            fields.append(pa.field(str(col), pa.string()))
+            continue
+        sample = df[col].dropna().head(1000) if df[col].dtype == 'object' else df[col].head(0)
+        fields.append(pa.field(str(col), pa.Array.from_pandas(sample).type))
+    return pa.schema(fields)
+
+def export_parquet(df, destination, chunksize):
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for table in arrow_chunks(df, chunksize):
+            if writer is None:
+                writer = pq.ParquetWriter(destination, table.schema, compression=Config.PARQUET_COMPRESSION)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def export_feather(df, destination, chunksize):
+    import pyarrow as pa
+
+    writer = None
+    try:
+        for table in arrow_chunks(df, chunksize):
+            if writer is None:
+                options = pa.ipc.IpcWriteOptions(compression=Config.FEATHER_COMPRESSION)
+                writer = pa.ipc.new_file(destination, table.schema, options=options)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+EXPORTERS = {
+    "csv": {"function": export_csv, "extension": ".csv", "mime": "text/csv", "label": "CSV"},
+    "csv.gz": {"function": export_csv_gzip, "extension": ".csv.gz", "mime": "application/gzip", "label": "Compressed CSV (gzip)"},
+    "parquet": {"function": export_parquet, "extension": ".parquet", "mime": "application/vnd.apache.parquet", "label": "Parquet"},
+    "feather": {"function": export_feather, "extension": ".feather", "mime": "application/vnd.apache.arrow.file", "label": "Feather (Arrow IPC)"}
+}
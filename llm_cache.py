@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from config import Config
+
+def schema_fingerprint(*parts):
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def dataset_schema(df):
+    return {
+        "columns": [str(col) for col in df.columns],
+        "dtypes": {str(col): str(dtype) for col, dtype in df.dtypes.items()}
+    }
+
+def eda_signature(initial_eda):
+    # Recurring feeds change their exact counts every day, so only the shape of
+    # the quality problems is part of the key, not the numbers themselves.
+    return {
+        "columns": [str(col) for col in initial_eda.get("columns", [])],
+        "dtypes": initial_eda.get("dtypes", {}),
+        "null_columns": sorted(str(col) for col, count in initial_eda.get("null_counts", {}).items() if count > 0),
+        "has_duplicates": bool(initial_eda.get("duplicate_rows", 0)),
+        "numeric_columns": initial_eda.get("numeric_columns", []),
+        "categorical_columns": initial_eda.get("categorical_columns", []),
+        "date_columns": initial_eda.get("date_columns", [])
+    }
+
+def model_name(chat_model):
+    return getattr(chat_model, "model_name", None) or getattr(chat_model, "model", None) or type(chat_model).__name__
+
+class LLMCache:
+    def __init__(self, path=None, ttl_seconds=None, max_entries=None, max_bytes=None):
+        self.path = path or Config.LLM_CACHE_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Config.LLM_CACHE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else Config.LLM_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes if max_bytes is not None else Config.LLM_CACHE_MAX_BYTES
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS entries (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            )""")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    @contextmanager
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, kind, key):
+        now = time.time()
+        with self.connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM entries WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key))
+                row = None
+
+            if row is None:
+                self.increment(conn, "misses")
+                return None
+
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE kind = ? AND key = ?", (now, kind, key))
+            self.increment(conn, "hits")
+            return json.loads(row[0])
+
+    def set(self, kind, key, value):
+        now = time.time()
+        payload = json.dumps(value, default=str)
+        with self.connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (kind, key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, payload, len(payload), now, now)
+            )
+            self.evict(conn, now)
+
+    def evict(self, conn, now):
+        if self.ttl_seconds:
+            conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        entries, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if entries <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        # Least recently used entries go first until both limits are met again.
+        evicted = 0
+        for kind, key, size in conn.execute("SELECT kind, key, size FROM entries ORDER BY accessed_at").fetchall():
+            if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key))
+            entries -= 1
+            total_bytes -= size
+            evicted += 1
+        self.increment(conn, "evictions", evicted)
+
+    def increment(self, conn, name, amount=1):
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + ?",
+            (name, amount, amount)
+        )
+
+    def stats(self):
+        with self.connect() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "evictions": counters.get("evictions", 0),
+            "entries": entries,
+            "bytes": total_bytes
+        }
+
+    def clear(self):
+        with self.connect() as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM counters")
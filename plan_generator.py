@@ -1,22 +1,55 @@
 import pandas as pd
 import json
+import asyncio
 from langchain_core.messages import HumanMessage, SystemMessage
-from config import CLEANING_ACTIONS
+from config import Config, CLEANING_ACTIONS
 from domain_detector import get_domain_specific_guidelines
+from llm_cache import schema_fingerprint, eda_signature, model_name
+from dataset_profile import profile_dataset
 
-def generate_initial_plan(df, domain_info, chat_model):
+def generate_initial_plan(df, domain_info, chat_model, cache=None, initial_eda=None):
+    initial_eda = initial_eda if initial_eda is not None else build_initial_eda(df)
+    plan, messages, cache_key = prepare_plan_request(domain_info, chat_model, initial_eda, cache)
+    if plan is not None:
+        return plan, initial_eda
+    
+    try:
+        response = chat_model.invoke(messages)
+        return parse_plan_response(response.content, cache, cache_key), initial_eda
+    except Exception as e:
+        return fallback_plan(domain_info), initial_eda
+
+async def agenerate_initial_plan(df, domain_info, chat_model, cache=None, initial_eda=None, timeout=None):
+    initial_eda = initial_eda if initial_eda is not None else build_initial_eda(df)
+    plan, messages, cache_key = prepare_plan_request(domain_info, chat_model, initial_eda, cache)
+    if plan is not None:
+        return plan, initial_eda
+    
+    try:
+        response = await asyncio.wait_for(chat_model.ainvoke(messages), timeout or Config.LLM_TIMEOUT_SECONDS)
+        return parse_plan_response(response.content, cache, cache_key), initial_eda
+    except Exception as e:
+        return fallback_plan(domain_info), initial_eda
+
+def build_initial_eda(df, profile=None):
+    profile = profile or profile_dataset(df)
     initial_eda = {
-        "shape": df.shape,
-        "columns": df.columns.tolist(),
-        "null_counts": df.isnull().sum().to_dict(),
-        "dtypes": df.dtypes.astype(str).to_dict(),
-        "memory_usage": df.memory_usage(deep=True).sum(),
-        "duplicate_rows": df.duplicated().sum(),
-        "numeric_columns": df.select_dtypes(include=['number']).columns.tolist(),
-        "categorical_columns": df.select_dtypes(include=['object']).columns.tolist(),
-        "date_columns": df.select_dtypes(include=['datetime']).columns.tolist()
+        "shape": profile.shape,
+        "columns": profile.columns,
+        "null_counts": profile.null_counts.to_dict(),
+        "dtypes": profile.dtypes.astype(str).to_dict(),
+        "memory_usage": profile.memory_usage,
+        "duplicate_rows": profile.duplicate_count,
+        "numeric_columns": profile.numeric_columns,
+        "categorical_columns": profile.categorical_columns,
+        "date_columns": profile.date_columns
     }
-    
+    if profile.approximate:
+        initial_eda["approximate"] = True
+        initial_eda["duplicate_rows_error"] = profile.error_bounds["duplicate_count"]
+    return initial_eda
+
+def prepare_plan_request(domain_info, chat_model, initial_eda, cache=None):
     total_nulls = sum(initial_eda['null_counts'].values())
     total_duplicates = initial_eda['duplicate_rows']
     
@@ -31,9 +64,16 @@ def generate_initial_plan(df, domain_info, chat_model):
             "warnings": ["Data is already clean. Consider if additional processing is needed"],
             "estimated_time": "No processing needed"
         }
-        return clean_plan, initial_eda
+        return clean_plan, None, None
+    
+    cache_key = schema_fingerprint(model_name(chat_model), domain_info, eda_signature(initial_eda))
+    if cache is not None:
+        cached_plan = cache.get("generate_initial_plan", cache_key)
+        if cached_plan is not None:
+            return cached_plan, None, cache_key
     
     domain_guidelines = get_domain_specific_guidelines(domain_info['domain'])
+    approximate_note = f"\n- Duplicate rows are estimated from a sketch of the data (within {initial_eda['duplicate_rows_error']})" if initial_eda.get('approximate') else ""
     
     system_prompt = f"""You are a data cleaning expert specializing in {domain_info['domain']} data. Analyze the dataset and create a comprehensive cleaning plan.
 
@@ -45,7 +85,7 @@ Dataset Analysis:
 - Duplicate rows: {initial_eda['duplicate_rows']}
 - Numeric columns: {initial_eda['numeric_columns']}
 - Categorical columns: {initial_eda['categorical_columns']}
-- Date columns: {initial_eda['date_columns']}
+- Date columns: {initial_eda['date_columns']}{approximate_note}
 
 Domain: {domain_info['domain']}
 Domain Confidence: {domain_info['confidence']}
@@ -82,46 +122,56 @@ Score cleanliness based on: null values, duplicates, data types, and data qualit
         HumanMessage(content=f"Generate a comprehensive cleaning plan for this {domain_info['domain']} dataset.")
     ]
     
-    try:
-        response = chat_model.invoke(messages)
-        plan_data = json.loads(response.content)
-        
-        for action in plan_data.get("recommended_actions", []):
-            if action["action"] in CLEANING_ACTIONS:
-                action["description"] = CLEANING_ACTIONS[action["action"]]
-        
-        return plan_data, initial_eda
-    except Exception as e:
-        default_plan = {
-            "is_clean": False,
-            "cleanliness_score": 50,
-            "message": "Basic cleaning recommended",
-            "domain_specific_notes": f"General {domain_info['domain']} dataset",
-            "critical_issues": ["Missing values present", "Potential duplicates"],
-            "recommended_actions": [
-                {
-                    "action": "handle_missing_values",
-                    "description": CLEANING_ACTIONS["handle_missing_values"],
-                    "columns": "all",
-                    "priority": "high",
-                    "reasoning": "Dataset contains missing values",
-                    "expected_impact": "Complete data records"
-                },
-                {
-                    "action": "remove_duplicates",
-                    "description": CLEANING_ACTIONS["remove_duplicates"],
-                    "columns": "all",
-                    "priority": "high",
-                    "reasoning": "Duplicate rows detected",
-                    "expected_impact": "Unique records only"
-                }
-            ],
-            "warnings": ["Automatic fallback plan used"],
-            "estimated_time": "Quick processing"
-        }
-        return default_plan, initial_eda
+    return None, messages, cache_key
+
+def parse_plan_response(content, cache=None, cache_key=None):
+    plan_data = json.loads(content)
+    
+    for action in plan_data.get("recommended_actions", []):
+        if action["action"] in CLEANING_ACTIONS:
+            action["description"] = CLEANING_ACTIONS[action["action"]]
+    
+    if cache is not None:
+        cache.set("generate_initial_plan", cache_key, plan_data)
+    return plan_data
+
+def fallback_plan(domain_info):
+    return {
+        "is_clean": False,
+        "cleanliness_score": 50,
+        "message": "Basic cleaning recommended",
+        "domain_specific_notes": f"General {domain_info['domain']} dataset",
+        "critical_issues": ["Missing values present", "Potential duplicates"],
+        "recommended_actions": [
+            {
+                "action": "handle_missing_values",
+                "description": CLEANING_ACTIONS["handle_missing_values"],
+                "columns": "all",
+                "priority": "high",
+                "reasoning": "Dataset contains missing values",
+                "expected_impact": "Complete data records"
+            },
+            {
+                "action": "remove_duplicates",
+                "description": CLEANING_ACTIONS["remove_duplicates"],
+                "columns": "all",
+                "priority": "high",
+                "reasoning": "Duplicate rows detected",
+                "expected_impact": "Unique records only"
+            }
+        ],
+        "warnings": ["Automatic fallback plan used"],
+        "estimated_time": "Quick processing"
+    }
+
+def finalize_plan(original_plan, user_modifications, initial_eda, chat_model, cache=None):
+    cache_key = schema_fingerprint(model_name(chat_model), original_plan, eda_signature(initial_eda), user_modifications)
+    if cache is not None:
+        cached_plan = cache.get("finalize_plan", cache_key)
+        if cached_plan is not None:
+            return cached_plan
+    
 
-def finalize_plan(original_plan, user_modifications, initial_eda, chat_model):
     system_prompt = f"""Finalize the data cleaning plan based on user modifications and initial analysis.
 
 Original Plan:
@@ -162,7 +212,10 @@ Provide the final plan in this exact JSON structure:
     
     try:
         response = chat_model.invoke(messages)
-        return json.loads(response.content)
+        final_plan = json.loads(response.content)
+        if cache is not None:
+            cache.set("finalize_plan", cache_key, final_plan)
+        return final_plan
     except Exception as e:
         finalized_actions = []
         execution_order = 1
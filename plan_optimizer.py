@@ -0,0 +1,205 @@
+import copy
+from data_cleaner import ACTION_REGISTRY, STRING_ACTIONS
+
+# Actions for which a second run over the same columns changes nothing, so a
+# repeat can be dropped.
+IDEMPOTENT_ACTIONS = [
+    "remove_duplicates",
+    "remove_columns",
+    "standardize_format",
+    "handle_inconsistent_casing",
+    "remove_special_characters",
+    "handle_text_encoding",
+    "remove_whitespace",
+    "standardize_address_format",
+    "standardize_names"
+]
+
+def optimize_plan(final_plan, df=None):
+    # Rewrites finalized_actions into an equivalent, cheaper order using the
+    # registry metadata: in_place actions read and write only their own columns
+    # one at a time, string actions are also row-wise, and filter_rows actions
+    # only read their columns. Anything else is a barrier nothing moves across.
+    actions = [dict(action) for action in final_plan.get("finalized_actions", [])]
+    changes = []
+
+    previous = None
+    while previous != actions:
+        previous = copy.deepcopy(actions)
+        actions = hoist_actions(actions, changes, df)
+        actions = prune_dead_columns(actions, changes, df)
+        actions = merge_repeated_actions(actions, changes)
+
+    for i, action in enumerate(actions):
+        if "execution_order" in action:
+            action["execution_order"] = i + 1
+
+    optimized_plan = dict(final_plan)
+    optimized_plan["finalized_actions"] = actions
+    if "execution_sequence" in final_plan:
+        optimized_plan["execution_sequence"] = list(range(1, len(actions) + 1))
+
+    original_actions = final_plan.get("finalized_actions", [])
+    report = {
+        "actions_before": len(original_actions),
+        "actions_after": len(actions),
+        "changes": changes
+    }
+    if df is not None:
+        passes_before = column_passes(original_actions, df)
+        passes_after = column_passes(actions, df)
+        report["column_passes_before"] = passes_before
+        report["column_passes_after"] = passes_after
+        report["estimated_cells_saved"] = max(passes_before - passes_after, 0) * len(df)
+    return optimized_plan, report
+
+def action_columns(action):
+    # None stands for every column, which conflicts with any other column set.
+    columns = action["columns"]
+    return None if columns == "all" else list(columns)
+
+def action_effect(action):
+    entry = ACTION_REGISTRY.get(action["action"])
+    return entry["effect"] if entry is not None else None
+
+def overlaps(columns, other):
+    return columns is None or other is None or any(col in other for col in columns)
+
+def is_column_drop(action):
+    return action["action"] == "remove_columns" and action_columns(action) is not None
+
+def is_row_filter(action):
+    return action_effect(action) == "filter_rows" and action_columns(action) is not None
+
+def filter_columns(actions, position, df=None):
+    # remove_duplicates falls back to every column when none of its columns
+    # exist, so a filter's columns are only trusted when nothing before it can
+    # have dropped or renamed them, and when they are known to exist: without
+    # a frame, remove_duplicates may be reading every column.
+    columns = action_columns(actions[position])
+    if columns is None:
+        return None
+    if df is None:
+        if actions[position]["action"] == "remove_duplicates":
+            return None
+    elif any(col not in df.columns for col in columns):
+        return None
+    for action in actions[:position]:
+        if action_effect(action) in [None, "frame", "rename", "drop_columns"]:
+            if not is_column_drop(action) or overlaps(action_columns(action), columns):
+                return None
+    return columns
+
+def can_precede(actions, position, df=None):
+    action, previous = actions[position], actions[position - 1]
+    effect = action_effect(previous)
+    if is_column_drop(action):
+        # Columns can be dropped before any per-column action, which then skips
+        # them, and before row filters that never read them.
+        if effect == "in_place":
+            return True
+        return effect == "filter_rows" and not overlaps(filter_columns(actions, position - 1, df), action_columns(action))
+    if is_row_filter(action):
+        # Row-wise string actions give the same values on fewer rows, as long as
+        # they do not write the columns the filter reads.
+        return previous["action"] in STRING_ACTIONS and not overlaps(action_columns(previous), action_columns(action))
+    return False
+
+def hoist_actions(actions, changes, df=None):
+    actions = list(actions)
+    for i in range(1, len(actions)):
+        position = i
+        if is_row_filter(actions[i]) and filter_columns(actions, i, df) is None:
+            continue
+        while position > 0 and can_precede(actions, position, df):
+            previous = actions[position - 1]
+            if is_column_drop(actions[position]) and action_columns(previous) is not None:
+                previous["columns"] = [col for col in previous["columns"] if col not in actions[position]["columns"]]
+            actions[position - 1], actions[position] = actions[position], previous
+            position -= 1
+
+        if position != i:
+            changes.append(f"Moved {actions[position]['action']} {actions[position]['columns']} ahead of {actions[position + 1]['action']}")
+    return [action for action in actions if action_effect(action) != "in_place" or action["columns"] != []]
+
+def reads_column(actions, position, col, df=None):
+    action = actions[position]
+    effect = action_effect(action)
+    if effect is None or effect in ["frame", "rename"]:
+        return True
+    if effect == "drop_columns":
+        # Data-driven drops look at every column; only remove_columns does not.
+        return not is_column_drop(action)
+    columns = filter_columns(actions, position, df) if effect == "filter_rows" else action_columns(action)
+    return columns is None or col in columns
+
+def is_dead_write(actions, i, col, df=None):
+    for position in range(i + 1, len(actions)):
+        action = actions[position]
+        if is_column_drop(action) and col in action["columns"]:
+            return True
+        if reads_column(actions, position, col, df):
+            return False
+    return False
+
+def prune_dead_columns(actions, changes, df=None):
+    pruned = []
+    for i, action in enumerate(actions):
+        columns = action_columns(action)
+        if action_effect(action) == "in_place" and columns is not None:
+            dead = [col for col in columns if is_dead_write(actions, i, col, df)]
+            if dead:
+                action["columns"] = [col for col in columns if col not in dead]
+                changes.append(f"Skipped {action['action']} on {dead}, which are dropped before being read")
+                if not action["columns"]:
+                    continue
+        pruned.append(action)
+    return pruned
+
+def can_commute(action, other):
+    # Two per-column actions on disjoint explicit columns give the same result
+    # in either order.
+    return (action_effect(action) == "in_place" and action_effect(other) == "in_place"
+            and action_columns(action) is not None and action_columns(other) is not None
+            and not overlaps(action_columns(action), action_columns(other)))
+
+def merge_into(target, action):
+    if action["columns"] == target["columns"] and action["action"] in IDEMPOTENT_ACTIONS:
+        return True
+    if action_columns(target) is None or action_columns(action) is None:
+        return False
+    if action_effect(action) == "in_place" and action["action"] in IDEMPOTENT_ACTIONS and all(col in target["columns"] for col in action["columns"]):
+        return True
+    if is_column_drop(action):
+        target["columns"] = target["columns"] + [col for col in action["columns"] if col not in target["columns"]]
+        return True
+    if action_effect(action) == "in_place" and not overlaps(target["columns"], action["columns"]):
+        target["columns"] = target["columns"] + action["columns"]
+        return True
+    return False
+
+def merge_repeated_actions(actions, changes):
+    merged = []
+    for action in actions:
+        target = None
+        for previous in reversed(merged):
+            if previous["action"] == action["action"]:
+                target = previous
+                break
+            if not can_commute(action, previous):
+                break
+
+        if target is not None and merge_into(target, action):
+            changes.append(f"Merged repeated {action['action']} {action['columns']}")
+            continue
+        merged.append(action)
+    return merged
+
+def column_passes(actions, df):
+    # A rough cost model: one pass over the rows for every column an action
+    # touches, with "all" resolved against the input columns.
+    passes = 0
+    for action in actions:
+        columns = action_columns(action)
+        passes += df.shape[1] if columns is None else len(columns)
+    return passes
@@ -0,0 +1,399 @@
+import numpy as np
+import pandas as pd
+from config import Config
+from data_cleaner import ACTION_REGISTRY, ColumnStats, apply_action, execute_cleaning_plan
+
+# Alternate executor that compiles a finalized plan into one Polars lazy query.
+# Actions with a translation below are added to the query; any other action
+# (or a translation that fails) materializes the query, runs the pandas
+# implementation and continues lazily from its result. The translations mirror
+# the pandas actions, including their quirks, so both backends agree.
+
+class NotTranslatable(Exception):
+    pass
+
+def execute_cleaning_plan_polars(df, final_plan, domain_info=None, streaming=None):
+    streaming = len(df) >= Config.POLARS_STREAMING_MIN_ROWS if streaming is None else streaming
+    runner = LazyPlanRunner(df, domain_info, "streaming" if streaming else "auto")
+    for action in final_plan.get("finalized_actions", []):
+        runner.run(action)
+    return runner.result(), runner.execution_log
+
+class LazyPlanRunner:
+    # Holds either a lazy query (with the materialized frame it starts from)
+    # or, after an action whose result Polars cannot represent, a pandas frame.
+    def __init__(self, df, domain_info=None, engine="auto"):
+        self.domain_info = domain_info
+        self.engine = engine
+        self.execution_log = []
+        self.pending = []
+        self.frame = to_polars(df)
+        self.query = self.frame.lazy() if self.frame is not None else None
+        self.pandas_df = df.copy() if self.frame is None else None
+
+    def run(self, action):
+        action = {"action": action["action"], "columns": action["columns"]}
+        if self.pandas_df is None and self.add_to_query(action):
+            return
+
+        df = self.pandas_df if self.pandas_df is not None else self.materialize()
+        df, log_entry = run_pandas_action(df, action, self.domain_info)
+        self.execution_log.append(log_entry)
+        self.set_frame(df)
+
+    def add_to_query(self, action):
+        translation = POLARS_TRANSLATIONS.get(action["action"])
+        if translation is None and action["action"] in ACTION_REGISTRY:
+            return False
+
+        try:
+            if translation is None:
+                # Unknown actions are no-ops, as in apply_action.
+                query = self.query
+            elif translation["needs_data"]:
+                frame = self.collect()
+                if frame is None:
+                    return False
+                query = translation["function"](frame.lazy(), action["columns"], self.domain_info, frame)
+            else:
+                query = translation["function"](self.query, action["columns"], self.domain_info, None)
+            query.collect_schema()
+        except Exception:
+            return False
+
+        self.query = query
+        self.pending.append((len(self.execution_log), action))
+        self.execution_log.append({"action": action["action"], "success": True, "rows_after": None, "columns_after": None, "backend": "polars", "column_stats": {}})
+        return True
+
+    def collect(self):
+        # Runs the query built so far. If Polars rejects it at run time, the
+        # pending actions are replayed with pandas from the last materialized
+        # frame; None means that result could not be converted back.
+        if not self.pending:
+            return self.frame
+
+        try:
+            result = self.query.collect(engine=self.engine)
+            for index, _ in self.pending:
+                self.execution_log[index].update({"rows_after": result.height, "columns_after": result.width})
+            self.pending = []
+            self.set_frame(result)
+        except Exception:
+            df = from_polars(self.frame)
+            for index, action in self.pending:
+                df, self.execution_log[index] = run_pandas_action(df, action, self.domain_info)
+            self.pending = []
+            self.set_frame(df)
+        return self.frame if self.pandas_df is None else None
+
+    def materialize(self):
+        frame = self.collect()
+        return from_polars(frame) if frame is not None else self.pandas_df
+
+    def set_frame(self, data):
+        if isinstance(data, pd.DataFrame):
+            frame = to_polars(data)
+            self.pandas_df = data if frame is None else None
+        else:
+            frame, self.pandas_df = data, None
+        if frame is not None:
+            self.frame, self.query = frame, frame.lazy()
+
+    def result(self):
+        return self.materialize()
+
+def run_pandas_action(df, action, domain_info=None):
+    stats = ColumnStats()
+    try:
+        df = apply_action(df, action["action"], action["columns"], domain_info, stats)
+        log_entry = {"action": action["action"], "success": True}
+    except Exception as e:
+        log_entry = {"action": action["action"], "success": False, "error": str(e)}
+    log_entry.update({"rows_after": df.shape[0], "columns_after": df.shape[1], "backend": "pandas", "column_stats": stats.pop_accessed()})
+    return df, log_entry
+
+def to_polars(df):
+    import polars as pl
+
+    # Object columns holding a mix of strings, numbers and booleans have no
+    # Polars type; those frames stay in pandas.
+    try:
+        frame = pl.from_pandas(df.reset_index(drop=True))
+    except Exception:
+        return None
+    categorical = [name for name, dtype in frame.schema.items() if dtype == pl.Categorical]
+    return frame.with_columns(pl.col(categorical).cast(pl.String)) if categorical else frame
+
+def from_polars(frame):
+    import polars as pl
+
+    df = frame.to_pandas()
+    for name, dtype in frame.schema.items():
+        if dtype == pl.String:
+            df[name] = df[name].astype(Config.STRING_DTYPE)
+    return df
+
+def schema_of(query):
+    return query.collect_schema()
+
+def is_text_dtype(dtype):
+    import polars as pl
+    return dtype == pl.String or dtype == pl.Categorical
+
+def is_numeric_dtype(dtype):
+    return dtype.is_numeric()
+
+def select_columns(query, action_name, columns):
+    # Same resolution as resolve_action_columns on the pandas side.
+    schema = schema_of(query)
+    if columns != "all":
+        return [col for col in columns if col in schema]
+
+    select = ACTION_REGISTRY[action_name]["select"]
+    if select == "any":
+        return list(schema.names())
+    elif select == "text":
+        return [col for col, dtype in schema.items() if is_text_dtype(dtype)]
+    elif select == "number":
+        return [col for col, dtype in schema.items() if is_numeric_dtype(dtype)]
+    return []
+
+def translate_missing_values(query, columns, domain_info=None, frame=None):
+    import polars as pl
+
+    schema = schema_of(query)
+    domain = domain_info.get('domain', 'general') if domain_info else 'general'
+    columns = schema.names() if columns == "all" else columns
+
+    expressions = []
+    for col in columns:
+        if col not in schema:
+            continue
+        col_name_lower = col.lower()
+        if is_text_dtype(schema[col]):
+            if any(keyword in col_name_lower for keyword in ['date', 'time']):
+                fill_value = 'Unknown Date'
+            elif any(keyword in col_name_lower for keyword in ['name', 'title', 'description']):
+                fill_value = 'Unknown'
+            elif any(keyword in col_name_lower for keyword in ['email', 'phone', 'id']):
+                fill_value = 'Not Provided'
+            elif domain in ['finance', 'sales', 'ecommerce'] and any(keyword in col_name_lower for keyword in ['category', 'type', 'status']):
+                fill_value = 'Other'
+            else:
+                fill_value = 'Missing'
+            expressions.append(pl.col(col).fill_null(pl.lit(fill_value)))
+        elif is_numeric_dtype(schema[col]):
+            if any(keyword in col_name_lower for keyword in ['price', 'amount', 'cost', 'revenue', 'salary', 'income']):
+                fill = pl.lit(0)
+            elif any(keyword in col_name_lower for keyword in ['age', 'year', 'count', 'quantity']):
+                fill = pl.col(col).median()
+            elif any(keyword in col_name_lower for keyword in ['rating', 'score', 'percentage']):
+                fill = pl.col(col).mean()
+            else:
+                fill = pl.col(col).median()
+            expressions.append(pl.col(col).fill_null(fill))
+    return query.with_columns(expressions) if expressions else query
+
+def translate_remove_duplicates(query, columns, domain_info=None, frame=None):
+    subset = None
+    if columns != "all":
+        schema = schema_of(query)
+        subset = [col for col in columns if col in schema] or None
+    return query.unique(subset=subset, keep="first", maintain_order=True)
+
+def translate_remove_outliers(query, columns, domain_info=None, frame=None):
+    import polars as pl
+
+    # Only the IQR method is translated. All quartiles are aggregates over the
+    # unfiltered input and the rows are filtered once, as in the pandas engine.
+    if Config.OUTLIER_METHOD != "iqr":
+        raise NotTranslatable("remove_outliers")
+    threshold = Config.OUTLIER_THRESHOLDS["iqr"]
+    schema = schema_of(query)
+    conditions = []
+    for col in select_columns(query, "remove_outliers", columns):
+        if is_numeric_dtype(schema[col]):
+            q1 = pl.col(col).quantile(0.25, interpolation="linear")
+            q3 = pl.col(col).quantile(0.75, interpolation="linear")
+            iqr = q3 - q1
+            conditions.append((pl.col(col) >= q1 - threshold * iqr) & (pl.col(col) <= q3 + threshold * iqr))
+    return query.filter(pl.all_horizontal(conditions)) if conditions else query
+
+def translate_normalize_numeric(query, columns, domain_info=None, frame=None):
+    import polars as pl
+
+    schema = schema_of(query)
+    expressions = []
+    for col in select_columns(query, "normalize_numeric", columns):
+        if is_numeric_dtype(schema[col]):
+            values = pl.col(col).cast(pl.Float64)
+            scale = values.std(ddof=0)
+            scale = pl.when(scale == 0).then(pl.lit(1.0)).otherwise(scale)
+            expressions.append((values - values.mean()) / scale)
+    return query.with_columns(expressions) if expressions else query
+
+def translate_remove_columns(query, columns, domain_info=None, frame=None):
+    if columns == "all":
+        raise NotTranslatable("remove_columns")
+    schema = schema_of(query)
+    return query.drop([col for col in columns if col in schema])
+
+def translate_rename_columns(query, columns, domain_info=None, frame=None):
+    schema = schema_of(query)
+    rename_dict = {col: col.lower().replace(' ', '_').replace('-', '_') for col in columns if col in schema}
+    names = [rename_dict.get(col, col) for col in schema.names()]
+    if len(set(names)) != len(names):
+        # pandas allows the duplicate names a rename can produce; Polars does not.
+        raise NotTranslatable("rename_columns")
+    return query.rename(rename_dict)
+
+def translate_negative_values(query, columns, domain_info=None, frame=None):
+    import polars as pl
+
+    schema = schema_of(query)
+    expressions = []
+    for col in columns:
+        if col in schema and is_numeric_dtype(schema[col]) and col.lower() not in ['profit', 'growth', 'change']:
+            expressions.append(pl.when(pl.col(col) < 0).then(-pl.col(col)).otherwise(pl.col(col)).alias(col))
+    return query.with_columns(expressions) if expressions else query
+
+def translate_zero_values(query, columns, domain_info=None, frame=None):
+    import polars as pl
+
+    schema = schema_of(query)
+    expressions = []
+    for col in columns:
+        if col in schema and is_numeric_dtype(schema[col]):
+            expressions.append(pl.when(pl.col(col) == 0).then(pl.col(col).median()).otherwise(pl.col(col)).alias(col))
+    return query.with_columns(expressions) if expressions else query
+
+def translate_infinite_values(query, columns, domain_info=None, frame=None):
+    import polars as pl
+
+    schema = schema_of(query)
+    expressions = []
+    for col in select_columns(query, "handle_infinite_values", columns) if columns == "all" else columns:
+        if col in schema and is_numeric_dtype(schema[col]):
+            values = pl.col(col)
+            if schema[col].is_float():
+                values = pl.when(values.is_infinite()).then(None).otherwise(values)
+            expressions.append(values.fill_null(values.median()).alias(col))
+    return query.with_columns(expressions) if expressions else query
+
+def translate_encode_categorical(query, columns, domain_info=None, frame=None):
+    import polars as pl
+
+    # Dummy columns depend on the values, so this translation runs on the
+    # materialized frame: up to ten values become appended boolean columns,
+    # more are label encoded in sorted order with missing values as 'nan'.
+    schema = frame.schema
+    columns = [col for col, dtype in schema.items() if is_text_dtype(dtype)] if columns == "all" else columns
+    for col in columns:
+        if col not in frame.columns or not is_text_dtype(frame.schema[col]):
+            continue
+        values = frame.get_column(col)
+        if values.n_unique() - int(values.null_count() > 0) <= 10:
+            categories = sorted(values.drop_nulls().unique().to_list())
+            dummies = [(pl.col(col) == value).fill_null(False).alias(f"{col}_{value}") for value in categories]
+            frame = frame.with_columns(dummies).drop(col)
+        else:
+            text = values.fill_null('nan')
+            labels = pl.Series(sorted(text.unique().to_list()))
+            codes = text.replace_strict(labels, pl.Series(np.arange(len(labels), dtype=np.int64)))
+            frame = frame.with_columns(codes.alias(col))
+    return frame.lazy()
+
+def string_expression(action_name, col):
+    import polars as pl
+
+    values = pl.col(col).cast(pl.String).fill_null('nan')
+    if action_name == "remove_whitespace":
+        return values.str.strip_chars().str.replace_all(r'\s+', ' ')
+    elif action_name == "handle_inconsistent_casing":
+        return values.str.to_titlecase()
+    elif action_name == "standardize_names":
+        return values.str.to_titlecase().str.strip_chars()
+    elif action_name == "standardize_address_format":
+        return values.str.to_uppercase().str.strip_chars()
+    elif action_name == "remove_special_characters":
+        return values.str.replace_all(r'[^\w\s]', '')
+    elif action_name == "handle_text_encoding":
+        return values
+    elif action_name == "standardize_format":
+        col_name_lower = col.lower()
+        if any(keyword in col_name_lower for keyword in ['email']):
+            return values.str.to_lowercase().str.strip_chars()
+        elif any(keyword in col_name_lower for keyword in ['name', 'title']):
+            return values.str.to_titlecase().str.strip_chars()
+        elif any(keyword in col_name_lower for keyword in ['address', 'location']):
+            return values.str.to_uppercase().str.strip_chars()
+        return values.str.strip_chars()
+    raise NotTranslatable(action_name)
+
+def translate_string_action(action_name):
+    def translate(query, columns, domain_info=None, frame=None):
+        schema = schema_of(query)
+        columns = [col for col in select_columns(query, action_name, columns) if is_text_dtype(schema[col])]
+        expressions = [string_expression(action_name, col).alias(col) for col in columns]
+        return query.with_columns(expressions) if expressions else query
+    return translate
+
+POLARS_TRANSLATIONS = {
+    "handle_missing_values": {"function": translate_missing_values, "needs_data": False},
+    "remove_duplicates": {"function": translate_remove_duplicates, "needs_data": False},
+    "remove_outliers": {"function": translate_remove_outliers, "needs_data": False},
+    "normalize_numeric": {"function": translate_normalize_numeric, "needs_data": False},
+    "remove_columns": {"function": translate_remove_columns, "needs_data": False},
+    "rename_columns": {"function": translate_rename_columns, "needs_data": False},
+    "handle_negative_values": {"function": translate_negative_values, "needs_data": False},
+    "handle_zero_values": {"function": translate_zero_values, "needs_data": False},
+    "handle_infinite_values": {"function": translate_infinite_values, "needs_data": False},
+    "encode_categorical": {"function": translate_encode_categorical, "needs_data": True},
+    "standardize_format": {"function": translate_string_action("standardize_format"), "needs_data": False},
+    "handle_inconsistent_casing": {"function": translate_string_action("handle_inconsistent_casing"), "needs_data": False},
+    "remove_special_characters": {"function": translate_string_action("remove_special_characters"), "needs_data": False},
+    "handle_text_encoding": {"function": translate_string_action("handle_text_encoding"), "needs_data": False},
+    "remove_whitespace": {"function": translate_string_action("remove_whitespace"), "needs_data": False},
+    "standardize_address_format": {"function": translate_string_action("standardize_address_format"), "needs_data": False},
+    "standardize_names": {"function": translate_string_action("standardize_names"), "needs_data": False}
+}
+
+def compare_backends(df, final_plan, domain_info=None, rtol=1e-9, backend="polars"):
+    # Parity check: runs the plan on pandas and on the given backend and reports
+    # every column whose values differ. Indexes and dtypes are not compared.
+    expected, _ = execute_cleaning_plan(df.copy(), final_plan, domain_info, max_workers=1, optimize=False, backend="pandas")
+    actual, _ = execute_cleaning_plan(df.copy(), final_plan, domain_info, backend=backend)
+    expected, actual = expected.reset_index(drop=True), actual.reset_index(drop=True)
+
+    report = {
+        "equal": True,
+        "rows": [len(expected), len(actual)],
+        "missing_columns": [str(col) for col in expected.columns if col not in actual.columns],
+        "extra_columns": [str(col) for col in actual.columns if col not in expected.columns],
+        "column_order_matches": expected.columns.tolist() == actual.columns.tolist(),
+        "mismatched_columns": {}
+    }
+    if len(expected) == len(actual):
+        for col in expected.columns:
+            if col in actual.columns:
+                mismatches = count_mismatches(expected[col], actual[col], rtol)
+                if mismatches:
+                    report["mismatched_columns"][str(col)] = mismatches
+
+    report["equal"] = (len(expected) == len(actual) and not report["missing_columns"] and not report["extra_columns"]
+                       and report["column_order_matches"] and not report["mismatched_columns"])
+    return report
+
+def count_mismatches(expected, actual, rtol=1e-9):
+    both_null = (expected.isna() & actual.isna()).to_numpy()
+    numeric = pd.api.types.is_numeric_dtype(expected) and pd.api.types.is_numeric_dtype(actual)
+    if numeric and not pd.api.types.is_bool_dtype(expected):
+        left = expected.astype('float64').to_numpy()
+        right = actual.astype('float64').to_numpy()
+        matches = np.isclose(left, right, rtol=rtol, equal_nan=True)
+    else:
+        left = expected.astype(object).where(expected.notna(), None).to_numpy()
+        right = actual.astype(object).where(actual.notna(), None).to_numpy()
+        matches = np.array([a == b for a, b in zip(left, right)], dtype=bool)
+    return int((~(matches | both_null)).sum())
@@ -0,0 +1,135 @@
+import json
+import os
+import sys
+import time
+import tracemalloc
+import pandas as pd
+from config import Config
+
+# Per-action measurements for the execution log. Time comes from
+# perf_counter/process_time, Python allocations (numpy buffers included) from
+# tracemalloc and process memory from the resident set size. Work done by
+# arrow or in worker processes is only visible in the RSS figures.
+
+PROFILE_FIELDS = ["wall_seconds", "cpu_seconds", "rows_per_second", "peak_memory_bytes", "memory_delta_bytes", "rss_delta_bytes", "new_column_bytes"]
+
+class ActionProfiler:
+    def __init__(self, trace_memory=None):
+        self.trace_memory = Config.PROFILE_TRACE_MEMORY if trace_memory is None else trace_memory
+        self.origin = time.perf_counter()
+        self.owns_tracing = False
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.owns_tracing = True
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.owns_tracing:
+            tracemalloc.stop()
+            self.owns_tracing = False
+        return False
+
+    def start(self, df):
+        traced = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            traced = tracemalloc.get_traced_memory()[0]
+        return {
+            "wall": time.perf_counter(),
+            "cpu": time.process_time(),
+            "rss": current_rss(),
+            "traced": traced,
+            "rows": df.shape[0],
+            "columns": set(df.columns)
+        }
+
+    def finish(self, state, df):
+        wall_seconds = time.perf_counter() - state["wall"]
+        profile = {
+            "start_seconds": round(state["wall"] - self.origin, 6),
+            "wall_seconds": round(wall_seconds, 6),
+            "cpu_seconds": round(time.process_time() - state["cpu"], 6),
+            "rows_in": state["rows"],
+            "rows_per_second": round(state["rows"] / wall_seconds) if wall_seconds > 0 else None,
+            "peak_memory_bytes": None,
+            "memory_delta_bytes": None,
+            "rss_delta_bytes": None,
+            "new_column_bytes": new_column_bytes(df, state["columns"])
+        }
+        if state["traced"] is not None and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            profile["peak_memory_bytes"] = peak - state["traced"]
+            profile["memory_delta_bytes"] = current - state["traced"]
+        rss = current_rss()
+        if rss is not None and state["rss"] is not None:
+            profile["rss_delta_bytes"] = rss - state["rss"]
+        return profile
+
+def current_rss():
+    try:
+        with open('/proc/self/statm', 'r') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Without /proc only the peak is available; kilobytes except on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def new_column_bytes(df, columns_before):
+    added = [col for col in df.columns if col not in columns_before]
+    if not added:
+        return 0
+    return int(df[added].memory_usage(index=False, deep=True).sum())
+
+def log_table(execution_log):
+    # One row per action with the profile flattened into columns, for the
+    # Streamlit log table and the JSON export.
+    rows = []
+    for step, entry in enumerate(execution_log, start=1):
+        row = {"step": step}
+        row.update({key: value for key, value in entry.items() if key not in ["column_stats", "profile"]})
+        row.update(entry.get("profile") or {})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def hottest_actions(execution_log, limit=5):
+    profiled = [(step, entry) for step, entry in enumerate(execution_log, start=1) if entry.get("profile")]
+    profiled.sort(key=lambda item: item[1]["profile"]["wall_seconds"], reverse=True)
+    return [{"step": step, "action": entry["action"], "wall_seconds": entry["profile"]["wall_seconds"]} for step, entry in profiled[:limit]]
+
+def export_profile_json(execution_log):
+    profiled = [entry["profile"] for entry in execution_log if entry.get("profile")]
+    report = {
+        "total_wall_seconds": round(sum(profile["wall_seconds"] for profile in profiled), 6),
+        "total_cpu_seconds": round(sum(profile["cpu_seconds"] for profile in profiled), 6),
+        "hottest_actions": hottest_actions(execution_log),
+        "actions": log_table(execution_log).to_dict(orient="records")
+    }
+    return json.dumps(report, indent=2, default=str)
+
+def export_chrome_trace(execution_log):
+    # Trace Event Format, loadable in chrome://tracing or Perfetto: one
+    # complete event per action and a counter track for traced memory.
+    events = []
+    traced = 0
+    for step, entry in enumerate(execution_log, start=1):
+        profile = entry.get("profile")
+        if not profile:
+            continue
+        start = profile["start_seconds"] * 1e6
+        args = {"step": step, "success": entry["success"], "rows_in": profile["rows_in"], "rows_after": entry.get("rows_after"), "columns_after": entry.get("columns_after")}
+        args.update({field: profile[field] for field in PROFILE_FIELDS if profile.get(field) is not None})
+        if entry.get("error"):
+            args["error"] = entry["error"]
+        events.append({"name": entry["action"], "cat": "cleaning", "ph": "X", "ts": start, "dur": profile["wall_seconds"] * 1e6, "pid": 1, "tid": 1, "args": args})
+        if profile["memory_delta_bytes"] is not None:
+            events.append({"name": "traced memory", "ph": "C", "ts": start, "pid": 1, "args": {"bytes": traced}})
+            traced += profile["memory_delta_bytes"]
+            events.append({"name": "traced memory", "ph": "C", "ts": start + profile["wall_seconds"] * 1e6, "pid": 1, "args": {"bytes": traced}})
+    return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
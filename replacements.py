@@ -0,0 +1,106 @@
+import json
+import re
+from functools import lru_cache
+from config import Config
+
+# Built-in tables, keyed by domain. "default" applies to every domain and a
+# domain's own table is layered on top of it. Keys are matched case-insensitively.
+BUILTIN_TABLES = {
+    "abbreviations": {
+        "default": {
+            'st': 'street', 'rd': 'road', 'ave': 'avenue', 'blvd': 'boulevard',
+            'dr': 'drive', 'ln': 'lane', 'ct': 'court', 'pl': 'place'
+        }
+    },
+    "countries": {
+        "default": {
+            'usa': 'United States', 'us': 'United States', 'u.s.a': 'United States', 'u.s.a.': 'United States',
+            'u.s.': 'United States', 'united states of america': 'United States', 'america': 'United States',
+            'uk': 'United Kingdom', 'u.k': 'United Kingdom', 'u.k.': 'United Kingdom', 'england': 'United Kingdom',
+            'great britain': 'United Kingdom', 'britain': 'United Kingdom', 'gb': 'United Kingdom',
+            'uae': 'United Arab Emirates', 'u.a.e': 'United Arab Emirates', 'emirates': 'United Arab Emirates',
+            'deutschland': 'Germany', 'de': 'Germany', 'españa': 'Spain', 'espana': 'Spain',
+            'italia': 'Italy', 'nederland': 'Netherlands', 'holland': 'Netherlands', 'the netherlands': 'Netherlands',
+            'schweiz': 'Switzerland', 'suisse': 'Switzerland', 'österreich': 'Austria', 'brasil': 'Brazil',
+            'méxico': 'Mexico', 'prc': 'China', "people's republic of china": 'China',
+            'south korea': 'Korea, Republic of', 'republic of korea': 'Korea, Republic of', 'korea': 'Korea, Republic of',
+            'russian federation': 'Russia', 'nz': 'New Zealand', 'aus': 'Australia', 'oz': 'Australia',
+            'ksa': 'Saudi Arabia', 'czechia': 'Czech Republic', 'ivory coast': "Côte d'Ivoire"
+        }
+    }
+}
+
+USER_TABLES = {}
+
+def register_replacements(kind, mapping, domain="default"):
+    USER_TABLES.setdefault(kind, {}).setdefault(domain, {}).update(mapping)
+    get_replacer.cache_clear()
+
+@lru_cache(maxsize=None)
+def load_table_file(path):
+    # A JSON file shaped like BUILTIN_TABLES: {kind: {domain: {key: value}}}.
+    with open(path, 'r', encoding='utf-8') as table_file:
+        return json.load(table_file)
+
+def get_replacement_table(kind, domain=None):
+    sources = [BUILTIN_TABLES]
+    if Config.REPLACEMENT_TABLES_PATH:
+        sources.append(load_table_file(Config.REPLACEMENT_TABLES_PATH))
+    sources.append(USER_TABLES)
+
+    table = {}
+    for source in sources:
+        tables = source.get(kind, {})
+        table.update(tables.get("default", {}))
+        if domain and domain != "default":
+            table.update(tables.get(domain, {}))
+    return {str(key).lower(): value for key, value in table.items()}
+
+@lru_cache(maxsize=None)
+def get_replacer(kind, domain=None):
+    return MultiReplacer(get_replacement_table(kind, domain))
+
+class MultiReplacer:
+    def __init__(self, mapping):
+        self.mapping = {str(key).lower(): value for key, value in mapping.items()}
+        self.pattern = None
+        if self.mapping:
+            # All keys are compiled into one prefix-factored alternation, so a
+            # value is scanned once however many keys the table holds.
+            trie = {}
+            for key in self.mapping:
+                node = trie
+                for char in key:
+                    node = node.setdefault(char, {})
+                node[''] = True
+            self.pattern = re.compile(rf'(?<!\w)(?:{trie_pattern(trie)})(?!\w)', re.IGNORECASE)
+
+    def sub(self, value):
+        if self.pattern is None:
+            return value
+        return self.pattern.sub(self.replace_match, value)
+
+    def replace_match(self, match):
+        text = match.group(0)
+        replacement = self.mapping[text.lower()]
+        # The case of the matched text carries over: "St" -> "Street", "ST" -> "STREET".
+        if text.isupper() and len(text) > 1:
+            return replacement.upper()
+        if text[:1].isupper():
+            return replacement[:1].upper() + replacement[1:]
+        return replacement
+
+    def lookup(self, value):
+        return self.mapping.get(str(value).strip().lower())
+
+def trie_pattern(node):
+    alternatives = [re.escape(char) + trie_pattern(child) for char, child in sorted(node.items()) if char != '']
+    if not alternatives:
+        return ''
+
+    pattern = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+    if '' in node:
+        # A key ends here and longer keys continue; the greedy optional group
+        # tries the longer key first.
+        pattern = '(?:' + pattern + ')?'
+    return pattern
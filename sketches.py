@@ -0,0 +1,442 @@
+import numpy as np
+import pandas as pd
+from config import Config
+
+# Mergeable sketches for profiling data too large to count exactly. Each one
+# is updated chunk by chunk, two sketches of different chunks merge into the
+# sketch of both, and every estimate comes with an error bound that holds
+# with probability SKETCH_CONFIDENCE (or always, where stated).
+
+SKETCH_CONFIDENCE = 0.99
+# Two-sided normal quantile and Hoeffding factor sqrt(2 ln(2 / 0.01)) for it.
+NORMAL_Z = 2.576
+HOEFFDING_FACTOR = 3.255
+MISSING_HASH = np.uint64(0x9E3779B97F4A7C15)
+ROW_HASH_MULTIPLIER = np.uint64(0x100000001B3)
+
+def hash_values(values):
+    # 64-bit hashes of numbers, or of the text of anything else.
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'iufb':
+        return pd.util.hash_array(values)
+    return pd.util.hash_array(np.asarray(values, dtype=object), categorize=False)
+
+def bit_length(values):
+    # frexp is exact for integers below 2**53, and these are below 2**32.
+    return np.frexp(values.astype(np.float64))[1]
+
+class HyperLogLog:
+    # Until there are more distinct hashes than registers the hashes are also
+    # kept, and the count is exact.
+    def __init__(self, precision=None):
+        self.precision = precision or Config.SKETCH_HLL_PRECISION
+        self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return
+        self.keep_hashes(hashes)
+        # The first bits pick a register; the register keeps the longest run
+        # of leading zeros seen in the remaining bits.
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        rest = hashes << np.uint64(self.precision)
+        high = (rest >> np.uint64(32)).astype(np.uint32)
+        low = (rest & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+        leading_zeros = np.where(high > 0, 32 - bit_length(high), 64 - bit_length(low))
+        ranks = np.minimum(leading_zeros, 64 - self.precision) + 1
+        np.maximum.at(self.registers, index, ranks.astype(np.uint8))
+
+    def keep_hashes(self, hashes):
+        if self.hashes is None or hashes is None:
+            self.hashes = None
+            return
+        # A sort and a neighbour comparison; np.unique is far slower on uint64.
+        merged = np.sort(np.concatenate([self.hashes, hashes]))
+        self.hashes = merged[np.concatenate([[True], merged[1:] != merged[:-1]])]
+        if len(self.hashes) > len(self.registers):
+            self.hashes = None
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        self.keep_hashes(other.hashes)
+        return self
+
+    def is_exact(self):
+        return self.hashes is not None
+
+    def estimate(self):
+        if self.is_exact():
+            return len(self.hashes)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros > 0:
+            # Linear counting is more accurate while registers are still empty.
+            return m * np.log(m / zeros)
+        return raw
+
+    def relative_error(self):
+        return 0.0 if self.is_exact() else NORMAL_Z * 1.04 / np.sqrt(len(self.registers))
+
+class QuantileSketch:
+    # A KLL-style sketch: level h holds items of weight 2**h, and a level
+    # past k items is sorted and every other item, from a random offset,
+    # moves up a level. A compaction at level h moves any rank by at most 2**h
+    # with mean zero, so the rank error follows from the compactions made.
+    def __init__(self, k=None, seed=None):
+        self.k = k or Config.SKETCH_QUANTILE_K
+        self.rng = np.random.default_rng(Config.SKETCH_SEED if seed is None else seed)
+        self.levels = []
+        self.count = 0
+        self.squared_error = 0.0
+        self.max_rank_error = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.add(0, values)
+        self.compress()
+
+    def update_counts(self, values, counts):
+        # A value goes in once per set bit of its count, at that bit's level,
+        # so it weighs exactly its count and no rank error is added.
+        values = np.asarray(values, dtype=np.float64)
+        counts = np.asarray(counts, dtype=np.int64)
+        keep = ~np.isnan(values) & (counts > 0)
+        values, counts = values[keep], counts[keep]
+        self.count += int(counts.sum())
+        level = 0
+        while len(counts):
+            odd = (counts & 1).astype(bool)
+            if odd.any():
+                self.add(level, values[odd])
+            counts >>= 1
+            values, counts = values[counts > 0], counts[counts > 0]
+            level += 1
+        self.compress()
+
+    def add(self, level, values):
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0))
+        self.levels[level] = np.concatenate([self.levels[level], values])
+
+    def compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.k:
+                items = np.sort(items)
+                # An odd item out stays behind at full weight.
+                even = len(items) - len(items) % 2
+                self.add(level + 1, items[self.rng.integers(2):even:2])
+                self.levels[level] = items[even:]
+                self.squared_error += 4.0 ** level
+                self.max_rank_error += 2 ** level
+            level += 1
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            self.add(level, items)
+        self.count += other.count
+        self.squared_error += other.squared_error
+        self.max_rank_error += other.max_rank_error
+        self.compress()
+        return self
+
+    def weighted_values(self):
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        return values, weights
+
+    def quantiles(self, qs):
+        if self.count == 0:
+            return [np.nan for _ in qs]
+        return weighted_quantiles(*self.weighted_values(), qs)
+
+    def rank_error(self):
+        # Fraction of the rows a reported quantile's rank can be off by.
+        if self.count == 0:
+            return 0.0
+        return min(HOEFFDING_FACTOR * np.sqrt(self.squared_error), self.max_rank_error) / self.count
+
+def weighted_quantiles(values, weights, qs):
+    order = np.argsort(values, kind='stable')
+    values, cumulative = values[order], np.cumsum(weights[order])
+    positions = np.searchsorted(cumulative, np.asarray(qs) * (cumulative[-1] - 1), side='right')
+    return values[np.minimum(positions, len(values) - 1)].tolist()
+
+class CountMinSketch:
+    def __init__(self, width=None, depth=None):
+        self.width = width or Config.SKETCH_CMS_WIDTH
+        self.depth = depth or Config.SKETCH_CMS_DEPTH
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    def columns(self, hashes):
+        # Row i uses h1 + i * h2 (Kirsch and Mitzenmacher), both halves of one hash.
+        first = hashes & np.uint64(0xFFFFFFFF)
+        second = hashes >> np.uint64(32)
+        return [((first + np.uint64(row) * second) % np.uint64(self.width)).astype(np.int64) for row in range(self.depth)]
+
+    def update(self, hashes, counts):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        counts = np.asarray(counts, dtype=np.int64)
+        for row, columns in enumerate(self.columns(hashes)):
+            np.add.at(self.table[row], columns, counts)
+        self.total += int(counts.sum())
+
+    def estimate(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        return np.min([self.table[row][columns] for row, columns in enumerate(self.columns(hashes))], axis=0)
+
+    def merge(self, other):
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def count_error(self):
+        # Counts are never under-estimated, and over-estimated by at most
+        # e / width of the total with probability 1 - e**-depth.
+        return int(np.ceil(np.e / self.width * self.total))
+
+class TopValues:
+    # Count-min counts for the values that led any chunk. A value frequent
+    # overall but never among a chunk's leaders can be missed.
+    def __init__(self, capacity=None):
+        self.capacity = capacity or Config.SKETCH_TOP_K * 10
+        self.counts = CountMinSketch()
+        self.candidates = {}
+
+    def update(self, uniques, hashes, counts):
+        self.counts.update(hashes, counts)
+        for i in np.argsort(-counts, kind='stable')[:self.capacity]:
+            self.candidates[uniques[i]] = hashes[i]
+        self.prune()
+
+    def merge(self, other):
+        self.counts.merge(other.counts)
+        self.candidates.update(other.candidates)
+        self.prune()
+        return self
+
+    def top(self, k=None):
+        if not self.candidates:
+            return []
+        values = list(self.candidates)
+        estimates = self.counts.estimate(np.array(list(self.candidates.values()), dtype=np.uint64))
+        order = sorted(range(len(values)), key=lambda i: (-estimates[i], str(values[i])))
+        return [(values[i], int(estimates[i])) for i in order[:k or Config.SKETCH_TOP_K]]
+
+    def prune(self):
+        if len(self.candidates) > self.capacity:
+            self.candidates = {value: self.candidates[value] for value, _ in self.top(self.capacity)}
+
+class ReservoirSample:
+    # Every row gets a random key and the rows with the k smallest keys are
+    # kept, which is a uniform sample; merging keeps the k smallest of both.
+    def __init__(self, size, seed=None):
+        self.size = size
+        self.rng = np.random.default_rng(Config.SKETCH_SEED if seed is None else seed)
+        self.rows = None
+        self.keys = np.empty(0)
+
+    def update(self, chunk):
+        keys = self.rng.random(len(chunk))
+        if len(chunk) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            keep.sort()
+            chunk, keys = chunk.iloc[keep], keys[keep]
+        self.add(chunk, keys)
+
+    def add(self, rows, keys):
+        self.rows = rows if self.rows is None else pd.concat([self.rows, rows])
+        self.keys = np.concatenate([self.keys, keys])
+        if len(self.keys) > self.size:
+            keep = np.sort(np.argpartition(self.keys, self.size)[:self.size])
+            self.rows, self.keys = self.rows.iloc[keep], self.keys[keep]
+
+    def merge(self, other):
+        if other.rows is not None:
+            self.add(other.rows, other.keys)
+        return self
+
+    def sample(self):
+        return self.rows if self.rows is not None else pd.DataFrame()
+
+def reservoir_sample(df, size, chunksize=None):
+    chunksize = chunksize or Config.SKETCH_CHUNK_SIZE
+    reservoir = ReservoirSample(size)
+    for start in range(0, len(df), chunksize):
+        reservoir.update(df.iloc[start:start + chunksize])
+    return reservoir.sample().sort_index()
+
+class ColumnSketch:
+    def __init__(self, numeric, text):
+        self.numeric = numeric
+        self.distinct = HyperLogLog()
+        self.quantiles = QuantileSketch() if numeric else None
+        self.top_values = TopValues() if text else None
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+
+    def update(self, series):
+        # Returns one hash per row, for the row hashes of the chunk.
+        if self.numeric:
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+            hashes = hash_values(values)
+            present = ~np.isnan(values)
+            self.distinct.update(hashes[present])
+            self.quantiles.update(values[present])
+            self.add_moments(values[present])
+            return np.where(present, hashes, MISSING_HASH)
+
+        # Only the distinct values of the chunk are hashed.
+        codes, uniques = pd.factorize(series)
+        uniques = np.asarray(uniques, dtype=object)
+        hashes = hash_values(uniques)
+        self.distinct.update(hashes)
+        if self.top_values is not None and len(uniques):
+            self.top_values.update(uniques, hashes, np.bincount(codes[codes >= 0], minlength=len(uniques)))
+        return np.where(codes >= 0, hashes[np.maximum(codes, 0)] if len(uniques) else MISSING_HASH, MISSING_HASH)
+
+    def add_moments(self, values):
+        # Chan et al.'s pairwise update of the mean and squared deviations.
+        if len(values) == 0:
+            return
+        count, mean = len(values), values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        self.combine(count, mean, m2, values.min(), values.max())
+
+    def combine(self, count, mean, m2, minimum, maximum):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = np.nanmin([self.min, minimum])
+        self.max = np.nanmax([self.max, maximum])
+
+    def merge(self, other):
+        self.distinct.merge(other.distinct)
+        if self.quantiles is not None and other.quantiles is not None:
+            self.quantiles.merge(other.quantiles)
+            if other.count:
+                self.combine(other.count, other.mean, other.m2, other.min, other.max)
+        if self.top_values is not None and other.top_values is not None:
+            self.top_values.merge(other.top_values)
+        return self
+
+    def describe(self):
+        q1, median, q3 = self.quantiles.quantiles([0.25, 0.5, 0.75])
+        return {
+            "count": float(self.count),
+            "mean": self.mean if self.count else np.nan,
+            "std": np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan,
+            "min": self.min,
+            "25%": q1,
+            "50%": median,
+            "75%": q3,
+            "max": self.max
+        }
+
+class ProfileSketch:
+    def __init__(self):
+        self.columns = None
+        self.dtypes = None
+        self.rows = 0
+        self.null_counts = None
+        self.memory_by_column = None
+        # Duplicates are a small difference of two large counts, so the row
+        # sketch gets 16 times the registers of a column sketch.
+        self.row_distinct = HyperLogLog(Config.SKETCH_HLL_PRECISION + 4)
+        self.column_sketches = {}
+
+    def update(self, chunk):
+        if self.columns is None:
+            self.columns = chunk.columns.tolist()
+            self.dtypes = chunk.dtypes
+            self.null_counts = pd.Series(0, index=chunk.columns, dtype='int64')
+            self.memory_by_column = pd.Series(0, index=chunk.columns, dtype='int64')
+            numeric = set(chunk.select_dtypes(include=['number']).columns)
+            text = set(chunk.select_dtypes(include=Config.TEXT_DTYPES).columns)
+            self.column_sketches = {col: ColumnSketch(col in numeric, col in text) for col in self.columns}
+
+        self.rows += len(chunk)
+        self.null_counts += chunk.isnull().sum()
+        self.memory_by_column += chunk.memory_usage(index=False, deep=True)
+
+        # Duplicate rows are those beyond the distinct row hashes.
+        row_hashes = np.zeros(len(chunk), dtype=np.uint64)
+        for i, col in enumerate(self.columns):
+            row_hashes = row_hashes * ROW_HASH_MULTIPLIER ^ self.column_sketches[col].update(chunk.iloc[:, i])
+        self.row_distinct.update(row_hashes)
+        return self
+
+    def merge(self, other):
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.__dict__.update(other.__dict__)
+            return self
+        self.rows += other.rows
+        self.null_counts += other.null_counts
+        self.memory_by_column += other.memory_by_column
+        self.row_distinct.merge(other.row_distinct)
+        for col, sketch in self.column_sketches.items():
+            sketch.merge(other.column_sketches[col])
+        return self
+
+    def profile(self):
+        return ApproximateProfile(self)
+
+def sketch_dataset(df, chunksize=None):
+    chunksize = chunksize or Config.SKETCH_CHUNK_SIZE
+    sketch = ProfileSketch()
+    for start in range(0, max(len(df), 1), chunksize):
+        sketch.update(df.iloc[start:start + chunksize])
+    return sketch
+
+class ApproximateProfile:
+    # The attributes of DatasetProfile, with distinct counts, duplicates and
+    # quartiles estimated from a ProfileSketch and their bounds in error_bounds.
+    approximate = True
+
+    def __init__(self, sketch):
+        self.shape = (sketch.rows, len(sketch.columns))
+        self.columns = sketch.columns
+        self.dtypes = sketch.dtypes
+        self.null_counts = sketch.null_counts
+        self.total_nulls = int(self.null_counts.sum())
+
+        distinct_rows = sketch.row_distinct.estimate() if sketch.rows else 0
+        self.duplicate_count = int(max(round(sketch.rows - distinct_rows), 0))
+
+        self.memory_by_column = sketch.memory_by_column
+        self.memory_usage = int(self.memory_by_column.sum())
+
+        column_sketches = sketch.column_sketches
+        self.numeric_columns = [col for col in self.columns if column_sketches[col].numeric]
+        self.categorical_columns = [col for col in self.columns if column_sketches[col].top_values is not None]
+        self.date_columns = [col for col in self.columns if pd.api.types.is_datetime64_any_dtype(self.dtypes[col])]
+
+        # An estimate never exceeds the non-null count it describes.
+        present = sketch.rows - self.null_counts
+        self.nunique = pd.Series({col: int(min(round(column_sketches[col].distinct.estimate()), present[col])) for col in self.columns}, dtype='int64')
+        self.numeric_stats = {col: column_sketches[col].describe() for col in self.numeric_columns}
+        self.top_values = {col: column_sketches[col].top_values.top() for col in self.categorical_columns}
+
+        self.error_bounds = {
+            "confidence": SKETCH_CONFIDENCE,
+            "duplicate_count": int(np.ceil(sketch.row_distinct.relative_error() * distinct_rows)),
+            "nunique": {col: int(np.ceil(column_sketches[col].distinct.relative_error() * self.nunique[col])) for col in self.columns},
+            "quantile_rank": {col: round(column_sketches[col].quantiles.rank_error(), 6) for col in self.numeric_columns},
+            "top_value_count": {col: column_sketches[col].top_values.counts.count_error() for col in self.categorical_columns}
+        }
@@ -0,0 +1,385 @@
+import pandas as pd
+import numpy as np
+from config import Config
+from data_cleaner import apply_action, outlier_columns, top_categories, text_columns, is_text_column, fit_date_patterns, ColumnStats, QUANTILE_STATS, OUTLIER_METHODS, STAT_FUNCTIONS
+from dataset_profile import hash_rows, duplicated_rows
+from sketches import QuantileSketch, TopValues, hash_values, weighted_quantiles
+
+# Chunked execution for CSVs larger than memory: only one chunk and bounded
+# per-column state are held at a time. A plan with k steps that need
+# whole-file statistics reads the file k + 2 times: once to settle the column
+# dtypes, once per such step (its statistics are taken on the output of the
+# steps before it, which must be fitted first) and once to write the output.
+# A step failing on any chunk is disabled and the pass it failed in starts
+# over, which adds one pass per failing step.
+#
+# remove_duplicates is the one step whose state grows with the file: it keeps
+# the 64-bit hash of every row it let through, 8 bytes per output row (about
+# 800 MB for 100M rows). Rows of different chunks are matched on that hash
+# alone, so with n output rows a distinct row is wrongly dropped with
+# probability about n**2 / 2**65 (3e-4 for 100M rows).
+
+# Actions whose result depends on statistics of the whole column. In streaming
+# mode these are fitted over the full file before any chunk is written.
+STREAMING_STATS = {
+    "handle_missing_values": ["median", "mean"],
+    "handle_zero_values": ["median"],
+    "handle_infinite_values": ["median"],
+    "validate_ranges": ["q01", "q99"],
+    "normalize_numeric": ["mean", "std_pop"],
+    "detect_anomalies": ["mean", "std"],
+    "handle_skewness": ["skew"],
+    "handle_multiple_categories": ["top_categories"],
+    "standardize_date_format": ["date_formats", "date_failure_rate"],
+    "fix_data_types": ["all_digits"]
+}
+
+# Row-level outlier actions read the statistics of Config.OUTLIER_METHOD.
+OUTLIER_ACTIONS = ["remove_outliers", "flag_outliers"]
+
+STREAMING_UNSUPPORTED_ACTIONS = [
+    "encode_categorical",
+    "bin_numeric_variables",
+    "remove_irrelevant_columns",
+    "handle_correlated_features"
+]
+
+COUNT_QUANTILES = {**QUANTILE_STATS, "median": 0.5}
+MOMENT_STATS = ["mean", "std", "std_pop", "skew"]
+DATE_STATS = ["date_formats", "date_failure_rate"]
+
+class StreamingStepError(Exception):
+    def __init__(self, index, error):
+        super().__init__(str(error))
+        self.index = index
+        self.error = error
+
+def execute_cleaning_plan_streaming(input_path, output_path, final_plan, domain_info=None, chunksize=None, delimiter=None, encoding=None):
+    chunksize = chunksize or Config.CHUNK_SIZE
+    dtypes = infer_csv_schema(input_path, chunksize, delimiter, encoding)
+    read_chunks = lambda: read_csv_chunks(input_path, dtypes, chunksize, delimiter, encoding)
+
+    steps = []
+    for action in final_plan.get("finalized_actions", []):
+        step = {"action": action["action"], "columns": action["columns"], "stats": None, "error": None}
+        if step["action"] in STREAMING_UNSUPPORTED_ACTIONS:
+            step["error"] = f"{step['action']} is not supported in streaming mode"
+        elif step["action"] in OUTLIER_ACTIONS:
+            step["stats"] = run_pass(steps, lambda: fit_outlier_bounds(read_chunks, steps, step, domain_info))
+            step["columns"] = list(step["stats"].keys())
+        elif step["action"] in STREAMING_STATS:
+            step["stats"] = run_pass(steps, lambda: fit_step_stats(read_chunks, steps, step, domain_info))
+        steps.append(step)
+
+    step_log = run_pass(steps, lambda: write_output(read_chunks, steps, output_path, domain_info))
+
+    execution_log = []
+    for step, entry in zip(steps, step_log):
+        log_entry = {
+            "action": step["action"],
+            "success": step["error"] is None,
+            "rows_before": entry["rows_before"],
+            "rows_after": entry["rows_after"],
+            "columns_after": entry["columns_after"]
+        }
+        if step["error"] is not None:
+            log_entry["error"] = step["error"]
+        rank_errors = {col: values["quantile_rank_error"] for col, values in (step["stats"] or {}).items() if "quantile_rank_error" in values}
+        if rank_errors:
+            log_entry["quantile_rank_error"] = rank_errors
+        execution_log.append(log_entry)
+
+    return execution_log
+
+def run_pass(steps, run):
+    # Every chunk must go through the same steps, so a step that fails on any
+    # chunk is disabled (as a failed in-memory action leaves the frame as it
+    # was) and the pass starts over without it.
+    while True:
+        try:
+            return run()
+        except StreamingStepError as e:
+            steps[e.index]["error"] = str(e.error)
+
+def write_output(read_chunks, steps, output_path, domain_info=None):
+    step_log = [{"rows_before": 0, "rows_after": 0, "columns_after": 0} for _ in steps]
+    state = {}
+    output_columns = None
+
+    for chunk in read_chunks():
+        chunk = transform_chunk(chunk, steps, domain_info, state, step_log)
+
+        if output_columns is None:
+            output_columns = chunk.columns
+            chunk.to_csv(output_path, index=False)
+        else:
+            chunk.reindex(columns=output_columns).to_csv(output_path, mode='a', header=False, index=False)
+    return step_log
+
+def infer_csv_schema(input_path, chunksize=None, delimiter=None, encoding=None):
+    dtypes = {}
+    for chunk in pd.read_csv(input_path, sep=delimiter or ',', encoding=encoding, chunksize=chunksize or Config.CHUNK_SIZE):
+        for col, dtype in chunk.dtypes.items():
+            dtypes[col] = merge_dtypes(dtypes.get(col), dtype)
+    return dtypes
+
+def merge_dtypes(current, new):
+    if current is None or current == new:
+        return new
+
+    numeric_kinds = ['i', 'u', 'f']
+    if current.kind in numeric_kinds and new.kind in numeric_kinds:
+        return np.dtype('float64')
+    return np.dtype('object')
+
+def read_csv_chunks(input_path, dtypes, chunksize, delimiter=None, encoding=None):
+    return pd.read_csv(input_path, sep=delimiter or ',', encoding=encoding, dtype=dtypes, chunksize=chunksize)
+
+def transform_chunk(chunk, steps, domain_info=None, state=None, step_log=None):
+    state = state if state is not None else {}
+
+    for i, step in enumerate(steps):
+        rows_before = chunk.shape[0]
+        if step["error"] is None:
+            try:
+                if step["action"] == "remove_duplicates":
+                    chunk = drop_seen_duplicates(chunk, state.setdefault(i, SeenHashes()), step["columns"])
+                else:
+                    stats = ColumnStats(step["stats"], frozen=True) if step["stats"] is not None else None
+                    chunk = apply_action(chunk, step["action"], step["columns"], domain_info, stats)
+            except Exception as e:
+                raise StreamingStepError(i, e) from e
+
+        if step_log is not None:
+            step_log[i]["rows_before"] += rows_before
+            step_log[i]["rows_after"] += chunk.shape[0]
+            step_log[i]["columns_after"] = chunk.shape[1]
+
+    return chunk
+
+def drop_seen_duplicates(chunk, seen_rows, columns="all"):
+    subset = None
+    if columns != "all":
+        subset = [col for col in columns if col in chunk.columns] or None
+
+    # Rows within a chunk are verified against each other; earlier chunks are
+    # only kept as hashes, so matches across chunks rely on the 64-bit hash.
+    row_hashes = hash_rows(chunk, subset)
+    keep_mask = ~duplicated_rows(chunk, subset, row_hashes).to_numpy() & ~seen_rows.contains(row_hashes.to_numpy())
+    seen_rows.add(row_hashes.to_numpy()[keep_mask])
+    return chunk[keep_mask]
+
+class SeenHashes:
+    # Sorted uint64 runs, each at least twice as long as the next one, so a
+    # lookup searches O(log n) runs and every hash is re-sorted O(log n) times.
+    def __init__(self):
+        self.runs = []
+
+    def contains(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes):
+        run = np.unique(np.asarray(hashes, dtype=np.uint64))
+        while self.runs and len(self.runs[-1]) <= 2 * len(run):
+            run = np.union1d(self.runs.pop(), run)
+        if len(run):
+            self.runs.append(run)
+
+def fit_step_stats(read_chunks, fitted_steps, step, domain_info=None, stat_names=None):
+    stat_names = stat_names or STREAMING_STATS[step["action"]]
+    accumulators = {}
+    state = {}
+
+    for chunk in read_chunks():
+        chunk = transform_chunk(chunk, fitted_steps, domain_info, state)
+        if step["columns"] != "all":
+            columns = [col for col in step["columns"] if col in chunk.columns]
+        elif step["action"] == "standardize_date_format":
+            columns = text_columns(chunk)
+        else:
+            columns = chunk.columns
+
+        for col in columns:
+            series = chunk[col]
+            if step["action"] == "handle_infinite_values" and pd.api.types.is_numeric_dtype(series):
+                series = series.replace([np.inf, -np.inf], np.nan)
+            if col not in accumulators:
+                accumulators[col] = StreamingColumnStats(stat_names)
+            accumulators[col].update(series)
+
+    return {col: accumulator.finalize() for col, accumulator in accumulators.items()}
+
+def fit_outlier_bounds(read_chunks, fitted_steps, step, domain_info=None):
+    # Every column's statistics are fitted on the rows reaching the step in
+    # one pass over the file, as the in-memory engine reads them from its
+    # input. The checked columns are fixed from the first chunk.
+    sample = next(iter(read_chunks()), None)
+    if sample is None:
+        return {}
+    sample = transform_chunk(sample, fitted_steps, domain_info)
+
+    column_step = {"action": step["action"], "columns": outlier_columns(sample, step["columns"]), "stats": None}
+    if not column_step["columns"]:
+        return {}
+    stat_names = OUTLIER_METHODS[Config.OUTLIER_METHOD]["stats"]
+    return fit_step_stats(read_chunks, fitted_steps, column_step, domain_info, stat_names)
+
+class StreamingColumnStats:
+    # Value counts are kept exactly up to Config.STREAMING_EXACT_VALUES
+    # distinct values, so memory stays bounded. Past that a numeric column
+    # moves to a QuantileSketch: quantiles, the median and the MAD are then
+    # off by at most quantile_rank_error (a fraction of the rows) in rank,
+    # with probability SKETCH_CONFIDENCE; the MAD error also carries the
+    # median's. A text column moves to TopValues (count-min estimates), and
+    # date patterns are decided on the values counted before the switch.
+    def __init__(self, stat_names):
+        self.stat_names = stat_names
+        self.needs_counts = any(name in COUNT_QUANTILES or name in ["top_categories", "mad"] + DATE_STATS for name in stat_names)
+        self.needs_moments = any(name in MOMENT_STATS for name in stat_names)
+        self.counts = None
+        self.date_counts = None
+        self.quantiles = None
+        self.top_values = None
+        self.count = 0
+        self.shift = None
+        self.power_sums = np.zeros(3)
+        self.all_digits = True
+
+    def update(self, series):
+        is_numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+        if "all_digits" in self.stat_names and is_text_column(series):
+            self.all_digits = self.all_digits and STAT_FUNCTIONS["all_digits"](series)
+
+        if self.needs_counts:
+            if self.quantiles is not None:
+                self.quantiles.update(series.to_numpy(dtype='float64', na_value=np.nan))
+            elif self.top_values is not None:
+                self.add_top_values(series.value_counts(sort=False))
+            else:
+                counts = series.value_counts(sort=False)
+                self.counts = counts if self.counts is None else pd.concat([self.counts, counts]).groupby(level=0, sort=False).sum()
+                if len(self.counts) > Config.STREAMING_EXACT_VALUES:
+                    self.bound_counts(is_numeric)
+
+        if self.needs_moments and is_numeric:
+            values = series.dropna().to_numpy(dtype='float64')
+            if len(values) == 0:
+                return
+            if self.shift is None:
+                self.shift = values[0]
+            deltas = values - self.shift
+            self.count += len(deltas)
+            self.power_sums += [deltas.sum(), (deltas ** 2).sum(), (deltas ** 3).sum()]
+
+    def bound_counts(self, is_numeric):
+        if is_numeric:
+            self.quantiles = QuantileSketch()
+            self.quantiles.update_counts(self.counts.index.to_numpy(dtype='float64'), self.counts.to_numpy())
+        else:
+            self.top_values = TopValues()
+            self.add_top_values(self.counts)
+        if any(name in DATE_STATS for name in self.stat_names):
+            self.date_counts = self.counts
+        self.counts = None
+
+    def add_top_values(self, counts):
+        counts = counts[counts > 0]
+        if len(counts):
+            uniques = np.asarray(counts.index, dtype=object)
+            self.top_values.update(uniques, hash_values(uniques), counts.to_numpy())
+
+    def finalize(self):
+        stats = {}
+        date_stats = None
+        for name in self.stat_names:
+            if name in COUNT_QUANTILES:
+                stats[name] = self.quantile(COUNT_QUANTILES[name])
+            elif name == "top_categories":
+                stats[name] = self.top_categories()
+            elif name == "mad":
+                stats[name] = self.mad()
+            elif name == "all_digits":
+                stats[name] = self.all_digits
+            elif name in DATE_STATS:
+                date_stats = date_stats or self.date_stats()
+                stats[name] = date_stats[DATE_STATS.index(name)]
+            else:
+                stats[name] = self.moment_stat(name)
+        if self.quantiles is not None:
+            stats["quantile_rank_error"] = self.quantiles.rank_error()
+        return stats
+
+    def quantile(self, q):
+        if self.quantiles is not None:
+            return self.quantiles.quantiles([q])[0]
+        return quantile_from_counts(self.counts, q)
+
+    def mad(self):
+        if self.quantiles is None:
+            return mad_from_counts(self.counts)
+        if self.quantiles.count == 0:
+            return np.nan
+        values, weights = self.quantiles.weighted_values()
+        return weighted_quantiles(np.abs(values - self.quantile(0.5)), weights, [0.5])[0]
+
+    def top_categories(self):
+        if self.top_values is not None:
+            return pd.Index([value for value, _ in self.top_values.top(10)], dtype=object)
+        return top_categories(self.counts if self.counts is not None else pd.Series(dtype='int64'))
+
+    def date_stats(self):
+        counts = self.date_counts if self.date_counts is not None else self.counts
+        if counts is None or counts.empty:
+            return [], None
+        return fit_date_patterns(counts.index, counts.to_numpy())
+
+    def moment_stat(self, name):
+        n = self.count
+        if n == 0:
+            return np.nan
+
+        m1, m2, m3 = self.power_sums / n
+        var_pop = max(m2 - m1 ** 2, 0.0)
+
+        if name == "mean":
+            return self.shift + m1
+        if name == "std_pop":
+            return np.sqrt(var_pop)
+        if name == "std":
+            return np.sqrt(var_pop * n / (n - 1)) if n > 1 else np.nan
+
+        if n < 3:
+            return np.nan
+        if var_pop == 0:
+            return 0.0
+        central_m3 = m3 - 3 * m1 * m2 + 2 * m1 ** 3
+        return np.sqrt(n * (n - 1)) / (n - 2) * central_m3 / var_pop ** 1.5
+
+def mad_from_counts(counts):
+    # The absolute deviations from the median keep the counts of the values
+    # they come from, so their median is read off the same way.
+    median = quantile_from_counts(counts, 0.5)
+    if np.isnan(median):
+        return np.nan
+    deviations = pd.Series(counts.to_numpy(), index=np.abs(counts.index.to_numpy(dtype='float64') - median))
+    return quantile_from_counts(deviations.groupby(level=0).sum(), 0.5)
+
+def quantile_from_counts(counts, q):
+    if counts is None or counts.empty or not pd.api.types.is_numeric_dtype(counts.index):
+        return np.nan
+
+    counts = counts.sort_index()
+    values = counts.index.to_numpy(dtype='float64')
+    cumulative = counts.to_numpy().cumsum()
+
+    position = (cumulative[-1] - 1) * q
+    lower = int(np.floor(position))
+    upper = int(np.ceil(position))
+    lower_value = values[np.searchsorted(cumulative, lower, side='right')]
+    upper_value = values[np.searchsorted(cumulative, upper, side='right')]
+    return lower_value + (upper_value - lower_value) * (position - lower)
@@ -0,0 +1,43 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Plans and data shared by the tests and benchmarks/check_backend_parity.py.
+
+DEFAULT_DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datasets", "dirty_cafe_sales.csv")
+
+# Each plan exercises a group of translations; the last ones mix in actions
+# without a translation so the pandas fallback between segments is run too.
+PLANS = {
+    "fills": ["handle_missing_values"],
+    "strings": ["remove_whitespace", "handle_inconsistent_casing", "remove_special_characters", "standardize_format", "standardize_address_format", "standardize_names", "handle_text_encoding"],
+    "numeric": ["handle_infinite_values", "handle_zero_values", "handle_negative_values", "normalize_numeric"],
+    "filters": ["remove_duplicates", "remove_outliers"],
+    "encoding": ["remove_whitespace", "encode_categorical"],
+    "renames": ["rename_columns", "remove_whitespace"],
+    "fallback": ["remove_whitespace", "fix_data_types", "handle_missing_values", "handle_abbreviations", "normalize_numeric"],
+    "full": ["remove_whitespace", "handle_missing_values", "handle_infinite_values", "remove_duplicates", "standardize_date_format", "remove_outliers", "normalize_numeric", "encode_categorical"]
+}
+
+def synthetic_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    price = rng.normal(50, 20, rows)
+    price[rng.random(rows) < 0.05] = np.nan
+    price[rng.random(rows) < 0.01] = np.inf
+    quantity = rng.integers(-3, 10, rows).astype(float)
+    quantity[rng.random(rows) < 0.05] = np.nan
+    score = rng.normal(3, 1, rows)
+    score[rng.random(rows) < 0.1] = 0
+    text = lambda values: pd.array(rng.choice(values, rows), dtype="string[pyarrow]")
+    return pd.DataFrame({
+        "price": price,
+        "Quantity": quantity,
+        "rating score": score,
+        "customer name": text(["  alice smith", "BOB  jones ", "o'neil mc2x", "Émile été", None]),
+        "order-status": text(["new", "old", "n/a", None]),
+        "email": text(["A@X.com ", "b@y.org", None]),
+        "profit": rng.normal(0, 1, rows)
+    })
+
+def plan_for(actions, columns="all"):
+    return {"finalized_actions": [{"action": action, "columns": columns} for action in actions]}
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+from artifacts import artifact_from_json, artifact_to_json
+from data_cleaner import fit_cleaning_plan, transform_cleaning_plan
+from tests.cleaning_cases import plan_for
+
+# A column that needs no filling when the plan is fitted must still be filled
+# with its fitted value when a later batch has gaps in it.
+
+@pytest.mark.parametrize("action, gap", [("handle_missing_values", np.nan), ("handle_zero_values", 0.0), ("handle_infinite_values", np.inf)])
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_batch_gaps_use_fitted_fill_value(action, gap, max_workers):
+    reference = pd.DataFrame({"age": [10.0, 20.0, 30.0, 40.0], "rating": [1.0, 2.0, 3.0, 6.0]})
+    _, _, artifact = fit_cleaning_plan(reference, plan_for([action], ["age", "rating"]), max_workers=1)
+    artifact = artifact_from_json(artifact_to_json(artifact))
+
+    batch = pd.DataFrame({"age": [gap, 1000.0, 1000.0], "rating": [gap, 1000.0, 1000.0]})
+    cleaned_df, execution_log = transform_cleaning_plan(batch, artifact, max_workers=max_workers)
+
+    assert execution_log[0]["success"]
+    assert cleaned_df["age"].tolist() == [25.0, 1000.0, 1000.0]
+    expected_rating = 3.0 if action == "handle_missing_values" else 2.5
+    assert cleaned_df["rating"].tolist() == [expected_rating, 1000.0, 1000.0]
@@ -0,0 +1,40 @@
+import os
+import pytest
+from utils import load_csv
+from polars_backend import compare_backends
+from tests.cleaning_cases import DEFAULT_DATASET, PLANS, plan_for, synthetic_frame
+
+# The optional backends must give the values pandas gives on every plan of the
+# parity script; each backend is skipped when its package is not installed.
+
+DATASETS = {
+    "csv": lambda: load_csv(DEFAULT_DATASET),
+    "synthetic": lambda: synthetic_frame(5000)
+}
+
+@pytest.fixture(scope="module", params=list(DATASETS))
+def dataset(request):
+    if request.param == "csv" and not os.path.exists(DEFAULT_DATASET):
+        pytest.skip(f"{DEFAULT_DATASET} is not available")
+    return DATASETS[request.param]()
+
+@pytest.mark.parametrize("plan_name", list(PLANS))
+def test_polars_matches_pandas(dataset, plan_name):
+    pytest.importorskip("polars")
+    report = compare_backends(dataset, plan_for(PLANS[plan_name]), {"domain": "sales"}, backend="polars")
+    assert report["equal"], report
+
+@pytest.mark.parametrize("plan_name", list(PLANS))
+def test_duckdb_matches_pandas(dataset, plan_name):
+    pytest.importorskip("duckdb")
+    report = compare_backends(dataset, plan_for(PLANS[plan_name]), {"domain": "sales"}, backend="duckdb")
+    assert report["equal"], report
+
+@pytest.mark.parametrize("backend", ["polars", "duckdb"])
+def test_backends_reject_pandas_only_options(backend):
+    from data_cleaner import execute_cleaning_plan
+    df = synthetic_frame(100)
+    with pytest.raises(ValueError):
+        execute_cleaning_plan(df, plan_for(["remove_whitespace"]), backend=backend, profile=True)
+    with pytest.raises(ValueError):
+        execute_cleaning_plan(df, plan_for(["remove_whitespace"]), backend=backend, optimize=True)
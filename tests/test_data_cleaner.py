@@ -0,0 +1,32 @@
+import pandas as pd
+from data_cleaner import ACTION_REGISTRY, execute_cleaning_plan
+from tests.cleaning_cases import plan_for
+
+def test_fused_segment_falls_back_and_logs(monkeypatch):
+    def failing_kernel(col, domain_info=None):
+        def kernel(value):
+            if value == "bad":
+                raise ValueError("unexpected value")
+            return value
+        return kernel
+
+    monkeypatch.setitem(ACTION_REGISTRY, "remove_whitespace", {**ACTION_REGISTRY["remove_whitespace"], "string_kernel": failing_kernel})
+    df = pd.DataFrame({"name": [" a ", "bad"], "city": [" x", "y "]})
+    _, execution_log = execute_cleaning_plan(df, plan_for(["remove_whitespace", "handle_inconsistent_casing"]), max_workers=1, optimize=False)
+
+    assert execution_log[0]["fused_fallback"] == "ValueError: unexpected value"
+    assert [entry["action"] for entry in execution_log] == ["remove_whitespace", "handle_inconsistent_casing"]
+    assert "fused_fallback" not in execution_log[1]
+
+def test_flag_outliers_without_numeric_columns_leaves_frame_unchanged():
+    df = pd.DataFrame({"name": ["a", "b", "c"]})
+    cleaned_df, execution_log = execute_cleaning_plan(df, plan_for(["flag_outliers"]), max_workers=1, optimize=False)
+
+    assert execution_log[0]["success"]
+    assert cleaned_df.columns.tolist() == ["name"]
+
+def test_infinite_values_are_filled_under_copy_on_write():
+    df = pd.DataFrame({"value": [1.0, float("inf"), 3.0]})
+    with pd.option_context("mode.copy_on_write", True):
+        cleaned_df, _ = execute_cleaning_plan(df, plan_for(["handle_infinite_values"]), max_workers=1, optimize=False)
+    assert cleaned_df["value"].tolist() == [1.0, 2.0, 3.0]
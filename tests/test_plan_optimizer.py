@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+from data_cleaner import execute_cleaning_plan
+from plan_optimizer import optimize_plan
+
+# The optimized plan must clean a frame exactly as the plan as written does.
+
+def run_plan(df, plan):
+    cleaned_df, _ = execute_cleaning_plan(df.copy(), plan, max_workers=1, optimize=False)
+    return cleaned_df.reset_index(drop=True)
+
+@pytest.mark.parametrize("with_frame", [False, True])
+def test_duplicates_on_missing_columns_are_not_hoisted(with_frame):
+    df = pd.DataFrame({"Name": ["Alice ", "alice", "Bob"]})
+    plan = {"finalized_actions": [
+        {"action": "handle_inconsistent_casing", "columns": ["Name"]},
+        {"action": "remove_whitespace", "columns": ["Name"]},
+        {"action": "remove_duplicates", "columns": ["Nme"]}
+    ]}
+    optimized_plan, _ = optimize_plan(plan, df if with_frame else None)
+
+    assert [action["action"] for action in optimized_plan["finalized_actions"]] == [action["action"] for action in plan["finalized_actions"]]
+    assert len(run_plan(df, plan)) == 2
+    pd.testing.assert_frame_equal(run_plan(df, optimized_plan), run_plan(df, plan))
+
+def test_duplicates_on_existing_columns_are_hoisted():
+    plan = {"finalized_actions": [
+        {"action": "remove_whitespace", "columns": ["Name"]},
+        {"action": "remove_duplicates", "columns": ["Id"]}
+    ]}
+    df = pd.DataFrame({"Id": [1, 1, 2], "Name": [" a", "b ", "c"]})
+    optimized_plan, _ = optimize_plan(plan, df)
+
+    assert [action["action"] for action in optimized_plan["finalized_actions"]] == ["remove_duplicates", "remove_whitespace"]
+    pd.testing.assert_frame_equal(run_plan(df, optimized_plan), run_plan(df, plan))
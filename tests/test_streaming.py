@@ -0,0 +1,86 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from config import Config
+from data_cleaner import ACTION_REGISTRY, execute_cleaning_plan
+from streaming_cleaner import StreamingColumnStats, execute_cleaning_plan_streaming
+from tests.cleaning_cases import DEFAULT_DATASET, plan_for
+
+# Chunked runs must clean a file the way one in-memory run does, with every
+# chunk going through the same fitted decisions.
+
+@pytest.fixture
+def cafe_sales():
+    if not os.path.exists(DEFAULT_DATASET):
+        pytest.skip(f"{DEFAULT_DATASET} is not available")
+    return DEFAULT_DATASET
+
+def test_streaming_matches_in_memory(cafe_sales, tmp_path):
+    plan = plan_for(["remove_whitespace", "standardize_date_format", "handle_missing_values"])
+    expected, _ = execute_cleaning_plan(pd.read_csv(cafe_sales), plan, {"domain": "sales"}, max_workers=1, optimize=False)
+
+    output_path = str(tmp_path / "cleaned.csv")
+    result_path, execution_log = execute_cleaning_plan(cafe_sales, plan, {"domain": "sales"}, backend="streaming", output_path=output_path)
+    streamed = pd.read_csv(result_path)
+
+    assert all(entry["success"] for entry in execution_log)
+    pd.testing.assert_series_equal(pd.to_datetime(streamed["Transaction Date"]), pd.to_datetime(expected["Transaction Date"]))
+    for col in expected.columns.drop("Transaction Date"):
+        assert streamed[col].astype(str).tolist() == expected[col].astype(str).tolist(), col
+
+def test_failing_step_runs_on_no_chunk(cafe_sales, tmp_path, monkeypatch):
+    def upper_items_before_row_5000(df):
+        if df.index.max() >= 5000:
+            raise ValueError("late failure")
+        df["Item"] = df["Item"].str.upper()
+        return df
+
+    monkeypatch.setitem(ACTION_REGISTRY, "upper_items", {"function": upper_items_before_row_5000, "params": [], "select": None, "effect": "in_place", "string_kernel": None})
+    output_path = str(tmp_path / "cleaned.csv")
+    execution_log = execute_cleaning_plan_streaming(cafe_sales, output_path, plan_for(["upper_items", "remove_whitespace"]), chunksize=1000)
+
+    assert [entry["success"] for entry in execution_log] == [False, True]
+    assert execution_log[0]["error"] == "late failure"
+    assert pd.read_csv(output_path)["Item"].tolist() == pd.read_csv(cafe_sales)["Item"].tolist()
+
+def test_column_stats_stay_bounded(monkeypatch):
+    monkeypatch.setattr(Config, "STREAMING_EXACT_VALUES", 1000)
+    values = np.random.default_rng(0).normal(size=50000)
+    accumulator = StreamingColumnStats(["median", "q99", "mad"])
+    for chunk in np.array_split(values, 10):
+        accumulator.update(pd.Series(chunk))
+
+    stats = accumulator.finalize()
+    assert accumulator.counts is None
+    assert 0 < stats["quantile_rank_error"] < 0.01
+    for name, q in [("median", 0.5), ("q99", 0.99)]:
+        rank = (values < stats[name]).mean()
+        assert abs(rank - q) <= stats["quantile_rank_error"] + 1 / len(values)
+    exact_mad = np.median(np.abs(values - np.median(values)))
+    assert abs(stats["mad"] - exact_mad) < 0.02
+
+def test_type_conversion_is_decided_over_the_whole_file(tmp_path):
+    input_path = str(tmp_path / "codes.csv")
+    pd.DataFrame({"code": [f"{i:03d}" for i in range(5)] + [f"A{i}" for i in range(5)], "value": range(10)}).to_csv(input_path, index=False)
+    plan = plan_for(["fix_data_types"])
+    expected, _ = execute_cleaning_plan(pd.read_csv(input_path, dtype={"code": str}), plan, max_workers=1, optimize=False)
+
+    output_path = str(tmp_path / "cleaned.csv")
+    execution_log = execute_cleaning_plan_streaming(input_path, output_path, plan, chunksize=5)
+
+    assert execution_log[0]["success"]
+    assert pd.read_csv(output_path, dtype={"code": str})["code"].tolist() == expected["code"].tolist() == ["000", "001", "002", "003", "004", "A0", "A1", "A2", "A3", "A4"]
+
+def test_duplicates_across_chunks_are_dropped(tmp_path):
+    # Rows 0-11 repeat in later chunks (chunksize 4), some twice; row 3 also
+    # repeats within its own chunk.
+    values = list(range(12)) + [3] + [0, 5, 11, 5, 7] + list(range(12, 20))
+    input_path = str(tmp_path / "duplicates.csv")
+    pd.DataFrame({"id": values, "name": [f"n{value}" for value in values]}).to_csv(input_path, index=False)
+
+    output_path = str(tmp_path / "cleaned.csv")
+    execution_log = execute_cleaning_plan_streaming(input_path, output_path, plan_for(["remove_duplicates"]), chunksize=4)
+
+    assert execution_log[0]["rows_before"] - execution_log[0]["rows_after"] == 6
+    assert pd.read_csv(output_path)["id"].tolist() == list(range(20))
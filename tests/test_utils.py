@@ -0,0 +1,12 @@
+import pandas as pd
+import pytest
+from exporters import EXPORTERS
+from utils import generate_download_link
+
+@pytest.mark.parametrize("export_format", list(EXPORTERS))
+def test_download_data_is_accepted_by_streamlit(export_format):
+    download_data_util = pytest.importorskip("streamlit.runtime.download_data_util")
+    df = pd.DataFrame({"item": ["Coffee", "Cake", None], "price": [2.0, 3.0, 1.5]})
+    data = generate_download_link(df, export_format)
+    data_as_bytes, _ = download_data_util.convert_data_to_bytes_and_infer_mime(data, ValueError("Invalid binary data format"))
+    assert len(data_as_bytes) > 0
@@ -1,41 +1,234 @@
 import pandas as pd
 import streamlit as st
 import io
+import os
+import csv
+import random
+import tempfile
 import chardet
+from config import Config
+from dataset_profile import profile_dataset
+from exporters import export_dataframe
+
+# The null markers read_csv recognises by default, so both readers agree on
+# which cells are missing.
+CSV_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+]
+
+def load_csv(file, engine=None, string_dtype=None, delimiter=None, encoding=None):
+    engine = engine or Config.CSV_ENGINE
+    string_dtype = string_dtype or Config.STRING_DTYPE
+    delimiter = delimiter or ','
+    encoding = encoding or 'utf-8'
+    
+    if engine == "pyarrow":
+        try:
+            return read_csv_arrow(file, string_dtype, delimiter, encoding)
+        except ImportError:
+            if hasattr(file, 'seek'):
+                file.seek(0)
+    return pd.read_csv(file, sep=delimiter, encoding=encoding)
+
+def read_csv_arrow(file, string_dtype=None, delimiter=',', encoding='utf-8'):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pa_csv
+    
+    read_options = pa_csv.ReadOptions(encoding=encoding)
+    parse_options = pa_csv.ParseOptions(delimiter=delimiter)
+    convert_options = pa_csv.ConvertOptions(null_values=CSV_NA_VALUES, strings_can_be_null=True)
+    table = pa_csv.read_csv(file, read_options=read_options, parse_options=parse_options, convert_options=convert_options)
+    
+    # Arrow infers dates and timestamps, while the rest of the app expects them
+    # as text until an action parses them; all-null columns become float64 NaN.
+    for i, field in enumerate(table.schema):
+        if pa.types.is_temporal(field.type):
+            table = table.set_column(i, field.name, pc.cast(table.column(i), pa.string()))
+        elif pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    
+    types_mapper = None
+    if string_dtype:
+        pandas_string_dtype = pd.api.types.pandas_dtype(string_dtype)
+        types_mapper = {pa.string(): pandas_string_dtype, pa.large_string(): pandas_string_dtype}.get
+    return table.to_pandas(types_mapper=types_mapper)
 
 def validate_csv(file):
+    report = inspect_csv(file)
+    return report["valid"], report["message"]
+
+def inspect_csv(file, max_file_size=None):
+    # Only bounded samples are read: the head, a few interior blocks and the
+    # tail. Encoding, dialect and field counts are checked on those samples,
+    # so validation costs about the same for a 1 MB and a 200 MB file.
+    report = {"valid": False, "message": "", "encoding": None, "delimiter": ",", "quotechar": '"', "columns": 0}
+    
     if file is None:
-        return False, "No file uploaded"
+        report["message"] = "No file uploaded"
+        return report
     
-    if not file.name.lower().endswith('.csv'):
-        return False, "File must be a CSV"
+    name = os.fspath(file) if is_path(file) else getattr(file, 'name', '')
+    if not name.lower().endswith('.csv'):
+        report["message"] = "File must be a CSV"
+        return report
     
     try:
-        file_size = len(file.getvalue())
-        if file_size > 200 * 1024 * 1024:
-            return False, "File size exceeds 200MB limit"
+        handle = open(file, 'rb') if is_path(file) else file
+        try:
+            file_size = get_file_size(handle)
+            max_file_size = max_file_size or Config.MAX_FILE_SIZE
+            if file_size > max_file_size:
+                report["message"] = f"File size exceeds {max_file_size // (1024 * 1024)}MB limit"
+                return report
+            samples = read_csv_samples(handle, file_size)
+        finally:
+            if handle is not file:
+                handle.close()
+            else:
+                file.seek(0)
+        
+        if not samples:
+            report["message"] = "File is empty"
+            return report
+        
+        if any(b'\0' in sample for _, sample in samples):
+            report["message"] = "File appears to be binary or corrupted"
+            return report
+        
+        encoding = detect_sample_encoding(samples)
+        if encoding is None:
+            report["message"] = "Could not detect the file encoding"
+            return report
+        texts = [(offset, sample.decode(encoding, errors='replace')) for offset, sample in samples]
         
-        raw_data = file.getvalue()
-        encoding = chardet.detect(raw_data)['encoding']
+        dialect = sniff_dialect(texts[0][1])
+        report.update({"encoding": encoding, "delimiter": dialect.delimiter, "quotechar": dialect.quotechar})
         
-        file.seek(0)
-        sample_data = file.read(1024)
-        file.seek(0)
+        header = next(csv.reader(io.StringIO(texts[0][1]), dialect), None)
+        if not header:
+            report["message"] = "File is empty"
+            return report
+        report["columns"] = len(header)
         
-        if b'\0' in sample_data:
-            return False, "File appears to be binary or corrupted"
+        field_count_error = check_field_counts(texts, dialect, len(header))
+        if field_count_error:
+            report["message"] = field_count_error
+            return report
         
-        return True, "CSV validation successful"
+        report["valid"] = True
+        report["message"] = "CSV validation successful"
+        return report
     
     except Exception as e:
-        return False, f"Error validating CSV: {str(e)}"
+        report["message"] = f"Error validating CSV: {str(e)}"
+        return report
 
-def generate_download_link(df):
-    csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False)
-    csv_str = csv_buffer.getvalue()
+def is_path(file):
+    return isinstance(file, (str, os.PathLike))
+
+def get_file_size(handle):
+    size = getattr(handle, 'size', None)
+    if size is not None:
+        return size
+    position = handle.tell()
+    handle.seek(0, os.SEEK_END)
+    size = handle.tell()
+    handle.seek(position)
+    return size
+
+def read_csv_samples(handle, file_size):
+    sample_bytes = Config.VALIDATION_SAMPLE_BYTES
+    offsets = [0]
+    
+    if file_size > sample_bytes:
+        # Interior offsets are seeded by the file size so the same file is
+        # always validated against the same blocks.
+        interior_range = file_size - 2 * sample_bytes
+        if interior_range > 0:
+            rng = random.Random(file_size)
+            offsets += sorted(sample_bytes + rng.randrange(interior_range) for _ in range(Config.VALIDATION_INTERIOR_SAMPLES))
+        offsets.append(max(file_size - sample_bytes, sample_bytes))
     
-    return csv_str
+    samples = []
+    for offset in offsets:
+        handle.seek(offset)
+        block = handle.read(sample_bytes)
+        
+        # Blocks are trimmed to whole lines: the partial first line of a block
+        # that starts mid-file and the partial last line of one that ends early.
+        if offset > 0:
+            block = block[block.find(b'\n') + 1:] if b'\n' in block else b''
+        if offset + sample_bytes < file_size and b'\n' in block:
+            block = block[:block.rfind(b'\n') + 1]
+        if block:
+            samples.append((offset, block))
+    return samples
+
+def detect_sample_encoding(samples):
+    try:
+        for _, sample in samples:
+            sample.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    detector = chardet.UniversalDetector()
+    for _, sample in samples:
+        detector.feed(sample)
+        if detector.done:
+            break
+    detector.close()
+    return detector.result['encoding']
+
+def sniff_dialect(text):
+    try:
+        return csv.Sniffer().sniff(text[:Config.VALIDATION_SAMPLE_BYTES], delimiters=",;\t|")
+    except csv.Error:
+        # A single column file has no delimiter for the sniffer to find.
+        return csv.excel
+
+def check_field_counts(texts, dialect, expected):
+    for i, (offset, text) in enumerate(texts):
+        lines = text.splitlines(keepends=True)
+        
+        # An interior block may start inside a quoted field that spans lines,
+        # so it is re-read from the next few line starts before it is rejected.
+        attempts = 1 if i == 0 else min(Config.VALIDATION_MAX_RESYNC, len(lines))
+        is_last_block = i == len(texts) - 1
+        error = None
+        for skip in range(attempts):
+            error = first_field_count_error(lines[skip:], dialect, expected, offset if i > 0 else None, is_last_block)
+            if error is None:
+                break
+        if error:
+            return error
+    return None
+
+def first_field_count_error(lines, dialect, expected, offset=None, check_last_row=True):
+    rows = list(csv.reader(lines, dialect))
+    if not check_last_row:
+        # The last row of a block that stops mid-file may be cut inside a field.
+        rows = rows[:-1]
+    
+    for line_number, row in enumerate(rows, start=1):
+        if not row:
+            continue
+        if len(row) != expected:
+            location = f"near byte {offset}" if offset is not None else f"on line {line_number}"
+            return f"Inconsistent number of fields {location}: found {len(row)}, expected {expected}"
+    return None
+
+def generate_download_link(df, export_format=None):
+    # The frame is written in chunks to an anonymous temporary file instead of
+    # rendering the whole export as one string. st.download_button only takes
+    # str, bytes, BytesIO or BufferedReader and reads them whole anyway, so
+    # the finished file is handed over as bytes.
+    with tempfile.TemporaryFile() as export_file:
+        export_dataframe(df, export_format, export_file)
+        export_file.seek(0)
+        return export_file.read()
 
 def format_actions_display(actions):
     formatted_actions = []
@@ -53,23 +246,26 @@ def format_actions_display(actions):
     
     return formatted_actions
 
-def calculate_metrics(before_df, after_df):
+def calculate_metrics(before_df, after_df, before_profile=None, after_profile=None):
+    before = before_profile or profile_dataset(before_df)
+    after = after_profile or profile_dataset(after_df)
+    
     metrics = {
-        "original_rows": before_df.shape[0],
-        "cleaned_rows": after_df.shape[0],
-        "original_columns": before_df.shape[1],
-        "cleaned_columns": after_df.shape[1],
-        "rows_removed": before_df.shape[0] - after_df.shape[0],
-        "columns_removed": before_df.shape[1] - after_df.shape[1],
-        "original_memory_usage": before_df.memory_usage(deep=True).sum(),
-        "cleaned_memory_usage": after_df.memory_usage(deep=True).sum(),
-        "memory_reduction": before_df.memory_usage(deep=True).sum() - after_df.memory_usage(deep=True).sum(),
-        "original_null_count": before_df.isnull().sum().sum(),
-        "cleaned_null_count": after_df.isnull().sum().sum(),
-        "null_reduction": before_df.isnull().sum().sum() - after_df.isnull().sum().sum(),
-        "original_duplicates": before_df.duplicated().sum(),
-        "cleaned_duplicates": after_df.duplicated().sum(),
-        "duplicates_removed": before_df.duplicated().sum() - after_df.duplicated().sum()
+        "original_rows": before.shape[0],
+        "cleaned_rows": after.shape[0],
+        "original_columns": before.shape[1],
+        "cleaned_columns": after.shape[1],
+        "rows_removed": before.shape[0] - after.shape[0],
+        "columns_removed": before.shape[1] - after.shape[1],
+        "original_memory_usage": before.memory_usage,
+        "cleaned_memory_usage": after.memory_usage,
+        "memory_reduction": before.memory_usage - after.memory_usage,
+        "original_null_count": before.total_nulls,
+        "cleaned_null_count": after.total_nulls,
+        "null_reduction": before.total_nulls - after.total_nulls,
+        "original_duplicates": before.duplicate_count,
+        "cleaned_duplicates": after.duplicate_count,
+        "duplicates_removed": before.duplicate_count - after.duplicate_count
     }
     
     metrics["row_reduction_percent"] = (metrics["rows_removed"] / metrics["original_rows"] * 100) if metrics["original_rows"] > 0 else 0
@@ -79,25 +275,32 @@ def calculate_metrics(before_df, after_df):
     
     return metrics
 
-def get_data_preview_stats(df):
+def get_data_preview_stats(df, profile=None):
+    profile = profile or profile_dataset(df)
+    
     stats = {
-        "total_rows": df.shape[0],
-        "total_columns": df.shape[1],
-        "data_types": {str(k): int(v) for k, v in df.dtypes.value_counts().to_dict().items()},
-        "memory_usage_mb": float(df.memory_usage(deep=True).sum() / 1024 / 1024),
-        "null_percentage": float((df.isnull().sum().sum() / (df.shape[0] * df.shape[1])) * 100),
-        "duplicate_percentage": float((df.duplicated().sum() / df.shape[0]) * 100)
+        "total_rows": profile.shape[0],
+        "total_columns": profile.shape[1],
+        "data_types": {str(k): int(v) for k, v in profile.dtypes.value_counts().to_dict().items()},
+        "memory_usage_mb": float(profile.memory_usage / 1024 / 1024),
+        "null_percentage": float((profile.total_nulls / (profile.shape[0] * profile.shape[1])) * 100),
+        "duplicate_percentage": float((profile.duplicate_count / profile.shape[0]) * 100)
     }
     
-    numeric_cols = df.select_dtypes(include=['number']).columns
+    numeric_cols = profile.numeric_columns
     if len(numeric_cols) > 0:
         stats["numeric_columns"] = len(numeric_cols)
-        stats["numeric_stats"] = {col: {k: float(v) for k, v in df[col].describe().to_dict().items()} for col in numeric_cols}
+        stats["numeric_stats"] = {col: {k: float(v) for k, v in profile.numeric_stats[col].items()} for col in numeric_cols}
     
-    categorical_cols = df.select_dtypes(include=['object']).columns
+    categorical_cols = profile.categorical_columns
     if len(categorical_cols) > 0:
         stats["categorical_columns"] = len(categorical_cols)
-        stats["unique_values_per_cat"] = {col: int(df[col].nunique()) for col in categorical_cols}
+        stats["unique_values_per_cat"] = {col: int(profile.nunique[col]) for col in categorical_cols}
+    
+    if profile.approximate:
+        stats["approximate"] = True
+        stats["top_values_per_cat"] = {col: {str(value): count for value, count in values} for col, values in profile.top_values.items()}
+        stats["error_bounds"] = profile.error_bounds
     
     return stats
 
@@ -149,20 +352,21 @@ def display_metrics_comparison(metrics):
                  format_file_size(metrics["cleaned_memory_usage"]), 
                  f"-{metrics['memory_reduction_percent']:.1f}%")
 
-def validate_dataframe_integrity(df):
+def validate_dataframe_integrity(df, profile=None):
+    profile = profile or profile_dataset(df)
     issues = []
     
     if df.empty:
         issues.append("DataFrame is empty")
     
-    if df.isnull().all().any():
+    if (profile.null_counts == profile.shape[0]).any():
         issues.append("Some columns contain only null values")
     
-    for col in df.columns:
-        if df[col].nunique() == 1:
+    for col in profile.columns:
+        if profile.nunique[col] == 1:
             issues.append(f"Column '{col}' has only one unique value")
     
-    if df.duplicated().sum() > df.shape[0] * 0.5:
+    if profile.duplicate_count > profile.shape[0] * 0.5:
         issues.append("More than 50% of rows are duplicates")
     
     return len(issues) == 0, issues
\ No newline at end of file